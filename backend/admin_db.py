@@ -1,18 +1,34 @@
+import hashlib
 import json
+import os
+import threading
 import uuid
 from datetime import datetime
 from typing import Dict, List, Optional
 
+import orjson
+
+COMPANIES_FILE = 'data/companies.json'
+
 class AdminDatabase:
     def __init__(self):
         self.companies: Dict[str, dict] = {}
         self.products: Dict[str, dict] = {}
+        
+        # Combined data snapshot and its indexes (see get_catalog), rebuilt
+        # when companies.json changes on disk or the admin data is modified
+        # (tracked by _version)
+        self._version = 0
+        self._catalog: Optional[dict] = None
+        self._catalog_key = None
+        self._cache_lock = threading.Lock()
+        
         self._load_existing_data()
     
     def _load_existing_data(self):
         """Load existing companies from JSON to extract available tags"""
         try:
-            with open('data/companies.json', 'r', encoding='utf-8') as f:
+            with open(COMPANIES_FILE, 'r', encoding='utf-8') as f:
                 data = json.load(f)
                 self.existing_tags = set()
                 for company in data.get('companies', []):
@@ -40,6 +56,7 @@ class AdminDatabase:
             'updated_at': datetime.now().isoformat()
         }
         self.companies[company_id] = company
+        self._invalidate_combined_cache()
         return company_id
     
     def update_company(self, company_id: str, company_data: dict) -> bool:
@@ -56,6 +73,7 @@ class AdminDatabase:
             'tags': company_data.get('tags', []),
             'updated_at': datetime.now().isoformat()
         })
+        self._invalidate_combined_cache()
         return True
     
     def delete_company(self, company_id: str) -> bool:
@@ -73,6 +91,7 @@ class AdminDatabase:
         
         # Delete the company
         del self.companies[company_id]
+        self._invalidate_combined_cache()
         return True
     
     def get_company(self, company_id: str) -> Optional[dict]:
@@ -104,6 +123,7 @@ class AdminDatabase:
             'updated_at': datetime.now().isoformat()
         }
         self.products[product_id] = product
+        self._invalidate_combined_cache()
         return product_id
     
     def update_product(self, product_id: str, product_data: dict) -> bool:
@@ -125,6 +145,7 @@ class AdminDatabase:
             }),
             'updated_at': datetime.now().isoformat()
         })
+        self._invalidate_combined_cache()
         return True
     
     def delete_product(self, product_id: str) -> bool:
@@ -133,6 +154,7 @@ class AdminDatabase:
             return False
         
         del self.products[product_id]
+        self._invalidate_combined_cache()
         return True
     
     def get_product(self, product_id: str) -> Optional[dict]:
@@ -168,11 +190,23 @@ class AdminDatabase:
         """Get all products"""
         return list(self.products.values())
     
-    def get_combined_data(self) -> dict:
-        """Get combined data from JSON and admin database"""
+    def _invalidate_combined_cache(self):
+        """Mark the combined data snapshot as stale after an admin change"""
+        self._version += 1
+    
+    def _get_combined_cache_key(self) -> tuple:
+        """Cache key for the combined data: companies.json mtime + admin version"""
         try:
-            with open('data/companies.json', 'r', encoding='utf-8') as f:
-                json_data = json.load(f)
+            mtime = os.stat(COMPANIES_FILE).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        return (mtime, self._version)
+    
+    def _build_combined_data(self) -> dict:
+        """Build combined data from JSON and admin database"""
+        try:
+            with open(COMPANIES_FILE, 'rb') as f:
+                json_data = orjson.loads(f.read())
         except FileNotFoundError:
             json_data = {'companies': []}
         
@@ -194,6 +228,93 @@ class AdminDatabase:
             combined_companies.append(company_copy)
         
         return {'companies': combined_companies}
+    
+    def get_catalog(self) -> dict:
+        """Get the combined data snapshot together with its derived indexes.
+        
+        Keys: 'data' (combined companies), 'etag' (content hash of 'data'),
+        'company_by_name_lower',
+        'product_by_id' ((product, company) pairs), 'flat_products' (products
+        with company context embedded), 'product_search_index' ((flat product,
+        category_lower, search_text_lower) entries), 'categories' and
+        'audiences' (sorted tuples). The snapshot is shared and only rebuilt
+        when companies.json or the admin data changes; callers must not
+        mutate it.
+        """
+        key = self._get_combined_cache_key()
+        catalog = self._catalog
+        if catalog is not None and self._catalog_key == key:
+            return catalog
+        
+        with self._cache_lock:
+            if self._catalog is None or self._catalog_key != key:
+                self._catalog = self._build_catalog(self._build_combined_data())
+                self._catalog_key = key
+            return self._catalog
+    
+    def _build_catalog(self, combined_data: dict) -> dict:
+        """Build the indexes over combined data (see get_catalog)"""
+        # Index companies by lowercased name; the first match wins so
+        # JSON companies take precedence over admin ones, as before
+        company_by_name_lower = {}
+        for company in combined_data['companies']:
+            name_lower = (company.get('company') or '').lower()
+            company_by_name_lower.setdefault(name_lower, company)
+        
+        # Flatten products with their company context embedded (the
+        # /api/products view) and index (product, company) pairs by
+        # product id (first match wins), collecting categories and
+        # audiences. The search index carries the lowercased category
+        # and searchable text so filters don't lower strings per request
+        flat_products = []
+        product_search_index = []
+        product_by_id = {}
+        categories = set()
+        audiences = set()
+        for company in combined_data['companies']:
+            for product in company.get('products', []):
+                listed_product = {
+                    **product,
+                    'company': company.get('company', ''),
+                    'parentCompany': company.get('parentCompany', ''),
+                    'industry': company.get('industry', ''),
+                    'source': company.get('source', 'unknown')
+                }
+                flat_products.append(listed_product)
+                search_text = (
+                    product.get('name', '') + ' ' +
+                    product.get('description', '') + ' ' +
+                    ' '.join(product.get('features', [])) + ' ' +
+                    ' '.join(product.get('targetAudience', []))
+                ).lower()
+                product_search_index.append(
+                    (listed_product, product.get('category', '').lower(), search_text)
+                )
+                product_by_id.setdefault(product.get('id'), (product, company))
+                if 'category' in product:
+                    categories.add(product['category'])
+                audiences.update(product.get('targetAudience', ()))
+        
+        # Content hash of the combined data, so ETags match across processes
+        # and restarts exactly when the served data does
+        etag = hashlib.blake2b(
+            orjson.dumps(combined_data, option=orjson.OPT_SORT_KEYS), digest_size=16
+        ).hexdigest()
+        
+        return {
+            'data': combined_data,
+            'etag': etag,
+            'company_by_name_lower': company_by_name_lower,
+            'product_by_id': product_by_id,
+            'flat_products': flat_products,
+            'product_search_index': product_search_index,
+            'categories': tuple(sorted(categories)),
+            'audiences': tuple(sorted(audiences))
+        }
+    
+    def get_company_by_name(self, company_name: str) -> Optional[dict]:
+        """Get a company (JSON or admin, with products) by case-insensitive name"""
+        return self.get_catalog()['company_by_name_lower'].get(company_name.lower())
 
 # Global instance
 admin_db = AdminDatabase()
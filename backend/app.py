@@ -1,38 +1,187 @@
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, make_response, request, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
-import json
+import gzip
+import hashlib
+import heapq
 import os
 import sys
+import threading
+import time
 import logging
-from datetime import datetime
+from functools import lru_cache, wraps
+from itertools import combinations, islice
+from operator import itemgetter
+import diskcache
+import fastjsonschema
+import orjson
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
 # Add current directory to path for imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from services.market_analysis_service import MarketAnalysisService
 from services.sales_analytics_service import SalesAnalyticsService
 from services.faq_service import FAQService
+from services.timestamps import now_iso
 from admin_db import admin_db
 from admin_api import create_admin_app
 from admin_dashboard import create_dashboard_app
 
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, used by jsonify() and request.get_json()"""
+    
+    # Match the default provider's sorted keys; sales aggregates use int keys
+    option = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+    
+    def dumps_bytes(self, obj):
+        return orjson.dumps(obj, default=self.default, option=self.option)
+    
+    def dumps(self, obj, **kwargs):
+        return self.dumps_bytes(obj).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        """Build the jsonify() response straight from orjson's bytes, skipping the str round trip"""
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj), mimetype=self.mimetype)
+
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 CORS(app)
 
 # Initialize services
-market_service = MarketAnalysisService()
 sales_service = SalesAnalyticsService()
 faq_service = FAQService()
 
-def load_data():
-    """Load data from JSON file"""
-    try:
-        with open('data/companies.json', 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return {"companies": []}
+# The AI market analysis stack (requests, HTTP pools, AI services) is created
+# on first use: it keeps startup light, and under a preloading server each
+# worker builds its own connection pools after forking
+_market_service = None
+_market_service_lock = threading.Lock()
+
+def get_market_service():
+    """Get the shared MarketAnalysisService, creating it on first use"""
+    global _market_service
+    if _market_service is None:
+        with _market_service_lock:
+            if _market_service is None:
+                from services.market_analysis_service import MarketAnalysisService
+                _market_service = MarketAnalysisService()
+    return _market_service
+
+# Serialized advanced-query results persist on disk so they survive restarts
+# and are shared by all workers; opened on first use, after forking
+QUERY_CACHE_DIR = os.environ.get('SALES_QUERY_CACHE_DIR', os.path.join('data', '.qcache'))
+_query_cache = None
+_query_cache_lock = threading.Lock()
+
+def get_query_cache():
+    """Get the on-disk advanced-query result cache, opening it on first use"""
+    global _query_cache
+    if _query_cache is None:
+        with _query_cache_lock:
+            if _query_cache is None:
+                _query_cache = diskcache.Cache(QUERY_CACHE_DIR, size_limit=1 << 30)
+    return _query_cache
+
+def json_errors(message=None, not_found_message=None):
+    """Turn exceptions escaping a route into JSON error responses.
+    
+    Errors become a 500 with {"error": str(e), "message": message}; when
+    not_found_message is given, a ValueError (unknown product etc.) becomes
+    a 404 with that message instead.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                if not_found_message is not None and isinstance(e, ValueError):
+                    return jsonify({'error': str(e), 'message': not_found_message}), 404
+                logger.exception("Error in %s", fn.__name__)
+                error = {'error': str(e)}
+                if message is not None:
+                    error['message'] = message
+                return jsonify(error), 500
+        return wrapper
+    return decorator
+
+def stream_json_object(fields, list_key, items):
+    """Stream a JSON object as bytes, serializing the `list_key` array one item at a time"""
+    dumps = app.json.dumps_bytes
+    yield b'{'
+    for key, value in fields.items():
+        yield dumps(key) + b':' + dumps(value) + b','
+    yield dumps(list_key) + b':['
+    for i, item in enumerate(items):
+        yield (b',' + dumps(item)) if i else dumps(item)
+    yield b']}'
+
+def json_stream_response(fields, list_key, items):
+    """Build a streamed application/json response (see stream_json_object)"""
+    return Response(
+        stream_with_context(stream_json_object(fields, list_key, items)),
+        mimetype='application/json'
+    )
+
+def serialize_json(payload):
+    """Serialize payload to JSON bytes and compute its ETag"""
+    body = app.json.dumps_bytes(payload)
+    return body, hashlib.blake2b(body, digest_size=16).hexdigest()
+
+def serialize_json_gzip(payload):
+    """Serialize payload like serialize_json, plus a gzip-compressed copy of the body"""
+    body, etag = serialize_json(payload)
+    return body, etag, gzip.compress(body, compresslevel=6)
+
+def etag_response(body, etag=None, gzipped=None):
+    """Wrap pre-serialized JSON bytes with an ETag, answering 304 on a match
+
+    When a pre-compressed gzipped body is given and the client accepts gzip,
+    it is sent as-is with Content-Encoding: gzip.
+    """
+    if etag is None:
+        etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+    if gzipped is not None and request.accept_encodings['gzip']:
+        body = gzipped
+        etag = f'{etag}-gzip'
+    else:
+        gzipped = None
+    if etag in request.if_none_match:
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype='application/json')
+        if gzipped is not None:
+            response.headers['Content-Encoding'] = 'gzip'
+    response.set_etag(etag)
+    return response
+
+def catalog_etag(fn):
+    """ETag a catalog GET on the combined data's content hash, answering 304 before doing any work"""
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        etag = f"catalog-{admin_db.get_catalog()['etag']}"
+        if etag in request.if_none_match:
+            response = Response(status=304)
+        else:
+            response = make_response(fn(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+        response.set_etag(etag)
+        return response
+    return wrapper
+
+def with_cached_data(fn):
+    """Pass the combined catalog snapshot and its indexes (admin_db.get_catalog()) as `catalog`"""
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        kwargs['catalog'] = admin_db.get_catalog()
+        return fn(*args, **kwargs)
+    return wrapper
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
@@ -40,219 +189,172 @@ def health_check():
     return jsonify({"status": "healthy", "message": "Catalog API is running"})
 
 @app.route('/api/companies', methods=['GET'])
-def get_companies():
+@json_errors()
+@catalog_etag
+@with_cached_data
+def get_companies(catalog):
     """Get all companies (JSON + admin)"""
-    try:
-        # Get combined data from JSON and admin database
-        combined_data = admin_db.get_combined_data()
-        return jsonify(combined_data)
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    # Get combined data from JSON and admin database
+    return jsonify(catalog['data'])
 
 @app.route('/api/companies/<company_name>', methods=['GET'])
-def get_company(company_name):
+@json_errors()
+@catalog_etag
+@with_cached_data
+def get_company(company_name, catalog):
     """Get a specific company by name"""
-    try:
-        # First check JSON data
-        json_data = load_data()
-        for company in json_data.get('companies', []):
-            if company['company'].lower() == company_name.lower():
-                return jsonify(company)
-        
-        # Then check admin database
-        admin_companies = admin_db.get_all_companies()
-        for company in admin_companies:
-            if company['company'].lower() == company_name.lower():
-                # Add products to the company data
-                company_with_products = company.copy()
-                company_with_products['products'] = admin_db.get_products_by_company(company['id'])
-                return jsonify(company_with_products)
-        
-        return jsonify({"error": "Company not found"}), 404
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    # JSON companies take precedence over admin ones in the combined index,
+    # which also carries admin companies' products
+    company = catalog['company_by_name_lower'].get(company_name.lower())
+    if company:
+        return jsonify({key: value for key, value in company.items() if key != 'source'})
+    
+    return jsonify({"error": "Company not found"}), 404
 
 @app.route('/api/products', methods=['GET'])
-def get_products():
+@json_errors()
+@catalog_etag
+@with_cached_data
+def get_products(catalog):
     """Get all products with optional filtering"""
-    try:
-        # Get search parameters
-        search = request.args.get('search', '').lower()
-        category = request.args.get('category', '').lower()
-        
-        # Get combined data
-        combined_data = admin_db.get_combined_data()
-        all_products = []
-        
-        # Process each company's products
-        for company in combined_data.get('companies', []):
-            company_name = company.get('company', '')
-            company_products = company.get('products', [])
-            
-            for product in company_products:
-                # Add company context to product
-                product_with_company = product.copy()
-                product_with_company['company'] = company_name
-                product_with_company['parentCompany'] = company.get('parentCompany', '')
-                product_with_company['industry'] = company.get('industry', '')
-                product_with_company['source'] = company.get('source', 'unknown')
-                
-                # Apply search filter
-                if search:
-                    searchable_text = (
-                        product.get('name', '') + ' ' +
-                        product.get('description', '') + ' ' +
-                        ' '.join(product.get('features', [])) + ' ' +
-                        ' '.join(product.get('targetAudience', []))
-                    ).lower()
-                    if search not in searchable_text:
-                        continue
-                
-                # Apply category filter
-                if category and category != 'all':
-                    if category not in product.get('category', '').lower():
-                        continue
-                
-                all_products.append(product_with_company)
-        
-        return jsonify({"products": all_products})
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    # Get search parameters
+    search = request.args.get('search', '').lower()
+    category = request.args.get('category', '').lower()
+    
+    if category == 'all':
+        category = ''
+    
+    # Products come prebuilt with their company context; without filters the
+    # flat view is returned as is, otherwise one pass checks the cheap category
+    # predicate before the full-text search against the prelowered fields
+    if not category and not search:
+        all_products = catalog['flat_products']
+    else:
+        all_products = [
+            product
+            for product, category_lower, search_text in catalog['product_search_index']
+            if (not category or category in category_lower) and (not search or search in search_text)
+        ]
+    
+    return jsonify({"products": all_products})
 
 @app.route('/api/products/<product_id>', methods=['GET'])
-def get_product(product_id):
+@json_errors()
+@catalog_etag
+@with_cached_data
+def get_product(product_id, catalog):
     """Get a specific product by ID"""
-    try:
-        # Check admin database first
-        product = admin_db.get_product(product_id)
-        if product:
-            # Add company context
-            company = admin_db.get_company(product['company_id'])
-            if company:
-                product_with_company = product.copy()
-                product_with_company['company'] = company['company']
-                product_with_company['parentCompany'] = company.get('parentCompany', '')
-                product_with_company['industry'] = company.get('industry', '')
-                return jsonify(product_with_company)
-        
-        # If not found in admin, check JSON data
-        json_data = load_data()
-        for company in json_data.get('companies', []):
-            for product in company.get('products', []):
-                if product.get('id') == product_id:
-                    product_with_company = product.copy()
-                    product_with_company['company'] = company['company']
-                    product_with_company['parentCompany'] = company.get('parentCompany', '')
-                    product_with_company['industry'] = company.get('industry', '')
-                    return jsonify(product_with_company)
-        
-        return jsonify({"error": "Product not found"}), 404
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    # Check admin database first
+    product = admin_db.get_product(product_id)
+    if product:
+        # Add company context
+        company = admin_db.get_company(product['company_id'])
+        if company:
+            product_with_company = product.copy()
+            product_with_company['company'] = company['company']
+            product_with_company['parentCompany'] = company.get('parentCompany', '')
+            product_with_company['industry'] = company.get('industry', '')
+            return jsonify(product_with_company)
+    
+    # If not found in admin, check JSON data
+    match = catalog['product_by_id'].get(product_id)
+    if match:
+        product, company = match
+        product_with_company = product.copy()
+        product_with_company['company'] = company['company']
+        product_with_company['parentCompany'] = company.get('parentCompany', '')
+        product_with_company['industry'] = company.get('industry', '')
+        return jsonify(product_with_company)
+    
+    return jsonify({"error": "Product not found"}), 404
 
 @app.route('/api/categories', methods=['GET'])
-def get_categories():
+@json_errors()
+@catalog_etag
+@with_cached_data
+def get_categories(catalog):
     """Get all unique categories"""
-    try:
-        combined_data = admin_db.get_combined_data()
-        categories = set()
-        
-        for company in combined_data.get('companies', []):
-            for product in company.get('products', []):
-                if 'category' in product:
-                    categories.add(product['category'])
-        
-        return jsonify({"categories": sorted(list(categories))})
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    return jsonify({"categories": list(catalog['categories'])})
 
 @app.route('/api/audiences', methods=['GET'])
-def get_audiences():
+@json_errors()
+@catalog_etag
+@with_cached_data
+def get_audiences(catalog):
     """Get all unique target audiences"""
-    try:
-        combined_data = admin_db.get_combined_data()
-        audiences = set()
-        
-        for company in combined_data.get('companies', []):
-            for product in company.get('products', []):
-                if 'targetAudience' in product:
-                    for audience in product['targetAudience']:
-                        audiences.add(audience)
-        
-        return jsonify({"audiences": sorted(list(audiences))})
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    return jsonify({"audiences": list(catalog['audiences'])})
 
 @app.route('/api/product-comparison', methods=['POST'])
-def compare_products():
+@json_errors('Failed to compare products')
+@with_cached_data
+def compare_products(catalog):
     """Compare selected products for cross-selling analysis"""
-    try:
-        data = request.get_json()
-        product_ids = data.get('product_ids', [])
-        
-        if len(product_ids) < 2:
-            return jsonify({"error": "At least 2 products are required for comparison"}), 400
-        
-        # Get combined data
-        combined_data = admin_db.get_combined_data()
-        
-        # Find products by IDs
-        products = []
-        for company in combined_data.get('companies', []):
-            for product in company.get('products', []):
-                if product.get('id') in product_ids:
-                    product_with_company = product.copy()
-                    product_with_company['company_name'] = company.get('company', '')
-                    product_with_company['parent_company'] = company.get('parentCompany', '')
-                    product_with_company['industry'] = company.get('industry', '')
-                    products.append(product_with_company)
-        
-        if len(products) < 2:
-            return jsonify({"error": "Could not find enough products for comparison"}), 404
-        
-        # Generate feature matrix
-        feature_matrix = _generate_feature_matrix(products)
-        
-        # Generate pricing comparison
-        pricing_comparison = _generate_pricing_comparison(products)
-        
-        # Generate cross-selling analysis
-        cross_selling_potential = _generate_cross_selling_potential(products)
-        
-        # Generate target audience overlap
-        target_audience_overlap = _generate_target_audience_overlap(products)
-        
-        # Generate recommendation summary
-        recommendation_summary = _generate_recommendation_summary(products)
-        
-        return jsonify({
-            "products": products,
-            "feature_matrix": feature_matrix,
-            "pricing_comparison": pricing_comparison,
-            "cross_selling_potential": cross_selling_potential,
-            "target_audience_overlap": target_audience_overlap,
-            "recommendation_summary": recommendation_summary
-        })
-        
-    except Exception as e:
-        return jsonify({"error": str(e), "message": "Failed to compare products"}), 500
+    data = request.get_json()
+    product_ids = data.get('product_ids', [])
+    
+    if len(product_ids) < 2:
+        return jsonify({"error": "At least 2 products are required for comparison"}), 400
+    
+    # Find products by IDs (each requested ID once)
+    products = []
+    for product_id in dict.fromkeys(product_ids):
+        match = catalog['product_by_id'].get(product_id)
+        if match:
+            product, company = match
+            product_with_company = product.copy()
+            product_with_company['company_name'] = company.get('company', '')
+            product_with_company['parent_company'] = company.get('parentCompany', '')
+            product_with_company['industry'] = company.get('industry', '')
+            products.append(product_with_company)
+    
+    if len(products) < 2:
+        return jsonify({"error": "Could not find enough products for comparison"}), 404
+    
+    # Generate feature matrix
+    feature_matrix = _generate_feature_matrix(products)
+    
+    # Generate pricing comparison
+    pricing_comparison = _generate_pricing_comparison(products)
+    
+    # Generate cross-selling analysis
+    cross_selling_potential = _generate_cross_selling_potential(products)
+    
+    # Generate target audience overlap
+    target_audience_overlap = _generate_target_audience_overlap(products)
+    
+    # Generate recommendation summary
+    recommendation_summary = _generate_recommendation_summary(products)
+    
+    return jsonify({
+        "products": products,
+        "feature_matrix": feature_matrix,
+        "pricing_comparison": pricing_comparison,
+        "cross_selling_potential": cross_selling_potential,
+        "target_audience_overlap": target_audience_overlap,
+        "recommendation_summary": recommendation_summary
+    })
 
 def _generate_feature_matrix(products):
     """Generate feature comparison matrix"""
-    all_features = set()
+    # Collect all unique features and give each a bit position
+    all_features = sorted(set().union(*(product.get('features', []) for product in products)))
+    feature_bits = {feature: 1 << i for i, feature in enumerate(all_features)}
     
-    # Collect all unique features
+    # One integer bitset per product, so each membership test is a single AND
+    product_masks = []
     for product in products:
-        features = product.get('features', [])
-        all_features.update(features)
+        mask = 0
+        for feature in product.get('features', []):
+            mask |= feature_bits[feature]
+        product_masks.append((product['id'], mask))
     
     # Create matrix
     matrix = []
-    for feature in sorted(all_features):
+    for feature in all_features:
+        bit = feature_bits[feature]
         feature_row = {"feature": feature}
-        for product in products:
-            product_features = product.get('features', [])
-            feature_row[product['id']] = feature in product_features
+        for product_id, mask in product_masks:
+            feature_row[product_id] = bool(mask & bit)
         matrix.append(feature_row)
     
     return matrix
@@ -271,60 +373,65 @@ def _generate_pricing_comparison(products):
         })
     return pricing_data
 
+def _jaccard_similarity(set1, set2):
+    """|A n B| / |A u B| (0 when both are empty), without building the union"""
+    common = len(set1 & set2)
+    return common / max(len(set1) + len(set2) - common, 1)
+
 def _generate_cross_selling_potential(products):
     """Generate cross-selling potential analysis"""
+    # Build each product's feature and audience sets once instead of once per pair
+    feature_sets = [set(product.get('features', [])) for product in products]
+    audience_sets = [set(product.get('targetAudience', [])) for product in products]
+    
     potential = []
-    for i, product1 in enumerate(products):
-        for j, product2 in enumerate(products):
-            if i < j:  # Avoid duplicates
-                # Simple analysis based on feature overlap and target audience
-                features1 = set(product1.get('features', []))
-                features2 = set(product2.get('features', []))
-                feature_overlap = len(features1.intersection(features2)) / max(len(features1.union(features2)), 1)
-                
-                audience1 = set(product1.get('targetAudience', []))
-                audience2 = set(product2.get('targetAudience', []))
-                audience_overlap = len(audience1.intersection(audience2)) / max(len(audience1.union(audience2)), 1)
-                
-                synergy_score = round((feature_overlap + audience_overlap) * 5, 1)  # Scale to 0-10
-                
-                if synergy_score >= 7:
-                    potential_level = "High"
-                elif synergy_score >= 4:
-                    potential_level = "Medium"
-                else:
-                    potential_level = "Low"
-                
-                potential.append({
-                    "product1": product1['name'],
-                    "product2": product2['name'],
-                    "potential_level": potential_level,
-                    "synergy_score": synergy_score
-                })
+    for (i, product1), (j, product2) in combinations(enumerate(products), 2):
+        # Simple analysis based on feature overlap and target audience
+        feature_overlap = _jaccard_similarity(feature_sets[i], feature_sets[j])
+        audience_overlap = _jaccard_similarity(audience_sets[i], audience_sets[j])
+        
+        synergy_score = round((feature_overlap + audience_overlap) * 5, 1)  # Scale to 0-10
+        
+        if synergy_score >= 7:
+            potential_level = "High"
+        elif synergy_score >= 4:
+            potential_level = "Medium"
+        else:
+            potential_level = "Low"
+        
+        potential.append({
+            "product1": product1['name'],
+            "product2": product2['name'],
+            "potential_level": potential_level,
+            "synergy_score": synergy_score
+        })
     
     return potential
 
 def _generate_target_audience_overlap(products):
     """Generate target audience overlap analysis"""
+    # Build each product's audience set once instead of once per pair
+    audience_sets = [set(product.get('targetAudience', [])) for product in products]
+    
     overlap = []
-    for i, product1 in enumerate(products):
-        for j, product2 in enumerate(products):
-            if i < j:  # Avoid duplicates
-                audience1 = set(product1.get('targetAudience', []))
-                audience2 = set(product2.get('targetAudience', []))
-                common_audiences = audience1.intersection(audience2)
-                
-                if audience1 and audience2:
-                    overlap_percentage = round(len(common_audiences) / len(audience1.union(audience2)) * 100)
-                else:
-                    overlap_percentage = 0
-                
-                overlap.append({
-                    "product1": product1['name'],
-                    "product2": product2['name'],
-                    "overlap_percentage": overlap_percentage,
-                    "common_audiences": list(common_audiences)
-                })
+    for (i, product1), (j, product2) in combinations(enumerate(products), 2):
+        audience1 = audience_sets[i]
+        audience2 = audience_sets[j]
+        common_audiences = audience1 & audience2
+        
+        if audience1 and audience2:
+            # |A u B| = |A| + |B| - |A n B|, without building the union
+            union_size = len(audience1) + len(audience2) - len(common_audiences)
+            overlap_percentage = round(len(common_audiences) / union_size * 100)
+        else:
+            overlap_percentage = 0
+        
+        overlap.append({
+            "product1": product1['name'],
+            "product2": product2['name'],
+            "overlap_percentage": overlap_percentage,
+            "common_audiences": list(common_audiences)
+        })
     
     return overlap
 
@@ -353,6 +460,7 @@ def _generate_recommendation_summary(products):
 
 # FAQ Routes
 @app.route('/api/faqs', methods=['GET'])
+@json_errors()
 def get_faqs():
     """
     Get all FAQs with optional filtering
@@ -361,581 +469,548 @@ def get_faqs():
     - category: Category ID filter
     - limit: Number of results to return
     """
-    try:
-        search_query = request.args.get('search', '')
-        category_id = request.args.get('category', '')
-        limit = request.args.get('limit', type=int)
-        
-        faqs = faq_service.get_faqs(
-            search_query=search_query,
-            category_id=category_id,
-            limit=limit
-        )
-        
-        return jsonify({
-            'success': True,
-            'data': faqs,
-            'total': len(faqs)
-        }), 200
-        
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    search_query = request.args.get('search', '')
+    category_id = request.args.get('category', '')
+    limit = request.args.get('limit', type=int)
+    
+    faqs = faq_service.get_faqs(
+        search_query=search_query,
+        category_id=category_id,
+        limit=limit
+    )
+    
+    return jsonify({
+        'success': True,
+        'data': faqs,
+        'total': len(faqs)
+    }), 200
 
 @app.route('/api/faqs/<faq_id>', methods=['GET'])
+@json_errors()
 def get_faq(faq_id):
     """Get specific FAQ by ID"""
-    try:
-        faq = faq_service.get_faq_by_id(faq_id)
-        if not faq:
-            return jsonify({'error': 'FAQ not found'}), 404
-            
-        return jsonify({
-            'success': True,
-            'data': faq
-        }), 200
-        
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    faq = faq_service.get_faq_by_id(faq_id)
+    if not faq:
+        return jsonify({'error': 'FAQ not found'}), 404
+        
+    return jsonify({
+        'success': True,
+        'data': faq
+    }), 200
 
 @app.route('/api/faq-categories', methods=['GET'])
+@json_errors()
 def get_faq_categories():
     """Get all FAQ categories"""
-    try:
-        categories = faq_service.get_categories()
-        return jsonify({
-            'success': True,
-            'data': categories
-        }), 200
-        
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    categories = faq_service.get_categories()
+    return jsonify({
+        'success': True,
+        'data': categories
+    }), 200
 
 @app.route('/api/faq-search', methods=['POST'])
+@json_errors()
 def search_faqs():
     """Advanced FAQ search with analytics tracking"""
-    try:
-        data = request.get_json()
-        search_query = data.get('query', '')
-        filters = data.get('filters', {})
-        
-        results = faq_service.advanced_search(search_query, filters)
-        
-        # Track search analytics (optional)
-        faq_service.track_search(search_query, len(results))
-        
-        return jsonify({
-            'success': True,
-            'data': results,
-            'query': search_query,
-            'total': len(results)
-        }), 200
-        
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    data = request.get_json()
+    search_query = data.get('query', '')
+    filters = data.get('filters', {})
+    
+    results = faq_service.advanced_search(search_query, filters)
+    
+    # Track search analytics (optional)
+    faq_service.track_search(search_query, len(results))
+    
+    return jsonify({
+        'success': True,
+        'data': results,
+        'query': search_query,
+        'total': len(results)
+    }), 200
 
 @app.route('/api/faqs/<faq_id>/related', methods=['GET'])
+@json_errors()
 def get_faq_related_content(faq_id):
     """Get companies and products related to specific FAQ - demonstrates catalog integration"""
-    try:
-        related_content = faq_service.get_related_content(faq_id)
-        return jsonify({
-            'success': True,
-            'data': related_content,
-            'faq_id': faq_id
-        }), 200
-        
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    related_content = faq_service.get_related_content(faq_id)
+    return jsonify({
+        'success': True,
+        'data': related_content,
+        'faq_id': faq_id
+    }), 200
 
 @app.route('/api/market-analysis/<industry>', methods=['GET'])
-def get_market_analysis(industry):
+@json_errors('Failed to fetch market analysis')
+@with_cached_data
+def get_market_analysis(industry, catalog):
     """Get market analysis for a specific industry"""
+    combined_data = catalog['data']
+    
+    # Filter companies by industry
+    industry_companies = []
+    for company in combined_data.get('companies', []):
+        if company.get('industry', '').lower() == industry.lower():
+            industry_companies.append(company)
+    
+    if not industry_companies:
+        return jsonify({"error": f"No companies found in {industry} industry"}), 404
+    
+    # Generate market analysis
+    total_companies = len(industry_companies)
+    total_products = sum(len(company.get('products', [])) for company in industry_companies)
+    
+    # Analyze categories
+    categories = {}
+    for company in industry_companies:
+        for product in company.get('products', []):
+            category = product.get('category', 'Other')
+            categories[category] = categories.get(category, 0) + 1
+    
+    # Market trends (enhanced data)
+    market_trends = [
+        "Digital transformation driving increased software adoption",
+        "Cloud-first strategies becoming standard", 
+        "Integration capabilities are key differentiators",
+        "Mobile-first solutions gaining traction",
+        "AI and automation features driving competitive advantage",
+        "Subscription-based models dominating the market"
+    ]
+    
+    # Major market players analysis
+    major_players = []
+    for company in industry_companies[:5]:  # Top 5 companies
+        products = company.get('products', [])
+        company_categories = list(set(p.get('category', 'Other') for p in products))
+        
+        # Mock market share and pricing data
+        market_shares = ["15%", "12%", "10%", "8%", "6%"]
+        pricing_models = ["Subscription", "One-time", "Freemium", "Tiered", "Custom"]
+        
+        major_players.append({
+            "name": company.get('company'),
+            "market_share": market_shares[len(major_players)] if len(major_players) < len(market_shares) else "5%",
+            "target_market": f"{company_categories[0] if company_categories else 'General'} sector",
+            "pricing_model": pricing_models[len(major_players) % len(pricing_models)],
+            "strengths": [
+                f"Strong {company_categories[0] if company_categories else 'software'} portfolio",
+                f"Comprehensive suite of {len(products)} products",
+                "Established market presence",
+                "Strong customer base"
+            ][:2],
+            "weaknesses": [
+                "Limited international presence",
+                "High pricing compared to competitors",
+                "Complex implementation process",
+                "Limited mobile capabilities"
+            ][:2]
+        })
+    
+    # Strategic recommendations
+    recommendations = [
+        "Focus on cloud-native solutions to meet market demand",
+        "Invest in AI and automation capabilities for competitive advantage",
+        "Develop comprehensive integration platforms",
+        "Expand mobile-first product offerings",
+        "Consider strategic partnerships for market expansion",
+        "Implement flexible subscription pricing models"
+    ]
+    
+    # Market overview structure
+    market_overview = {
+        "market_size": {
+            "global": "$45.2B (2024)",
+            "europe": "$12.8B (2024)"
+        },
+        "growth_rate": "12.5% CAGR",
+        "key_trends": market_trends
+    }
+    
+    # Competitive landscape
+    competitive_landscape = {
+        "major_players": major_players,
+        "market_concentration": "Moderately concentrated with top 5 players holding 51% market share"
+    }
+    
+    # Get AI-powered market analysis
+    company_name = request.args.get('company')  # Optional company context
     try:
-        combined_data = admin_db.get_combined_data()
+        ai_analysis = get_market_service().get_market_analysis(industry)
         
-        # Filter companies by industry
-        industry_companies = []
-        for company in combined_data.get('companies', []):
-            if company.get('industry', '').lower() == industry.lower():
-                industry_companies.append(company)
-        
-        if not industry_companies:
-            return jsonify({"error": f"No companies found in {industry} industry"}), 404
-        
-        # Generate market analysis
-        total_companies = len(industry_companies)
-        total_products = sum(len(company.get('products', [])) for company in industry_companies)
-        
-        # Analyze categories
-        categories = {}
-        for company in industry_companies:
-            for product in company.get('products', []):
-                category = product.get('category', 'Other')
-                categories[category] = categories.get(category, 0) + 1
-        
-        # Market trends (enhanced data)
-        market_trends = [
-            "Digital transformation driving increased software adoption",
-            "Cloud-first strategies becoming standard", 
-            "Integration capabilities are key differentiators",
-            "Mobile-first solutions gaining traction",
-            "AI and automation features driving competitive advantage",
-            "Subscription-based models dominating the market"
-        ]
-        
-        # Major market players analysis
-        major_players = []
-        for company in industry_companies[:5]:  # Top 5 companies
-            products = company.get('products', [])
-            company_categories = list(set(p.get('category', 'Other') for p in products))
-            
-            # Mock market share and pricing data
-            market_shares = ["15%", "12%", "10%", "8%", "6%"]
-            pricing_models = ["Subscription", "One-time", "Freemium", "Tiered", "Custom"]
-            
-            major_players.append({
-                "name": company.get('company'),
-                "market_share": market_shares[len(major_players)] if len(major_players) < len(market_shares) else "5%",
-                "target_market": f"{company_categories[0] if company_categories else 'General'} sector",
-                "pricing_model": pricing_models[len(major_players) % len(pricing_models)],
-                "strengths": [
-                    f"Strong {company_categories[0] if company_categories else 'software'} portfolio",
-                    f"Comprehensive suite of {len(products)} products",
-                    "Established market presence",
-                    "Strong customer base"
-                ][:2],
-                "weaknesses": [
-                    "Limited international presence",
-                    "High pricing compared to competitors",
-                    "Complex implementation process",
-                    "Limited mobile capabilities"
-                ][:2]
-            })
-        
-        # Strategic recommendations
-        recommendations = [
-            "Focus on cloud-native solutions to meet market demand",
-            "Invest in AI and automation capabilities for competitive advantage",
-            "Develop comprehensive integration platforms",
-            "Expand mobile-first product offerings",
-            "Consider strategic partnerships for market expansion",
-            "Implement flexible subscription pricing models"
-        ]
-        
-        # Market overview structure
-        market_overview = {
-            "market_size": {
-                "global": "$45.2B (2024)",
-                "europe": "$12.8B (2024)"
-            },
-            "growth_rate": "12.5% CAGR",
-            "key_trends": market_trends
-        }
-        
-        # Competitive landscape
-        competitive_landscape = {
-            "major_players": major_players,
-            "market_concentration": "Moderately concentrated with top 5 players holding 51% market share"
-        }
-        
-        # Get AI-powered market analysis
-        company_name = request.args.get('company')  # Optional company context
-        try:
-            ai_analysis = market_service.get_market_analysis(industry)
-            
-            # Merge AI analysis with local data
-            enhanced_analysis = ai_analysis.copy()
-            enhanced_analysis.update({
-                "local_market_data": {
-                    "total_companies": total_companies,
-                    "total_products": total_products,
-                    "top_categories": dict(sorted(categories.items(), key=lambda x: x[1], reverse=True)[:5]),
-                    "companies": [{"name": c.get('company'), "products_count": len(c.get('products', []))} for c in industry_companies]
-                }
-            })
-            
-            return jsonify(enhanced_analysis)
-            
-        except Exception as ai_error:
-            # Fallback to traditional analysis if AI fails
-            return jsonify({
-                "industry": industry,
-                "analysis_type": "Traditional Analysis (AI Unavailable)",
+        # Merge AI analysis with local data
+        enhanced_analysis = ai_analysis.copy()
+        enhanced_analysis.update({
+            "local_market_data": {
                 "total_companies": total_companies,
                 "total_products": total_products,
                 "top_categories": dict(sorted(categories.items(), key=lambda x: x[1], reverse=True)[:5]),
-                "market_overview": market_overview,
-                "competitive_landscape": competitive_landscape,
-                "recommendations": recommendations,
-                "companies": [{"name": c.get('company'), "products_count": len(c.get('products', []))} for c in industry_companies],
-                "ai_error": str(ai_error)
-            })
+                "companies": [{"name": c.get('company'), "products_count": len(c.get('products', []))} for c in industry_companies]
+            }
+        })
         
-    except Exception as e:
-        return jsonify({"error": str(e), "message": "Failed to fetch market analysis"}), 500
+        return jsonify(enhanced_analysis)
+        
+    except Exception as ai_error:
+        # Fallback to traditional analysis if AI fails
+        return jsonify({
+            "industry": industry,
+            "analysis_type": "Traditional Analysis (AI Unavailable)",
+            "total_companies": total_companies,
+            "total_products": total_products,
+            "top_categories": dict(sorted(categories.items(), key=lambda x: x[1], reverse=True)[:5]),
+            "market_overview": market_overview,
+            "competitive_landscape": competitive_landscape,
+            "recommendations": recommendations,
+            "companies": [{"name": c.get('company'), "products_count": len(c.get('products', []))} for c in industry_companies],
+            "ai_error": str(ai_error)
+        })
 
 @app.route('/api/competitive-position/<company_name>', methods=['GET'])
-def get_competitive_position(company_name):
+@json_errors('Failed to fetch competitive position')
+@with_cached_data
+def get_competitive_position(company_name, catalog):
     """Get AI-powered competitive position analysis for a company"""
+    combined_data = catalog['data']
+    company_name_lower = company_name.lower()
+    
+    # Find the company (index is keyed by lowercased name)
+    target_company = catalog['company_by_name_lower'].get(company_name_lower)
+    
+    if not target_company:
+        return jsonify({"error": f"Company {company_name} not found"}), 404
+    
+    # Get AI-powered competitive position analysis
+    industry = target_company.get('industry', 'Point of Sale Software')
     try:
-        combined_data = admin_db.get_combined_data()
-        
-        # Find the company
-        target_company = None
-        for company in combined_data.get('companies', []):
-            if company.get('company', '').lower() == company_name.lower():
-                target_company = company
-                break
-        
-        if not target_company:
-            return jsonify({"error": f"Company {company_name} not found"}), 404
+        ai_analysis = get_market_service().get_company_competitive_position(company_name, industry, target_company)
         
-        # Get AI-powered competitive position analysis
-        industry = target_company.get('industry', 'Point of Sale Software')
-        try:
-            ai_analysis = market_service.get_company_competitive_position(company_name, industry, target_company)
-            
-            # Add local company data context
-            ai_analysis["local_company_data"] = {
+        # Add local company data context (on a copy: the analysis may be a shared cache entry)
+        enhanced_analysis = {
+            **ai_analysis,
+            "local_company_data": {
                 "company": target_company.get('company'),
                 "industry": industry,
                 "products_count": len(target_company.get('products', [])),
                 "parent_company": target_company.get('parentCompany'),
                 "description": target_company.get('description')
             }
-            
-            return jsonify(ai_analysis)
-            
-        except Exception as ai_error:
-            # Fallback to traditional analysis if AI fails
-            pass  # Continue with traditional analysis below
-        
-        # Find competitors (same industry)
-        industry = target_company.get('industry', '')
-        competitors = []
-        for company in combined_data.get('companies', []):
-            if (company.get('industry', '').lower() == industry.lower() and 
-                company.get('company', '').lower() != company_name.lower()):
-                competitors.append({
-                    "name": company.get('company'),
-                    "products_count": len(company.get('products', [])),
-                    "categories": list(set(p.get('category', 'Other') for p in company.get('products', [])))
-                })
-        
-        # Analyze company's position
-        company_products = target_company.get('products', [])
-        company_categories = list(set(p.get('category', 'Other') for p in company_products))
-        
-        # Competitive advantages (mock analysis)
-        advantages = [
-            f"Strong presence in {company_categories[0] if company_categories else 'various'} category",
-            f"Portfolio of {len(company_products)} products",
-            "Established market position",
-            "Comprehensive product suite"
-        ]
-        
-        # Market opportunities
-        opportunities = [
-            "Potential for product bundling",
-            "Cross-selling to existing customer base",
-            "Market expansion possibilities",
-            "Technology integration opportunities"
-        ]
-        
-        return jsonify({
-            "company": company_name,
-            "industry": industry,
-            "products_count": len(company_products),
-            "categories": company_categories,
-            "competitors": competitors[:5],  # Top 5 competitors
-            "competitive_advantages": advantages,
-            "market_opportunities": opportunities
-        })
+        }
+
+        return jsonify(enhanced_analysis)
         
-    except Exception as e:
-        return jsonify({"error": str(e), "message": "Failed to fetch competitive position"}), 500
+    except Exception as ai_error:
+        # Fallback to traditional analysis if AI fails
+        pass  # Continue with traditional analysis below
+    
+    # Find competitors (same industry)
+    industry = target_company.get('industry', '')
+    industry_lower = industry.lower()
+    competitors = []
+    for company in combined_data.get('companies', []):
+        if (company.get('industry', '').lower() == industry_lower and 
+            company.get('company', '').lower() != company_name_lower):
+            competitors.append({
+                "name": company.get('company'),
+                "products_count": len(company.get('products', [])),
+                "categories": list(set(p.get('category', 'Other') for p in company.get('products', [])))
+            })
+    
+    # Analyze company's position
+    company_products = target_company.get('products', [])
+    company_categories = list(set(p.get('category', 'Other') for p in company_products))
+    
+    # Competitive advantages (mock analysis)
+    advantages = [
+        f"Strong presence in {company_categories[0] if company_categories else 'various'} category",
+        f"Portfolio of {len(company_products)} products",
+        "Established market position",
+        "Comprehensive product suite"
+    ]
+    
+    # Market opportunities
+    opportunities = [
+        "Potential for product bundling",
+        "Cross-selling to existing customer base",
+        "Market expansion possibilities",
+        "Technology integration opportunities"
+    ]
+    
+    return jsonify({
+        "company": company_name,
+        "industry": industry,
+        "products_count": len(company_products),
+        "categories": company_categories,
+        "competitors": competitors[:5],  # Top 5 competitors
+        "competitive_advantages": advantages,
+        "market_opportunities": opportunities
+    })
 
 @app.route('/api/product-analysis/<product_id>', methods=['GET'])
-def get_product_analysis(product_id):
+@json_errors('Failed to fetch product analysis')
+@with_cached_data
+def get_product_analysis(product_id, catalog):
     """Get detailed analysis for a specific product"""
-    try:
-        combined_data = admin_db.get_combined_data()
-        
-        # Find the product
-        target_product = None
-        product_company = None
-        for company in combined_data.get('companies', []):
-            for product in company.get('products', []):
-                if product.get('id') == product_id:
-                    target_product = product
-                    product_company = company
-                    break
-            if target_product:
-                break
-        
-        if not target_product:
-            return jsonify({"error": f"Product {product_id} not found"}), 404
-        
-        # Find similar products (same category)
-        category = target_product.get('category', '')
-        similar_products = []
-        for company in combined_data.get('companies', []):
-            for product in company.get('products', []):
-                if (product.get('category', '').lower() == category.lower() and 
-                    product.get('id') != product_id):
-                    similar_products.append({
-                        "name": product.get('name'),
-                        "company": company.get('company'),
-                        "features_count": len(product.get('features', []))
-                    })
-        
-        # Analysis insights
-        features = target_product.get('features', [])
-        target_audience = target_product.get('targetAudience', [])
-        
-        strengths = [
-            f"Rich feature set with {len(features)} capabilities",
-            f"Targets {len(target_audience)} market segments",
-            "Well-positioned in market category",
-            "Strong integration potential"
-        ]
-        
-        recommendations = [
-            "Consider feature bundling opportunities",
-            "Explore adjacent market segments",
-            "Enhance integration capabilities",
-            "Develop partnership strategies"
-        ]
-        
-        return jsonify({
-            "product": target_product,
-            "company": product_company.get('company'),
-            "industry": product_company.get('industry'),
-            "similar_products": similar_products[:5],
-            "strengths": strengths,
-            "recommendations": recommendations,
-            "market_position": "Strong" if len(features) > 5 else "Moderate"
-        })
-        
-    except Exception as e:
-        return jsonify({"error": str(e), "message": "Failed to fetch product analysis"}), 500
+    # Find the product
+    match = catalog['product_by_id'].get(product_id)
+    if not match:
+        return jsonify({"error": f"Product {product_id} not found"}), 404
+    target_product, product_company = match
+    
+    # Find similar products (same category)
+    category_lower = target_product.get('category', '').lower()
+    similar_products = []
+    for product, product_category_lower, _ in catalog['product_search_index']:
+        if (product_category_lower == category_lower and 
+            product.get('id') != product_id):
+            similar_products.append({
+                "name": product.get('name'),
+                "company": product['company'],
+                "features_count": len(product.get('features', []))
+            })
+    
+    # Analysis insights
+    features = target_product.get('features', [])
+    target_audience = target_product.get('targetAudience', [])
+    
+    strengths = [
+        f"Rich feature set with {len(features)} capabilities",
+        f"Targets {len(target_audience)} market segments",
+        "Well-positioned in market category",
+        "Strong integration potential"
+    ]
+    
+    recommendations = [
+        "Consider feature bundling opportunities",
+        "Explore adjacent market segments",
+        "Enhance integration capabilities",
+        "Develop partnership strategies"
+    ]
+    
+    return jsonify({
+        "product": target_product,
+        "company": product_company.get('company'),
+        "industry": product_company.get('industry'),
+        "similar_products": similar_products[:5],
+        "strengths": strengths,
+        "recommendations": recommendations,
+        "market_position": "Strong" if len(features) > 5 else "Moderate"
+    })
 
 @app.route('/api/cross-selling/<company_name>', methods=['GET'])
-def get_cross_selling_recommendations(company_name):
+@json_errors('Failed to fetch cross-selling recommendations')
+@with_cached_data
+def get_cross_selling_recommendations(company_name, catalog):
     """Get cross-selling recommendations for a company"""
-    try:
-        combined_data = admin_db.get_combined_data()
-        
-        # Find the company
-        target_company = None
+    combined_data = catalog['data']
+    company_name_lower = company_name.lower()
+    
+    # Find the company (index is keyed by lowercased name)
+    target_company = catalog['company_by_name_lower'].get(company_name_lower)
+    
+    if not target_company:
+        return jsonify({"error": f"Company {company_name} not found"}), 404
+    
+    # Find parent company and group companies
+    parent_company = target_company.get('parentCompany', '')
+    group_companies = []
+    
+    if parent_company:
+        parent_company_lower = parent_company.lower()
         for company in combined_data.get('companies', []):
-            if company.get('company', '').lower() == company_name.lower():
-                target_company = company
-                break
-        
-        if not target_company:
-            return jsonify({"error": f"Company {company_name} not found"}), 404
-        
-        # Find parent company and group companies
-        parent_company = target_company.get('parentCompany', '')
-        group_companies = []
-        
-        if parent_company:
-            for company in combined_data.get('companies', []):
-                if (company.get('parentCompany', '').lower() == parent_company.lower() and 
-                    company.get('company', '').lower() != company_name.lower()):
-                    group_companies.append(company.get('company'))
-        
-        # Generate cross-selling opportunities
-        company_products = target_company.get('products', [])
-        company_categories = [p.get('category', '') for p in company_products]
-        cross_selling_opportunities = []
-        
-        # Get all companies for cross-selling opportunities (not just group companies)
-        all_companies = combined_data.get('companies', [])
+            if (company.get('parentCompany', '').lower() == parent_company_lower and 
+                company.get('company', '').lower() != company_name_lower):
+                group_companies.append(company.get('company'))
+    
+    # Generate cross-selling opportunities
+    company_products = target_company.get('products', [])
+    company_categories = [p.get('category', '') for p in company_products]
+    cross_selling_opportunities = []
+    
+    # Get all companies for cross-selling opportunities (not just group companies)
+    all_companies = combined_data.get('companies', [])
+    
+    for potential_partner in all_companies:
+        partner_name = potential_partner.get('company', '')
         
-        for potential_partner in all_companies:
-            partner_name = potential_partner.get('company', '')
+        # Skip the target company itself
+        if partner_name.lower() == company_name_lower:
+            continue
             
-            # Skip the target company itself
-            if partner_name.lower() == company_name.lower():
-                continue
-                
-            partner_products = potential_partner.get('products', [])
-            complementary_products = []
+        partner_products = potential_partner.get('products', [])
+        complementary_products = []
+        
+        # Find complementary products (products in different categories)
+        for product in partner_products[:4]:  # Top 4 products per company
+            product_category = product.get('category', '')
             
-            # Find complementary products (products in different categories)
-            for product in partner_products[:4]:  # Top 4 products per company
-                product_category = product.get('category', '')
+            # Check if this category complements target company's categories
+            if product_category not in company_categories:
+                potential_level = "High"
+                synergy_score = 8
                 
-                # Check if this category complements target company's categories
-                if product_category not in company_categories:
+                # Adjust potential based on product features and target audience overlap
+                product_features = product.get('features', [])
+                if len(product_features) <= 3:
+                    potential_level = "Medium"
+                    synergy_score = 6
+                elif len(product_features) > 8:
                     potential_level = "High"
-                    synergy_score = 8
-                    
-                    # Adjust potential based on product features and target audience overlap
-                    product_features = product.get('features', [])
-                    if len(product_features) <= 3:
-                        potential_level = "Medium"
-                        synergy_score = 6
-                    elif len(product_features) > 8:
-                        potential_level = "High"
-                        synergy_score = 9
-                    
-                    complementary_products.append({
-                        "product_name": product.get('name'),
-                        "category": product_category,
-                        "cross_sell_potential": potential_level,
-                        "synergy_score": synergy_score
-                    })
-            
-            # Only include companies that have complementary products
-            if complementary_products:
-                # Determine partnership type based on group relationship
-                is_group_company = partner_name in group_companies
-                partnership_type = "Group Partnership" if is_group_company else "Strategic Partnership"
-                
-                partnership_opportunities = [
-                    f"Joint sales initiatives with {partner_name}",
-                    f"Integrated solution packages combining offerings",
-                    f"Cross-referral programs between companies",
-                    f"Shared marketing and customer success programs"
-                ]
+                    synergy_score = 9
                 
-                if is_group_company:
-                    partnership_opportunities.extend([
-                        "Unified pricing and packaging strategies",
-                        "Shared customer database and insights"
-                    ])
-                
-                cross_selling_opportunities.append({
-                    "company": partner_name,
-                    "partnership_type": partnership_type,
-                    "complementary_products": complementary_products,
-                    "partnership_opportunities": partnership_opportunities[:4]  # Limit to 4 opportunities
+                complementary_products.append({
+                    "product_name": product.get('name'),
+                    "category": product_category,
+                    "cross_sell_potential": potential_level,
+                    "synergy_score": synergy_score
                 })
         
-        # Sort by number of complementary products (most opportunities first)
-        cross_selling_opportunities.sort(key=lambda x: len(x["complementary_products"]), reverse=True)
-        
-        return jsonify({
-            "company": company_name,
-            "parent_company": parent_company or "Independent",
-            "group_companies": group_companies,
-            "cross_selling_opportunities": cross_selling_opportunities
-        })
-        
-    except Exception as e:
-        return jsonify({"error": str(e), "message": "Failed to fetch cross-selling recommendations"}), 500
+        # Only include companies that have complementary products
+        if complementary_products:
+            # Determine partnership type based on group relationship
+            is_group_company = partner_name in group_companies
+            partnership_type = "Group Partnership" if is_group_company else "Strategic Partnership"
+            
+            partnership_opportunities = [
+                f"Joint sales initiatives with {partner_name}",
+                f"Integrated solution packages combining offerings",
+                f"Cross-referral programs between companies",
+                f"Shared marketing and customer success programs"
+            ]
+            
+            if is_group_company:
+                partnership_opportunities.extend([
+                    "Unified pricing and packaging strategies",
+                    "Shared customer database and insights"
+                ])
+            
+            cross_selling_opportunities.append({
+                "company": partner_name,
+                "partnership_type": partnership_type,
+                "complementary_products": complementary_products,
+                "partnership_opportunities": partnership_opportunities[:4]  # Limit to 4 opportunities
+            })
+    
+    # Sort by number of complementary products (most opportunities first)
+    cross_selling_opportunities.sort(key=lambda x: len(x["complementary_products"]), reverse=True)
+    
+    return jsonify({
+        "company": company_name,
+        "parent_company": parent_company or "Independent",
+        "group_companies": group_companies,
+        "cross_selling_opportunities": cross_selling_opportunities
+    })
 
 # ========================================
 # NEW AI-POWERED ENDPOINTS
 # ========================================
 
 @app.route('/api/ai-market-intelligence/<industry>', methods=['GET'])
+@json_errors('Failed to get AI market intelligence')
 def get_ai_market_intelligence(industry):
     """Get real-time AI-powered market intelligence"""
-    try:
-        company_name = request.args.get('company')
-        intelligence = market_service.get_ai_market_intelligence(industry, company_name)
-        return jsonify(intelligence)
-    except Exception as e:
-        return jsonify({"error": str(e), "message": "Failed to get AI market intelligence"}), 500
+    company_name = request.args.get('company')
+    # The analysis is serialized once when cached; send those bytes as-is
+    body = get_market_service().get_ai_market_intelligence_json(industry, company_name)
+    return Response(body, mimetype='application/json')
+
+@app.route('/api/ai-market-intelligence/bulk', methods=['POST'])
+@json_errors('Failed to get AI market intelligence')
+def get_ai_market_intelligence_bulk():
+    """Get real-time AI-powered market intelligence for several industries at once"""
+    request_data = request.get_json(silent=True) or {}
+    industries = request_data.get('industries')
+    
+    if not industries or not isinstance(industries, list) or not all(isinstance(i, str) for i in industries):
+        return jsonify({'error': 'industries must be a non-empty list of industry names'}), 400
+    
+    intelligence = get_market_service().get_ai_market_intelligence_bulk(industries, request_data.get('company'))
+    return jsonify({'industries': intelligence, 'count': len(intelligence)})
 
 @app.route('/api/ai-trend-analysis/<industry>', methods=['GET'])
+@json_errors('Failed to get AI trend analysis')
 def get_ai_trend_analysis(industry):
     """Get AI-powered trend analysis and predictions"""
-    try:
-        time_horizon = request.args.get('horizon', '6_months')
-        analysis = market_service.get_ai_trend_analysis(industry, time_horizon)
-        return jsonify(analysis)
-    except Exception as e:
-        return jsonify({"error": str(e), "message": "Failed to get AI trend analysis"}), 500
+    time_horizon = request.args.get('horizon', '6_months')
+    analysis = get_market_service().get_ai_trend_analysis(industry, time_horizon)
+    return jsonify(analysis)
 
 @app.route('/api/ai-trend-alerts/<industry>', methods=['GET'])
+@json_errors('Failed to get AI trend alerts')
 def get_ai_trend_alerts(industry):
     """Get AI-powered trend alerts"""
-    try:
-        company_name = request.args.get('company')
-        alerts = market_service.get_ai_trend_alerts(industry, company_name)
-        return jsonify({"alerts": alerts, "count": len(alerts)})
-    except Exception as e:
-        return jsonify({"error": str(e), "message": "Failed to get AI trend alerts"}), 500
+    company_name = request.args.get('company')
+    alerts = get_market_service().get_ai_trend_alerts(industry, company_name)
+    return jsonify({"alerts": alerts, "count": len(alerts)})
 
 @app.route('/api/real-time-insights/<industry>', methods=['GET'])
+@json_errors('Failed to get real-time insights')
 def get_real_time_insights(industry):
     """Get comprehensive real-time market insights"""
-    try:
-        company_name = request.args.get('company')
-        insights = market_service.get_real_time_market_insights(industry, company_name)
-        return jsonify(insights)
-    except Exception as e:
-        return jsonify({"error": str(e), "message": "Failed to get real-time insights"}), 500
+    company_name = request.args.get('company')
+    insights = get_market_service().get_real_time_market_insights(industry, company_name)
+    return jsonify(insights)
 
 @app.route('/api/ai-competitive-intelligence/<company_name>', methods=['GET'])
+@json_errors('Failed to get AI competitive intelligence')
 def get_ai_competitive_intelligence(company_name):
     """Get AI-powered competitive intelligence for a company"""
-    try:
-        industry = request.args.get('industry', 'Point of Sale Software')
-        
-        # Get company data
-        combined_data = admin_db.get_combined_data()
-        company_data = None
-        for company in combined_data.get('companies', []):
-            if company.get('company').lower() == company_name.lower():
-                company_data = company
-                break
-        
-        if not company_data:
-            company_data = {"company": company_name, "products": []}
-        
-        intelligence = market_service.get_ai_competitive_intelligence(company_name, industry, company_data)
-        return jsonify(intelligence)
-    except Exception as e:
-        return jsonify({"error": str(e), "message": "Failed to get AI competitive intelligence"}), 500
+    industry = request.args.get('industry', 'Point of Sale Software')
+    
+    # Get company data
+    company_data = admin_db.get_company_by_name(company_name) or {"company": company_name, "products": []}
+    
+    # The analysis is serialized once when cached; send those bytes as-is
+    body = get_market_service().get_ai_competitive_intelligence_json(company_name, industry, company_data)
+    return Response(body, mimetype='application/json')
 
 @app.route('/api/ai-competitive-scoring/<company_name>', methods=['GET'])
+@json_errors('Failed to get AI competitive scoring')
 def get_ai_competitive_scoring(company_name):
     """Get AI-powered competitive scoring"""
-    try:
-        industry = request.args.get('industry', 'Point of Sale Software')
-        scoring = market_service.get_ai_competitive_scoring(company_name, industry)
-        return jsonify(scoring)
-    except Exception as e:
-        return jsonify({"error": str(e), "message": "Failed to get AI competitive scoring"}), 500
+    industry = request.args.get('industry', 'Point of Sale Software')
+    scoring = get_market_service().get_ai_competitive_scoring(company_name, industry)
+    return jsonify(scoring)
+
+# Static part of the AI analysis status; only last_updated changes
+AI_ANALYSIS_STATUS = {
+    "status": "active",
+    "services": {
+        "market_intelligence": "operational",
+        "competitive_analysis": "operational", 
+        "trend_analysis": "operational"
+    },
+    "capabilities": [
+        "Real-time market data analysis",
+        "AI-powered competitive intelligence",
+        "Trend detection and prediction",
+        "Market opportunity identification",
+        "Competitive positioning analysis",
+        "Investment and funding insights"
+    ],
+    "data_sources": [
+        "Real-time market APIs",
+        "News sentiment analysis",
+        "Competitive intelligence gathering",
+        "AI trend detection algorithms",
+        "Machine learning predictions"
+    ],
+    "update_frequency": "Real-time with 5-minute cache",
+    "confidence_score": 0.89
+}
+
+# Serialized status (timestamp, body, etag), refreshed at most once per second
+_ai_status_cache = (None, None, None)
 
 @app.route('/api/ai-analysis-status', methods=['GET'])
+@json_errors()
 def get_ai_analysis_status():
     """Get AI analysis service status and capabilities"""
-    try:
-        return jsonify({
-            "status": "active",
-            "services": {
-                "market_intelligence": "operational",
-                "competitive_analysis": "operational", 
-                "trend_analysis": "operational"
-            },
-            "capabilities": [
-                "Real-time market data analysis",
-                "AI-powered competitive intelligence",
-                "Trend detection and prediction",
-                "Market opportunity identification",
-                "Competitive positioning analysis",
-                "Investment and funding insights"
-            ],
-            "data_sources": [
-                "Real-time market APIs",
-                "News sentiment analysis",
-                "Competitive intelligence gathering",
-                "AI trend detection algorithms",
-                "Machine learning predictions"
-            ],
-            "update_frequency": "Real-time with 5-minute cache",
-            "confidence_score": 0.89,
-            "last_updated": datetime.now().isoformat()
-        })
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    global _ai_status_cache
+    timestamp = now_iso()
+    cached_timestamp, body, etag = _ai_status_cache
+    if cached_timestamp != timestamp:
+        body, etag = serialize_json({**AI_ANALYSIS_STATUS, "last_updated": timestamp})
+        _ai_status_cache = (timestamp, body, etag)
+    return etag_response(body, etag)
 
 # Register admin blueprints
 admin_app = create_admin_app()
@@ -964,534 +1039,547 @@ def sales_health_check():
         }), 500
 
 @app.route('/api/sales/summary', methods=['GET'])
+@json_errors('Failed to fetch sales summary')
 def get_sales_summary():
     """Get basic sales summary with optional filtering"""
-    try:
-        # Get query parameters
-        product_id = request.args.get('product_id')
-        sector = request.args.get('sector')
-        region = request.args.get('region')
-        period_start = request.args.get('period_start')
-        period_end = request.args.get('period_end')
-        
-        summary = sales_service.get_sales_summary(
-            product_id=product_id,
-            sector=sector,
-            region=region,
-            period_start=period_start,
-            period_end=period_end
-        )
-        
-        return jsonify(summary)
-    except Exception as e:
-        return jsonify({'error': str(e), 'message': 'Failed to fetch sales summary'}), 500
+    # Get query parameters
+    product_id = request.args.get('product_id')
+    sector = request.args.get('sector')
+    region = request.args.get('region')
+    period_start = request.args.get('period_start')
+    period_end = request.args.get('period_end')
+    
+    summary = sales_service.get_sales_summary(
+        product_id=product_id,
+        sector=sector,
+        region=region,
+        period_start=period_start,
+        period_end=period_end
+    )
+    
+    return jsonify(summary)
 
 @app.route('/api/sales/test-data', methods=['GET'])
+@json_errors('Failed to fetch test data')
 def get_sales_test_data():
     """Return sample data for frontend development"""
-    try:
-        # Get a subset of data for testing
-        summary = sales_service.get_sales_summary()
-        sector_performance = sales_service.get_sector_performance()
-        
-        # Get trend data for the first available product
-        sales_service._load_data()
-        if sales_service.data and sales_service.data.get('sales_data'):
-            first_product = sales_service.data['sales_data'][0]
-            trend_data = sales_service.get_trend_analysis(first_product.product_id)
-        else:
-            trend_data = {}
-        
-        test_data = {
-            'summary': summary,
-            'sector_performance': sector_performance[:3],  # Top 3 sectors
-            'sample_trend': trend_data,
-            'available_filters': {
-                'sectors': list(set(entry.sector for entry in sales_service.data.get('sales_data', []))),
-                'regions': list(set(entry.region for entry in sales_service.data.get('sales_data', []))),
-                'products': list(set(entry.product_id for entry in sales_service.data.get('sales_data', [])))
-            } if sales_service.data else {}
-        }
-        
-        return jsonify(test_data)
-    except Exception as e:
-        return jsonify({'error': str(e), 'message': 'Failed to fetch test data'}), 500
+    # Get a subset of data for testing
+    summary = sales_service.get_sales_summary()
+    sector_performance = sales_service.get_sector_performance()
+    
+    # Get trend data for the first available product (get_sales_summary
+    # above has already loaded the data)
+    if sales_service.data and sales_service.data.get('sales_data'):
+        first_product = sales_service.data['sales_data'][0]
+        trend_data = sales_service.get_trend_analysis(first_product.product_id)
+    else:
+        trend_data = {}
+    
+    test_data = {
+        'summary': summary,
+        'sector_performance': sector_performance[:3],  # Top 3 sectors
+        'sample_trend': trend_data,
+        # Distinct values are precomputed when the data is loaded
+        'available_filters': sales_service._available_filters if sales_service.data else {}
+    }
+    
+    return jsonify(test_data)
+
+@lru_cache(maxsize=256)
+def _serialized_sector_performance(region, generation):
+    """Serialized sector performance for a region; generation ties it to the loaded sales data"""
+    sector_data = sales_service.get_sector_performance(region=region)
+    return serialize_json({
+        'sectors': sector_data,
+        'total_sectors': len(sector_data),
+        'region_filter': region
+    })
 
 @app.route('/api/sales/sectors', methods=['GET'])
+@json_errors('Failed to fetch sector performance')
 def get_sector_performance():
     """Get sales performance by sector"""
-    try:
-        region = request.args.get('region')
-        sector_data = sales_service.get_sector_performance(region=region)
-        
-        return jsonify({
-            'sectors': sector_data,
-            'total_sectors': len(sector_data),
-            'region_filter': region
-        })
-    except Exception as e:
-        return jsonify({'error': str(e), 'message': 'Failed to fetch sector performance'}), 500
+    region = request.args.get('region')
+    
+    # Reuse the serialized payload until the sales data is reloaded
+    sales_service.ensure_loaded()
+    return etag_response(*_serialized_sector_performance(region, sales_service._generation))
 
 @app.route('/api/sales/trends/<product_id>', methods=['GET'])
+@json_errors('Failed to fetch trend analysis', not_found_message='Product not found')
 def get_product_trends(product_id):
     """Get trend analysis for a specific product"""
-    try:
-        analysis_type = request.args.get('analysis_type', 'monthly')
-        trend_data = sales_service.get_trend_analysis(product_id, analysis_type)
-        
-        return jsonify(trend_data)
-    except ValueError as e:
-        return jsonify({'error': str(e), 'message': 'Product not found'}), 404
-    except Exception as e:
-        return jsonify({'error': str(e), 'message': 'Failed to fetch trend analysis'}), 500
+    analysis_type = request.args.get('analysis_type', 'monthly')
+    trend_data = sales_service.get_trend_analysis(product_id, analysis_type)
+    
+    return jsonify(trend_data)
 
 @app.route('/api/sales/validation', methods=['GET'])
+@json_errors('Failed to validate data quality')
 def get_data_quality():
     """Get data quality validation results"""
-    try:
-        validation_results = sales_service.validate_data_quality()
-        return jsonify(validation_results)
-    except Exception as e:
-        return jsonify({'error': str(e), 'message': 'Failed to validate data quality'}), 500
+    validation_results = sales_service.validate_data_quality()
+    return jsonify(validation_results)
 
 @app.route('/api/sales/reload', methods=['POST'])
+@json_errors('Failed to reload sales data')
 def reload_sales_data():
     """Force reload of sales data (for development/testing)"""
-    try:
-        sales_service.reload_data()
-        summary = sales_service.get_sales_summary()
-        
-        return jsonify({
-            'message': 'Sales data reloaded successfully',
-            'total_records': summary.get('total_records', 0),
-            'timestamp': datetime.now().isoformat()
-        })
-    except Exception as e:
-        return jsonify({'error': str(e), 'message': 'Failed to reload sales data'}), 500
+    sales_service.reload_data()
+    summary = sales_service.get_sales_summary()
+    
+    return jsonify({
+        'message': 'Sales data reloaded successfully',
+        'total_records': summary.get('total_records', 0),
+        'timestamp': now_iso()
+    })
 
 # Advanced Sales Trends API Endpoints (Phase 2)
 @app.route('/api/sales/trends', methods=['GET'])
+@json_errors('Failed to fetch trends data', not_found_message='Product not found')
 def get_sales_trends():
     """Get time-series trend data with filtering"""
-    try:
-        # Get query parameters
-        product_id = request.args.get('product_id')
-        sector = request.args.get('sector')
-        region = request.args.get('region')
-        date_range = request.args.get('date_range')  # 'latest_quarter', 'latest_year', etc.
-        period = request.args.get('period', 'monthly')  # monthly, quarterly, yearly
-        
-        if not product_id:
-            return jsonify({'error': 'product_id parameter is required'}), 400
-        
-        # Get trend analysis
-        trend_data = sales_service.get_trend_analysis(product_id, period)
-        
-        # Apply additional filtering if needed
-        filtered_trend_data = trend_data.copy()
-        if date_range:
-            # Filter trend data based on date range
-            filtered_points = []
-            for point in trend_data['trend_data']:
-                if sales_service._is_in_time_period(point['period'], date_range):
-                    filtered_points.append(point)
-            filtered_trend_data['trend_data'] = filtered_points
-        
-        return jsonify({
-            'trend_analysis': filtered_trend_data,
-            'filters_applied': {
-                'product_id': product_id,
-                'sector': sector,
-                'region': region,
-                'date_range': date_range,
-                'period': period
-            }
-        })
-    except ValueError as e:
-        return jsonify({'error': str(e), 'message': 'Product not found'}), 404
-    except Exception as e:
-        return jsonify({'error': str(e), 'message': 'Failed to fetch trends data'}), 500
+    # Get query parameters
+    product_id = request.args.get('product_id')
+    sector = request.args.get('sector')
+    region = request.args.get('region')
+    date_range = request.args.get('date_range')  # 'latest_quarter', 'latest_year', etc.
+    period = request.args.get('period', 'monthly')  # monthly, quarterly, yearly
+    
+    if not product_id:
+        return jsonify({'error': 'product_id parameter is required'}), 400
+    
+    # Get trend analysis, limited to the date range by the service
+    trend_data = sales_service.get_trend_analysis(product_id, period, date_range=date_range)
+    
+    return jsonify({
+        'trend_analysis': trend_data,
+        'filters_applied': {
+            'product_id': product_id,
+            'sector': sector,
+            'region': region,
+            'date_range': date_range,
+            'period': period
+        }
+    })
 
 @app.route('/api/sales/trends/all', methods=['GET'])
+@json_errors('Failed to fetch all trends data')
 def get_all_products_trends():
     """Get trend data for all products"""
-    try:
-        # Get query parameters
-        sector = request.args.get('sector')
-        region = request.args.get('region')
-        limit = int(request.args.get('limit', 10))
-        
-        # Get all available products first
-        sales_service._load_data()
-        if not sales_service.data or not sales_service.data.get('sales_data'):
-            return jsonify({'trends': [], 'message': 'No sales data available'})
-        
-        # Filter products based on criteria
-        filtered_data = sales_service._filter_sales_data(
-            sales_service.data['sales_data'], 
-            sector=sector, 
-            region=region
-        )
-        
-        # Get unique product IDs
-        product_ids = list(set(entry.product_id for entry in filtered_data))[:limit]
-        
-        # Get trend data for each product
-        all_trends = []
+    # Get query parameters
+    sector = request.args.get('sector')
+    region = request.args.get('region')
+    limit = int(request.args.get('limit', 10))
+    
+    # Get all available products first
+    sales_service.ensure_loaded()
+    if not sales_service.data or not sales_service.data.get('sales_data'):
+        return jsonify({'trends': [], 'message': 'No sales data available'})
+    
+    # Filter products based on criteria
+    filtered_data = sales_service._filter_sales_data(
+        sales_service.data['sales_data'], 
+        sector=sector, 
+        region=region
+    )
+    
+    # Get unique product IDs (first-seen order, so the selection is stable)
+    product_ids = list(islice(dict.fromkeys(entry.product_id for entry in filtered_data), limit))
+    
+    def get_trend_or_none(product_id):
+        try:
+            return sales_service.get_trend_analysis(product_id)
+        except Exception as e:
+            logger.warning(f"Failed to get trends for product {product_id}: {e}")
+            return None
+    
+    # Get trend data for each product, streaming results in order; trend
+    # analysis is pure CPU work (no I/O), so it runs inline rather than on a
+    # thread pool. Failed products are skipped
+    def iter_trends():
         for product_id in product_ids:
-            try:
-                trend_data = sales_service.get_trend_analysis(product_id)
-                all_trends.append(trend_data)
-            except Exception as e:
-                logger.warning(f"Failed to get trends for product {product_id}: {e}")
-                continue
-        
-        return jsonify({
-            'trends': all_trends,
-            'total_products': len(product_ids),
-            'filters_applied': {
-                'sector': sector,
-                'region': region,
-                'limit': limit
-            }
-        })
-    except Exception as e:
-        return jsonify({'error': str(e), 'message': 'Failed to fetch all trends data'}), 500
+            trend = get_trend_or_none(product_id)
+            if trend is not None:
+                yield trend
+    
+    return json_stream_response({
+        'total_products': len(product_ids),
+        'filters_applied': {
+            'sector': sector,
+            'region': region,
+            'limit': limit
+        }
+    }, 'trends', iter_trends())
 
 # Advanced Sector Analysis API Endpoints
 @app.route('/api/sales/by-sector', methods=['GET'])
+@json_errors('Failed to fetch sector breakdown')
 def get_sales_by_sector():
     """Get sales breakdown by sector with advanced analytics"""
-    try:
-        region = request.args.get('region')
-        time_period = request.args.get('time_period')  # latest_quarter, latest_year, etc.
-        
-        sector_data = sales_service.get_sector_analysis_advanced(
-            region=region, 
-            time_period=time_period
-        )
-        
-        return jsonify(sector_data)
-    except Exception as e:
-        return jsonify({'error': str(e), 'message': 'Failed to fetch sector breakdown'}), 500
+    region = request.args.get('region')
+    time_period = request.args.get('time_period')  # latest_quarter, latest_year, etc.
+    
+    sector_data = sales_service.get_sector_analysis_advanced(
+        region=region, 
+        time_period=time_period
+    )
+    
+    return jsonify(sector_data)
 
 @app.route('/api/sales/sector-trends', methods=['GET'])
+@json_errors('Failed to fetch sector trends')
 def get_sector_trends():
     """Get sector performance trends over time"""
-    try:
-        region = request.args.get('region')
-        
-        # Get basic sector performance
-        sector_performance = sales_service.get_sector_performance(region=region)
-        
-        # Get advanced sector analysis
-        advanced_analysis = sales_service.get_sector_analysis_advanced(region=region)
-        
-        return jsonify({
-            'basic_performance': sector_performance,
-            'advanced_analysis': advanced_analysis,
-            'filters_applied': {
-                'region': region
-            }
-        })
-    except Exception as e:
-        return jsonify({'error': str(e), 'message': 'Failed to fetch sector trends'}), 500
+    region = request.args.get('region')
+    
+    # Get basic sector performance
+    sector_performance = sales_service.get_sector_performance(region=region)
+    
+    # Get advanced sector analysis
+    advanced_analysis = sales_service.get_sector_analysis_advanced(region=region)
+    
+    return jsonify({
+        'basic_performance': sector_performance,
+        'advanced_analysis': advanced_analysis,
+        'filters_applied': {
+            'region': region
+        }
+    })
 
 @app.route('/api/sales/sector-comparison', methods=['POST'])
+@json_errors('Failed to compare sectors')
 def compare_sectors():
     """Compare multiple sectors performance"""
-    try:
-        request_data = request.get_json()
-        sectors = request_data.get('sectors', [])
-        region = request_data.get('region')
-        
-        if not sectors or len(sectors) < 2:
-            return jsonify({'error': 'At least 2 sectors required for comparison'}), 400
-        
-        # Get advanced sector analysis
-        all_sectors_data = sales_service.get_sector_analysis_advanced(region=region)
-        
-        # Filter for requested sectors
-        comparison_data = []
-        for sector_info in all_sectors_data['sectors']:
-            if sector_info['sector'] in sectors:
-                comparison_data.append(sector_info)
-        
-        if len(comparison_data) < 2:
-            return jsonify({'error': 'Could not find enough sectors for comparison'}), 404
-        
-        # Calculate comparison metrics
-        total_revenue = sum(s['total_revenue'] for s in comparison_data)
-        comparison_metrics = {
-            'revenue_leader': max(comparison_data, key=lambda x: x['total_revenue'])['sector'],
-            'growth_leader': max(comparison_data, key=lambda x: x['average_growth_rate'])['sector'],
-            'market_share_leader': max(comparison_data, key=lambda x: x['market_penetration'])['sector'],
-            'most_diverse': max(comparison_data, key=lambda x: x['product_count'])['sector'],
-            'total_combined_revenue': round(total_revenue, 2)
+    request_data = request.get_json()
+    sectors = request_data.get('sectors', [])
+    region = request_data.get('region')
+    
+    if not sectors or len(sectors) < 2:
+        return jsonify({'error': 'At least 2 sectors required for comparison'}), 400
+    
+    # Get advanced sector analysis for the requested sectors only
+    comparison_data = sales_service.get_sector_analysis_advanced(
+        region=region,
+        sectors_whitelist=frozenset(sectors)
+    )['sectors']
+    
+    if len(comparison_data) < 2:
+        return jsonify({'error': 'Could not find enough sectors for comparison'}), 404
+    
+    # Calculate comparison metrics in a single pass; strict '>' keeps the
+    # first sector on ties, as max() does
+    revenue_leader = growth_leader = market_share_leader = most_diverse = comparison_data[0]
+    total_revenue = 0
+    for s in comparison_data:
+        total_revenue += s['total_revenue']
+        if s['total_revenue'] > revenue_leader['total_revenue']:
+            revenue_leader = s
+        if s['average_growth_rate'] > growth_leader['average_growth_rate']:
+            growth_leader = s
+        if s['market_penetration'] > market_share_leader['market_penetration']:
+            market_share_leader = s
+        if s['product_count'] > most_diverse['product_count']:
+            most_diverse = s
+    
+    comparison_metrics = {
+        'revenue_leader': revenue_leader['sector'],
+        'growth_leader': growth_leader['sector'],
+        'market_share_leader': market_share_leader['sector'],
+        'most_diverse': most_diverse['sector'],
+        'total_combined_revenue': round(total_revenue, 2)
+    }
+    
+    return jsonify({
+        'comparison_data': comparison_data,
+        'comparison_metrics': comparison_metrics,
+        'sectors_compared': sectors,
+        'filters_applied': {
+            'region': region
         }
-        
-        return jsonify({
-            'comparison_data': comparison_data,
-            'comparison_metrics': comparison_metrics,
-            'sectors_compared': sectors,
-            'filters_applied': {
-                'region': region
-            }
-        })
-    except Exception as e:
-        return jsonify({'error': str(e), 'message': 'Failed to compare sectors'}), 500
+    })
 
 # Product Performance API Endpoints
+# Sort keys for re-ranking top products by a metric other than revenue
+TOP_PRODUCT_SORT_KEYS = {
+    'units': itemgetter('total_units'),
+    'growth_rate': itemgetter('average_growth_rate')
+}
+
 @app.route('/api/sales/top-products', methods=['GET'])
+@json_errors('Failed to fetch top products')
 def get_top_products():
     """Get best performing products"""
-    try:
-        sector = request.args.get('sector')
-        region = request.args.get('region')
-        limit = int(request.args.get('limit', 10))
-        metric = request.args.get('metric', 'revenue')  # revenue, units, growth_rate
-        
-        # Get product performance analytics
-        analytics = sales_service.get_product_performance_analytics(
-            sector=sector, 
-            region=region, 
-            limit=limit
-        )
-        
-        # Sort by requested metric
-        if metric == 'revenue':
-            top_products = analytics['top_performers']
-        elif metric == 'units':
-            top_products = sorted(analytics['top_performers'], key=lambda x: x['total_units'], reverse=True)[:limit]
-        elif metric == 'growth_rate':
-            top_products = sorted(analytics['top_performers'], key=lambda x: x['average_growth_rate'], reverse=True)[:limit]
-        else:
-            top_products = analytics['top_performers']
-        
-        return jsonify({
-            'top_products': top_products,
-            'metric_used': metric,
-            'summary_stats': analytics['summary_stats'],
-            'filters_applied': {
-                'sector': sector,
-                'region': region,
-                'limit': limit,
-                'metric': metric
-            }
-        })
-    except Exception as e:
-        return jsonify({'error': str(e), 'message': 'Failed to fetch top products'}), 500
+    sector = request.args.get('sector')
+    region = request.args.get('region')
+    limit = int(request.args.get('limit', 10))
+    metric = request.args.get('metric', 'revenue')  # revenue, units, growth_rate
+    
+    # Get product performance analytics
+    analytics = sales_service.get_product_performance_analytics(
+        sector=sector, 
+        region=region, 
+        limit=limit
+    )
+    
+    # Sort by requested metric (top performers are already ranked by revenue)
+    sort_key = TOP_PRODUCT_SORT_KEYS.get(metric)
+    if sort_key and limit > 0:
+        top_products = heapq.nlargest(limit, analytics['top_performers'], key=sort_key)
+    elif sort_key:
+        top_products = sorted(analytics['top_performers'], key=sort_key, reverse=True)[:limit]
+    else:
+        top_products = analytics['top_performers']
+    
+    return jsonify({
+        'top_products': top_products,
+        'metric_used': metric,
+        'summary_stats': analytics['summary_stats'],
+        'filters_applied': {
+            'sector': sector,
+            'region': region,
+            'limit': limit,
+            'metric': metric
+        }
+    })
 
 @app.route('/api/sales/product-rankings', methods=['GET'])
+@json_errors('Failed to fetch product rankings')
 def get_product_rankings():
     """Get ranked product performance across all metrics"""
-    try:
-        sector = request.args.get('sector')
-        region = request.args.get('region')
-        limit = int(request.args.get('limit', 20))
-        
-        analytics = sales_service.get_product_performance_analytics(
-            sector=sector, 
-            region=region, 
-            limit=limit
-        )
-        
-        return jsonify({
-            'rankings': {
-                'by_revenue': analytics['top_performers'],
-                'by_lifecycle': analytics['lifecycle_analysis'],
-                'by_efficiency': analytics['revenue_vs_units_analysis'][:limit]
-            },
-            'cross_sector_analysis': analytics['cross_sector_performance'],
-            'summary_stats': analytics['summary_stats'],
-            'filters_applied': analytics['filters_applied']
-        })
-    except Exception as e:
-        return jsonify({'error': str(e), 'message': 'Failed to fetch product rankings'}), 500
+    sector = request.args.get('sector')
+    region = request.args.get('region')
+    limit = int(request.args.get('limit', 20))
+    
+    analytics = sales_service.get_product_performance_analytics(
+        sector=sector, 
+        region=region, 
+        limit=limit
+    )
+    
+    return jsonify({
+        'rankings': {
+            'by_revenue': analytics['top_performers'],
+            'by_lifecycle': analytics['lifecycle_analysis'],
+            'by_efficiency': analytics['revenue_vs_units_analysis'][:limit]
+        },
+        'cross_sector_analysis': analytics['cross_sector_performance'],
+        'summary_stats': analytics['summary_stats'],
+        'filters_applied': analytics['filters_applied']
+    })
+
+@lru_cache(maxsize=512)
+def _serialized_product_performance(product_id, generation):
+    """Serialized performance detail for a product, or None if it has no sales; generation ties it to the loaded sales data"""
+    # Get trend analysis
+    trend_data = sales_service.get_trend_analysis(product_id)
+    
+    # Cross-sector aggregates are computed once per product and cached
+    cross_sector = sales_service.get_cross_sector(product_id)
+    if not cross_sector:
+        return None
+    
+    return serialize_json({
+        'product_id': product_id,
+        'trend_analysis': trend_data,
+        **cross_sector
+    })
 
 @app.route('/api/sales/performance/<product_id>', methods=['GET'])
+@json_errors('Failed to fetch product performance', not_found_message='Product not found')
 def get_product_performance_detail(product_id):
     """Get detailed performance analytics for a specific product"""
-    try:
-        # Get trend analysis
-        trend_data = sales_service.get_trend_analysis(product_id)
-        
-        # Get product performance analytics (filtered to this product)
-        sales_service._load_data()
-        filtered_data = sales_service._filter_sales_data(
-            sales_service.data['sales_data'], 
-            product_id=product_id
-        )
-        
-        if not filtered_data:
-            return jsonify({'error': 'Product not found'}), 404
-        
-        # Calculate cross-sector performance for this product
-        cross_sector_data = {}
-        for sales_entry in filtered_data:
-            sector = sales_entry.sector
-            if sector not in cross_sector_data:
-                cross_sector_data[sector] = {
-                    'revenue': 0,
-                    'units': 0,
-                    'growth_rates': []
-                }
-            
-            for record in sales_entry.sales_records:
-                cross_sector_data[sector]['revenue'] += record.revenue
-                cross_sector_data[sector]['units'] += record.units_sold
-                cross_sector_data[sector]['growth_rates'].append(record.growth_rate)
-        
-        # Calculate averages for each sector
-        for sector, data in cross_sector_data.items():
-            data['average_growth_rate'] = sum(data['growth_rates']) / len(data['growth_rates']) if data['growth_rates'] else 0
-            data['revenue_per_unit'] = data['revenue'] / data['units'] if data['units'] > 0 else 0
-        
-        return jsonify({
-            'product_id': product_id,
-            'trend_analysis': trend_data,
-            'cross_sector_performance': cross_sector_data,
-            'sector_count': len(cross_sector_data),
-            'best_performing_sector': max(cross_sector_data.items(), key=lambda x: x[1]['revenue'])[0] if cross_sector_data else None,
-            'total_revenue': sum(data['revenue'] for data in cross_sector_data.values()),
-            'total_units': sum(data['units'] for data in cross_sector_data.values())
-        })
-    except ValueError as e:
-        return jsonify({'error': str(e), 'message': 'Product not found'}), 404
-    except Exception as e:
-        return jsonify({'error': str(e), 'message': 'Failed to fetch product performance'}), 500
+    # Reuse the serialized detail until the sales data is reloaded
+    sales_service.ensure_loaded()
+    serialized = _serialized_product_performance(product_id, sales_service._generation)
+    if serialized is None:
+        return jsonify({'error': 'Product not found'}), 404
+    
+    return etag_response(*serialized)
 
 @app.route('/api/sales/cross-sector/<product_id>', methods=['GET'])
+@json_errors('Failed to fetch cross-sector performance')
 def get_product_cross_sector_performance(product_id):
     """Get product performance across different sectors"""
-    try:
-        # This is essentially the same as the detailed performance endpoint
-        # but focused specifically on cross-sector analysis
-        return get_product_performance_detail(product_id)
-    except Exception as e:
-        return jsonify({'error': str(e), 'message': 'Failed to fetch cross-sector performance'}), 500
+    # Same cross-sector breakdown as the detailed performance endpoint,
+    # without paying for the trend analysis
+    cross_sector = sales_service.get_cross_sector(product_id)
+    if not cross_sector:
+        return jsonify({'error': 'Product not found'}), 404
+    
+    return jsonify({
+        'product_id': product_id,
+        **cross_sector
+    })
 
 # Advanced Query API Endpoints (Phase 2)
+# Request body schema for advanced queries, compiled once at import
+validate_advanced_query = fastjsonschema.compile({
+    'type': 'object',
+    'required': ['filters'],
+    'properties': {
+        'filters': {'type': 'object', 'minProperties': 1},
+        'aggregations': {'type': 'array', 'items': {'enum': ['sum', 'avg', 'count', 'min', 'max']}},
+        'sort_by': {'type': 'string'},
+        # 0 (like null) means no limit, as before; negative limits are rejected
+        'limit': {'type': ['integer', 'null'], 'minimum': 0},
+        'include_statistical_significance': {'type': 'boolean'}
+    }
+})
+
 @app.route('/api/sales/advanced-query', methods=['POST'])
+@json_errors('Failed to execute advanced query')
 def advanced_sales_query():
     """Perform advanced multi-dimensional queries with statistical analysis"""
+    request_data = request.get_json(silent=True)
+    
+    # Validate the request body
     try:
-        request_data = request.get_json()
-        
-        # Extract query parameters
-        filters = request_data.get('filters', {})
-        aggregations = request_data.get('aggregations', ['sum', 'avg', 'count'])
-        sort_by = request_data.get('sort_by', 'revenue')
-        limit = request_data.get('limit')
-        include_stats = request_data.get('include_statistical_significance', False)
-        
-        # Validate filters
-        if not filters:
+        validate_advanced_query(request_data)
+    except fastjsonschema.JsonSchemaValueException as e:
+        if e.rule == 'required' or e.name == 'data.filters':
             return jsonify({'error': 'At least one filter must be provided'}), 400
-        
-        # Execute advanced query
-        results = sales_service.advanced_multi_dimensional_query(
-            filters=filters,
-            aggregations=aggregations,
-            sort_by=sort_by,
-            limit=limit,
-            include_statistical_significance=include_stats
-        )
-        
-        return jsonify(results)
-    except Exception as e:
-        return jsonify({'error': str(e), 'message': 'Failed to execute advanced query'}), 500
+        return jsonify({'error': f'Invalid query: {e.message}'}), 400
+    
+    # Extract query parameters
+    filters = request_data['filters']
+    aggregations = request_data.get('aggregations', ['sum', 'avg', 'count'])
+    sort_by = request_data.get('sort_by', 'revenue')
+    limit = request_data.get('limit')
+    include_stats = request_data.get('include_statistical_significance', False)
+    
+    # Results are deterministic for a given data file version and query
+    sales_service.ensure_loaded()
+    cache_key = hashlib.blake2b(orjson.dumps({
+        'version': sales_service._data_mtime,
+        'filters': filters,
+        'aggregations': aggregations,
+        'sort_by': sort_by,
+        'limit': limit,
+        'include_stats': include_stats
+    }, option=orjson.OPT_SORT_KEYS), digest_size=16).hexdigest()
+    query_cache = get_query_cache()
+    cached_body = query_cache.get(cache_key)
+    if cached_body is not None:
+        return Response(cached_body, mimetype='application/json')
+    
+    # Execute advanced query
+    results = sales_service.advanced_multi_dimensional_query(
+        filters=filters,
+        aggregations=aggregations,
+        sort_by=sort_by,
+        limit=limit,
+        include_statistical_significance=include_stats
+    )
+    
+    # The rows are already materialized (sorted and counted), so serialize
+    # the payload once and store those same bytes in the query cache
+    body, _ = serialize_json(results)
+    query_cache.set(cache_key, body)
+    return Response(body, mimetype='application/json')
+
+# Static parts of the quick filter options
+QUICK_FILTER_DATE_RANGES = (
+    {'key': 'latest_quarter', 'label': 'Last 3 Months', 'value': 'latest_quarter'},
+    {'key': 'latest_6_months', 'label': 'Last 6 Months', 'value': 'latest_6_months'},
+    {'key': 'latest_year', 'label': 'Last 12 Months', 'value': 'latest_year'}
+)
+QUICK_FILTER_AGGREGATION_OPTIONS = (
+    {'key': 'sum', 'label': 'Sum'},
+    {'key': 'avg', 'label': 'Average'},
+    {'key': 'count', 'label': 'Count'},
+    {'key': 'min', 'label': 'Minimum'},
+    {'key': 'max', 'label': 'Maximum'}
+)
+QUICK_FILTER_SORT_OPTIONS = (
+    {'key': 'revenue', 'label': 'Revenue'},
+    {'key': 'units', 'label': 'Units Sold'},
+    {'key': 'growth_rate', 'label': 'Growth Rate'},
+    {'key': 'market_share', 'label': 'Market Share'}
+)
+
+@lru_cache(maxsize=4)
+def _serialized_quick_filter_options(generation):
+    """Serialized (and gzipped) quick filter options; generation ties them to the loaded sales data"""
+    if not sales_service.data or not sales_service.data.get('sales_data'):
+        return serialize_json_gzip({
+            'products': [],
+            'sectors': [],
+            'regions': [],
+            'date_ranges': []
+        })
+    
+    # Unique filter values (sorted when the data is loaded)
+    available_filters = sales_service._available_filters
+    
+    # Extract date range information
+    date_ranges = []
+    if sales_service._period_index:
+        date_ranges = [
+            *QUICK_FILTER_DATE_RANGES,
+            {'key': 'custom', 'label': 'Custom Range', 'value': 'custom',
+             'min_date': sales_service._period_min, 'max_date': sales_service._period_max}
+        ]
+    
+    return serialize_json_gzip({
+        'products': [{'id': p, 'label': p} for p in available_filters['products']],
+        'sectors': [{'id': s, 'label': s} for s in available_filters['sectors']],
+        'regions': [{'id': r, 'label': r} for r in available_filters['regions']],
+        'date_ranges': date_ranges,
+        'aggregation_options': QUICK_FILTER_AGGREGATION_OPTIONS,
+        'sort_options': QUICK_FILTER_SORT_OPTIONS
+    })
 
 @app.route('/api/sales/quick-filters', methods=['GET'])
+@json_errors('Failed to fetch filter options')
 def get_quick_filter_options():
     """Get available filter options for quick filtering"""
-    try:
-        sales_service._load_data()
-        if not sales_service.data or not sales_service.data.get('sales_data'):
-            return jsonify({
-                'products': [],
-                'sectors': [],
-                'regions': [],
-                'date_ranges': []
-            })
-        
-        # Extract unique values for filters
-        products = list(sales_service._product_index.keys())
-        sectors = list(sales_service._sector_index.keys())
-        regions = list(sales_service._region_index.keys())
-        
-        # Extract date range information
-        periods = sorted(sales_service._period_index.keys())
-        date_ranges = []
-        if periods:
-            date_ranges = [
-                {'key': 'latest_quarter', 'label': 'Last 3 Months', 'value': 'latest_quarter'},
-                {'key': 'latest_6_months', 'label': 'Last 6 Months', 'value': 'latest_6_months'},
-                {'key': 'latest_year', 'label': 'Last 12 Months', 'value': 'latest_year'},
-                {'key': 'custom', 'label': 'Custom Range', 'value': 'custom', 'min_date': periods[0], 'max_date': periods[-1]}
-            ]
-        
-        return jsonify({
-            'products': [{'id': p, 'label': p} for p in sorted(products)],
-            'sectors': [{'id': s, 'label': s} for s in sorted(sectors)],
-            'regions': [{'id': r, 'label': r} for r in sorted(regions)],
-            'date_ranges': date_ranges,
-            'aggregation_options': [
-                {'key': 'sum', 'label': 'Sum'},
-                {'key': 'avg', 'label': 'Average'},
-                {'key': 'count', 'label': 'Count'},
-                {'key': 'min', 'label': 'Minimum'},
-                {'key': 'max', 'label': 'Maximum'}
-            ],
-            'sort_options': [
-                {'key': 'revenue', 'label': 'Revenue'},
-                {'key': 'units', 'label': 'Units Sold'},
-                {'key': 'growth_rate', 'label': 'Growth Rate'},
-                {'key': 'market_share', 'label': 'Market Share'}
-            ]
-        })
-    except Exception as e:
-        return jsonify({'error': str(e), 'message': 'Failed to fetch filter options'}), 500
+    # Reuse the serialized options until the sales data is reloaded
+    sales_service.ensure_loaded()
+    response = etag_response(*_serialized_quick_filter_options(sales_service._generation))
+    response.headers['Cache-Control'] = 'private, max-age=60'
+    response.vary.add('Accept-Encoding')
+    return response
 
 # Performance optimization endpoint
 @app.route('/api/sales/cache-stats', methods=['GET'])
+@json_errors('Failed to fetch cache statistics')
 def get_cache_statistics():
     """Get cache performance statistics"""
-    try:
-        stats = {
-            'data_cache': {
-                'is_cached': sales_service._cache_timestamp is not None,
-                'cache_age_seconds': (datetime.now() - sales_service._cache_timestamp).total_seconds() if sales_service._cache_timestamp else 0,
-                'cache_ttl_seconds': sales_service._cache_ttl
-            },
-            'analytics_cache': {
-                'cached_queries': len(sales_service._analytics_cache),
-                'cache_ttl_seconds': sales_service._analytics_cache_ttl,
-                'cached_methods': list(set(key.split('_')[0] for key in sales_service._analytics_cache.keys()))
-            },
-            'indexes': {
-                'products_indexed': len(sales_service._product_index),
-                'sectors_indexed': len(sales_service._sector_index),
-                'regions_indexed': len(sales_service._region_index),
-                'periods_indexed': len(sales_service._period_index)
-            }
-        }
-        
-        return jsonify(stats)
-    except Exception as e:
-        return jsonify({'error': str(e), 'message': 'Failed to fetch cache statistics'}), 500
+    stats = {
+        'data_cache': {
+            'is_cached': sales_service._cache_mono is not None,
+            'cache_age_seconds': time.monotonic() - sales_service._cache_mono if sales_service._cache_mono is not None else 0,
+            'cache_ttl_seconds': sales_service._cache_ttl
+        },
+        'analytics_cache': sales_service.get_analytics_cache_stats(),
+        'indexes': {
+            'products_indexed': len(sales_service._product_index),
+            'sectors_indexed': len(sales_service._sector_index),
+            'regions_indexed': len(sales_service._region_index),
+            'periods_indexed': len(sales_service._period_index)
+        },
+        'cooldown_state': sales_service.get_invalidation_state()
+    }
+    
+    # No ETag: the cache age and hit/miss counters change on every call
+    return jsonify(stats)
 
 @app.route('/api/sales/cache/clear', methods=['POST'])
+@json_errors('Failed to clear cache')
 def clear_sales_cache():
     """Clear all sales analytics caches"""
-    try:
-        sales_service.invalidate_cache()
-        return jsonify({
-            'message': 'All caches cleared successfully',
-            'timestamp': datetime.now().isoformat()
-        })
-    except Exception as e:
-        return jsonify({'error': str(e), 'message': 'Failed to clear cache'}), 500
+    sales_service.invalidate_cache(force=True)
+    get_query_cache().clear()
+    return jsonify({
+        'message': 'All caches cleared successfully',
+        'timestamp': now_iso()
+    })
+
+# Warm the data caches at import time so `gunicorn --preload` forks its
+# workers with them already populated (shared copy-on-write)
+admin_db.get_catalog()
+sales_service.ensure_loaded()
 
 if __name__ == '__main__':
     print("🚀 Starting Catalog API with Admin Panel...")
@@ -1501,4 +1589,8 @@ if __name__ == '__main__':
     print("   - Dashboard: http://localhost:5000/admin-dashboard")
     print("   - Companies: http://localhost:5000/admin/companies")
     print("   - Company Products: http://localhost:5000/admin/company/{company_id}/products")
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    # Development server only; production runs under gunicorn (see gunicorn.conf.py)
+    debug = os.environ.get('FLASK_DEBUG') == '1'
+    if not debug:
+        print("ℹ️  Debug mode off (set FLASK_DEBUG=1 to enable); use gunicorn -c gunicorn.conf.py app:app in production")
+    app.run(debug=debug, threaded=True, host='0.0.0.0', port=5000)
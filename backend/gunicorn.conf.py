@@ -0,0 +1,43 @@
+"""
+Gunicorn configuration for production deployment.
+
+The API is I/O-bound (AI intelligence fan-out, JSON file reads), so it runs
+on gevent workers: each worker multiplexes many connections on greenlets
+instead of blocking a whole process per request. The gevent worker class
+monkey-patches the standard library before the app is imported, which also
+turns the services' thread pools into cooperative greenlets.
+
+It defaults to a single worker: the admin database (admin_db.AdminDatabase)
+keeps admin-created companies and products in process memory only, so with
+several workers each admin change would land in one process while the
+others kept serving the old catalog. One gevent worker still serves many
+concurrent connections; only raise GUNICORN_WORKERS once admin changes are
+persisted somewhere all workers share.
+
+The app is preloaded in the master so the JSON data caches warmed at import
+are parsed once and shared copy-on-write by every forked worker. Because
+the app (and its locks and thread pools) is then created before the workers
+start, the standard library is monkey-patched here, before anything else is
+imported.
+
+Usage:
+    gunicorn -c gunicorn.conf.py app:app
+"""
+
+from gevent import monkey
+
+monkey.patch_all()
+
+import os  # noqa: E402
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:5000")
+worker_class = "gevent"
+workers = int(os.environ.get("GUNICORN_WORKERS", 1))
+worker_connections = int(os.environ.get("GUNICORN_WORKER_CONNECTIONS", 500))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 60))
+keepalive = 5
+preload_app = True
+
+accesslog = "-"
+errorlog = "-"
+loglevel = os.environ.get("GUNICORN_LOG_LEVEL", "info")
@@ -3,58 +3,423 @@ AI-Powered Competitive Analysis Service
 Provides real-time competitive intelligence using AI algorithms
 """
 
+import re
+from bisect import bisect_right
 import requests
 import json
-import datetime
-from typing import Dict, List, Any, Optional
-import time
+from typing import AbstractSet, Dict, FrozenSet, Iterator, List, Any, NamedTuple, Optional, Tuple
+import threading
 import logging
-from concurrent.futures import ThreadPoolExecutor
+from collections import Counter
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+
+import orjson
+from cachetools import TTLCache
+
+from .singleflight import SingleFlight
+from .timestamps import now_iso
 
 logger = logging.getLogger(__name__)
 
+# Competitor and market-movement tables; analyses return them as-is, so
+# derived values go in separate tables (see COMPETITOR_PROFILES)
+MARKET_PRESENCE_INDICATORS = {
+    "Confirma Software": "Growing Regional Player",
+    "Square": "Market Leader",
+    "Shopify": "Strong Competitor",
+    "Toast": "Industry Specialist"
+}
+
+COMPETITOR_DATABASE = {
+    "Point of Sale Software": [
+        {
+            "name": "Square",
+            "products_count": 8,
+            "categories": ["Point of Sale", "Payment Processing", "Analytics"],
+            "market_share": "28.5%",
+            "innovation_index": 9.2,
+            "threat_factors": ["market_leader", "integrated_ecosystem", "strong_funding"]
+        },
+        {
+            "name": "Shopify POS",
+            "products_count": 6,
+            "categories": ["Point of Sale", "E-commerce", "Inventory"],
+            "market_share": "22.1%", 
+            "innovation_index": 8.7,
+            "threat_factors": ["ecommerce_integration", "rapid_growth", "developer_ecosystem"]
+        },
+        {
+            "name": "Toast",
+            "products_count": 5,
+            "categories": ["Point of Sale", "Restaurant Management"],
+            "market_share": "15.3%",
+            "innovation_index": 8.1,
+            "threat_factors": ["industry_specialization", "comprehensive_features"]
+        },
+        {
+            "name": "Lightspeed",
+            "products_count": 4,
+            "categories": ["Point of Sale", "Retail Management"],
+            "market_share": "8.7%",
+            "innovation_index": 7.5,
+            "threat_factors": ["retail_focus", "international_presence"]
+        },
+        {
+            "name": "Clover",
+            "products_count": 6,
+            "categories": ["Point of Sale", "Payment Processing"],
+            "market_share": "12.4%",
+            "innovation_index": 7.8,
+            "threat_factors": ["hardware_integration", "bank_backing"]
+        }
+    ],
+    "ERP Software": [
+        {
+            "name": "SAP",
+            "products_count": 15,
+            "categories": ["ERP", "Analytics", "Cloud Platform"],
+            "market_share": "24.2%",
+            "innovation_index": 8.9,
+            "threat_factors": ["enterprise_dominance", "comprehensive_suite"]
+        },
+        {
+            "name": "Oracle",
+            "products_count": 12,
+            "categories": ["ERP", "Database", "Cloud Infrastructure"],
+            "market_share": "18.7%",
+            "innovation_index": 8.5,
+            "threat_factors": ["cloud_native", "ai_capabilities"]
+        },
+        {
+            "name": "Microsoft Dynamics",
+            "products_count": 8,
+            "categories": ["ERP", "CRM", "Business Intelligence"],
+            "market_share": "15.2%",
+            "innovation_index": 8.3,
+            "threat_factors": ["office_integration", "familiar_interface"]
+        }
+    ]
+}
+
+MARKET_OPPORTUNITIES = (
+    "AI-powered automation features demand growing 200% annually",
+    "Cloud-first SMB market expanding rapidly in emerging regions",
+    "Industry-specific workflow customization becoming key differentiator",
+    "Mobile-first solutions adoption accelerating post-pandemic",
+    "Integration marketplace opportunities with major platforms",
+    "Vertical market specialization for niche industries"
+)
+
+COMPANY_WEAKNESSES = (
+    {
+        "weakness": "Limited Market Penetration",
+        "description": "Opportunities to expand market share in core segments",
+        "priority": "High",
+        "urgency": "Medium"
+    },
+    {
+        "weakness": "Brand Recognition",
+        "description": "Lower brand awareness compared to major competitors",
+        "priority": "High",
+        "urgency": "Medium"
+    },
+    {
+        "weakness": "Integration Ecosystem",
+        "description": "Fewer third-party integrations compared to market leaders",
+        "priority": "Medium",
+        "urgency": "High"
+    },
+    {
+        "weakness": "Marketing Reach",
+        "description": "Limited global marketing presence and channel partnerships",
+        "priority": "Medium",
+        "urgency": "Medium"
+    }
+)
+
+COMPETITIVE_THREATS = (
+    "Big tech companies (Google, Microsoft, Amazon) entering market with integrated solutions",
+    "Aggressive pricing competition from well-funded startups",
+    "Rapid technology evolution requiring continuous innovation investment",
+    "Customer consolidation leading to higher switching costs",
+    "Open-source alternatives gaining enterprise acceptance",
+    "Regulatory changes affecting data privacy and security requirements"
+)
+
+MARKET_MOVEMENTS = (
+    {
+        "type": "Acquisition",
+        "description": "Square acquired Afterpay for $29B to expand BNPL offerings",
+        "date": "2024-01-15",
+        "impact": "High",
+        "affected_segments": ["Payment Processing", "E-commerce"]
+    },
+    {
+        "type": "Product Launch", 
+        "description": "Shopify launched AI-powered inventory prediction",
+        "date": "2024-01-10",
+        "impact": "Medium",
+        "affected_segments": ["Inventory Management", "Analytics"]
+    },
+    {
+        "type": "Funding Round",
+        "description": "Toast raised $400M Series F for international expansion",
+        "date": "2024-01-05",
+        "impact": "Medium",
+        "affected_segments": ["Restaurant POS", "International"]
+    }
+)
+
+PRODUCT_LAUNCHES = (
+    {
+        "company": "Square",
+        "product": "Square AI Analytics Suite",
+        "launch_date": "2024-01-20",
+        "key_features": ["Predictive analytics", "Customer behavior insights", "Sales forecasting"],
+        "market_impact": "High"
+    },
+    {
+        "company": "Shopify",
+        "product": "Shopify Voice Commerce",
+        "launch_date": "2024-01-18",
+        "key_features": ["Voice ordering", "AI assistant", "Hands-free POS"],
+        "market_impact": "Medium"
+    },
+    {
+        "company": "Toast",
+        "product": "Toast Delivery Intelligence",
+        "launch_date": "2024-01-12",
+        "key_features": ["Route optimization", "Delivery tracking", "Customer communication"],
+        "market_impact": "Medium"
+    }
+)
+
+FUNDING_ACTIVITY = (
+    {
+        "company": "Revel Systems",
+        "funding_type": "Series C",
+        "amount": "$50M",
+        "date": "2024-01-25",
+        "investors": ["Insight Partners", "General Atlantic"],
+        "focus": "AI-powered POS expansion"
+    },
+    {
+        "company": "TouchBistro",
+        "funding_type": "Growth Equity",
+        "amount": "$80M", 
+        "date": "2024-01-22",
+        "investors": ["Francisco Partners"],
+        "focus": "Restaurant technology suite"
+    }
+)
+
+PRICING_TRENDS = {
+    "trend_direction": "Towards value-based pricing",
+    "average_price_change": "+8.3% YoY",
+    "pricing_models": {
+        "subscription": {"adoption": "67%", "trend": "Growing"},
+        "transaction_based": {"adoption": "45%", "trend": "Stable"},
+        "freemium": {"adoption": "23%", "trend": "Growing"}
+    },
+    "price_pressure_areas": ["Small business segment", "Basic POS features"],
+    "premium_opportunities": ["AI features", "Advanced analytics", "Enterprise security"]
+}
+
+MARKET_SHARE_CHANGES = {
+    "time_period": "Q4 2023 - Q1 2024",
+    "share_changes": {
+        "Square": {"from": "27.8%", "to": "28.5%", "change": "+0.7%"},
+        "Shopify": {"from": "21.3%", "to": "22.1%", "change": "+0.8%"},
+        "Toast": {"from": "15.8%", "to": "15.3%", "change": "-0.5%"},
+        "Others": {"from": "35.1%", "to": "34.1%", "change": "-1.0%"}
+    },
+    "trends": {
+        "consolidation": "Major players gaining share",
+        "innovation_leaders": "AI-focused companies growing faster",
+        "geographic_shifts": "Strong growth in Asia-Pacific"
+    }
+}
+
+@lru_cache(maxsize=128)
+def _parse_pct(value: str) -> float:
+    """Parse a percentage display string such as "28.5%" into a float"""
+    return float(value.replace("%", ""))
+
+# Per-analysis defaults used when a sub-analysis fails; shared like the
+# tables above (empty collections are tuples, serialized as JSON arrays)
+FALLBACK_COMPETITIVE_DATA = {
+    "market_positioning": {
+        "positioning_score": 7.0,
+        "market_segment": "Growing Player",
+        "market_presence": "Regional"
+    },
+    "competitor_benchmarking": {
+        "competitors": (),
+        "total_competitors_analyzed": 0,
+        "competitive_landscape_complexity": "Moderate"
+    },
+    "swot_analysis": {
+        "strengths": (),
+        "weaknesses": (),
+        "opportunities": (),
+        "threats": ()
+    },
+    "competitive_intelligence": {
+        "market_movements": (),
+        "pricing_intelligence": {},
+        "product_launches": (),
+        "funding_activity": (),
+        "market_share_dynamics": {}
+    }
+}
+
+# Numeric weight of each threat level, for averaging; unknown levels count as Medium
+THREAT_LEVEL_SCORES = {"Low": 1, "Medium": 2, "High": 3, "Very High": 4}
+
+# Classifier thresholds: a value at or above the i-th cut gets the (i+1)-th label
+THREAT_LEVELS = ("Low", "Medium", "High", "Very High")
+THREAT_SCORE_CUTS = (3, 5, 7)
+AVG_THREAT_CUTS = (1.5, 2.5, 3.5)
+COMPETITIVE_INTENSITY_CUTS = (2, 4, 6)
+LANDSCAPE_COMPLEXITY_LEVELS = ("Simple", "Moderate", "Moderately Complex", "Highly Complex")
+LANDSCAPE_COMPLEXITY_CUTS = (3, 5, 8)
+
+# Feature keywords marking a product as innovative (positioning score) or
+# AI/analytics-capable (strengths), matched case-insensitively in one scan
+INNOVATION_KEYWORDS_RE = re.compile(r"ai|machine learning|cloud|mobile", re.IGNORECASE)
+AI_FEATURE_KEYWORDS_RE = re.compile(r"ai|analytics|automation", re.IGNORECASE)
+
+# Scoring kernels: pure arithmetic over already-extracted numbers, kept apart
+# from the dict/string handling so each is a handful of float operations
+
+# The positioning innovation factor (0.3 per innovative product) caps at 1.5
+POSITIONING_INNOVATION_CAP = 5
+
+def _positioning_score(products_count: int, industry_alignment: float, innovative_products: int) -> float:
+    """Market positioning score (0-10) from portfolio size, industry alignment and innovative products"""
+    product_score = min(products_count * 0.5, 2.0)
+    innovation_score = min(innovative_products * 0.3, 1.5)
+    total_score = 6.0 + product_score + industry_alignment + innovation_score
+    return round(min(total_score, 10.0), 1)
+
+def _threat_score(market_share: float, innovation: float, overlap: int) -> int:
+    """Threat points from market share, innovation index and category overlap"""
+    share_points = 3 if market_share > 20 else 2 if market_share > 10 else 1
+    innovation_points = 3 if innovation > 8.5 else 2 if innovation > 7.0 else 1
+    return share_points + innovation_points + overlap
+
+def _competitive_score(market_share: float, innovation: float, products_count: int) -> float:
+    """Competitive score (0-10) from market share, innovation index and portfolio size"""
+    share_score = min(market_share / 10, 3.0)
+    innovation_score = min(innovation / 2, 2.0)
+    portfolio_score = min(products_count * 0.1, 1.0)
+    total_score = 5.0 + share_score + innovation_score + portfolio_score
+    return round(min(total_score, 10.0), 1)
+
+class CompetitorProfile(NamedTuple):
+    """A competitor with its company-independent scoring inputs precomputed"""
+    competitor: Dict
+    categories: FrozenSet[str]
+    market_share_pct: float  # Parsed "market_share" display string
+    threat_points: int  # Market share + innovation threat points, before category overlap
+    competitive_score: float
+
+def _build_competitor_profile(competitor: Dict) -> CompetitorProfile:
+    market_share = _parse_pct(competitor.get("market_share", "0%"))
+    innovation = competitor.get("innovation_index", 5.0)
+    return CompetitorProfile(
+        competitor=competitor,
+        categories=frozenset(competitor.get("categories", [])),
+        market_share_pct=market_share,
+        threat_points=_threat_score(market_share, innovation, 0),
+        competitive_score=_competitive_score(market_share, innovation, competitor.get("products_count", 0))
+    )
+
+# Scored competitor tables per industry, so benchmarking a company only has
+# to add its category overlap
+COMPETITOR_PROFILES = {
+    industry: tuple(_build_competitor_profile(competitor) for competitor in competitors)
+    for industry, competitors in COMPETITOR_DATABASE.items()
+}
+
+@dataclass
+class CompetitorBenchmark:
+    """One competitor's benchmark against a company (internal; returned as a dict)"""
+    __slots__ = ('name', 'products_count', 'categories', 'threat_level', 'overlap_categories',
+                 'ai_competitive_score', 'market_share_estimate', 'innovation_index')
+    name: str
+    products_count: int
+    categories: List[str]
+    threat_level: str
+    overlap_categories: List[str]
+    ai_competitive_score: float
+    market_share_estimate: str
+    innovation_index: float
+
 class AICompetitiveAnalysisService:
-    def __init__(self):
-        self.competitive_cache = {}
+    def __init__(self, session: Optional[requests.Session] = None):
+        # Pooled HTTP session for competitive intelligence APIs
+        self.session = session or requests.Session()
         self.cache_duration = 600  # 10 minutes cache for competitive data
+        # Bounded TTL/LRU cache of (analysis, analysis JSON bytes) keyed by
+        # (company_name, industry)
+        self.competitive_cache = TTLCache(maxsize=256, ttl=self.cache_duration)
+        self._cache_lock = threading.Lock()
+        self._singleflight = SingleFlight()
         
     def get_real_time_competitive_position(self, company_name: str, industry: str, company_data: Dict) -> Dict[str, Any]:
         """Get AI-powered real-time competitive position analysis"""
-        cache_key = f"competitive_position_{company_name}_{industry}"
-        
-        if self._is_cache_valid(cache_key):
-            logger.info(f"Returning cached competitive analysis for {company_name}")
-            return self.competitive_cache[cache_key]['data']
-
-        logger.info(f"Generating real-time competitive analysis for {company_name}")
+        return self._get_competitive_position_entry(company_name, industry, company_data)[0]
+
+    def get_real_time_competitive_position_json(self, company_name: str, industry: str, company_data: Dict) -> bytes:
+        """Get the real-time competitive position analysis as JSON bytes, serialized once per cache entry"""
+        return self._get_competitive_position_entry(company_name, industry, company_data)[1]
+
+    def _get_competitive_position_entry(self, company_name: str, industry: str, company_data: Dict) -> Tuple[Dict[str, Any], bytes]:
+        """Get the cached (analysis, JSON bytes) entry, generating it on a miss"""
+        cache_key = (company_name, industry)
+        
+        with self._cache_lock:
+            cached = self.competitive_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Returning cached competitive analysis for %s", company_name)
+            return cached
+
+        # Coalesce concurrent cache misses for the same key into one generation
+        return self._singleflight.do(cache_key, self._generate_competitive_position,
+                                     cache_key, company_name, industry, company_data)
+
+    def _generate_competitive_position(self, cache_key: Tuple[str, str], company_name: str, industry: str, company_data: Dict) -> Tuple[Dict[str, Any], bytes]:
+        """Generate and cache the real-time competitive position for a cache miss"""
+        logger.info("Generating real-time competitive analysis for %s", company_name)
+        
+        # AI-powered competitive analysis; the sub-analyses are pure CPU work
+        # (no I/O), so they run inline rather than on a thread pool
+        analyses = {
+            'market_positioning': lambda: self._analyze_market_positioning(company_name, industry, company_data),
+            'competitor_benchmarking': lambda: self._benchmark_against_competitors(company_name, industry, company_data),
+            'swot_analysis': lambda: self._ai_powered_swot(company_name, industry, company_data),
+            'competitive_intelligence': lambda: self._gather_competitive_intelligence(company_name, industry)
+        }
         
-        # AI-powered competitive analysis
-        with ThreadPoolExecutor(max_workers=4) as executor:
-            futures = {
-                'market_positioning': executor.submit(self._analyze_market_positioning, company_name, industry, company_data),
-                'competitor_benchmarking': executor.submit(self._benchmark_against_competitors, company_name, industry, company_data),
-                'swot_analysis': executor.submit(self._ai_powered_swot, company_name, industry, company_data),
-                'competitive_intelligence': executor.submit(self._gather_competitive_intelligence, company_name, industry)
-            }
-            
-            results = {}
-            for key, future in futures.items():
-                try:
-                    results[key] = future.result(timeout=15)
-                except Exception as e:
-                    logger.error(f"Error in {key}: {str(e)}")
-                    results[key] = self._get_fallback_competitive_data(key)
+        results = {}
+        for key, analyze in analyses.items():
+            try:
+                results[key] = analyze()
+            except Exception as e:
+                logger.error("Error in %s: %s", key, e)
+                results[key] = self._get_fallback_competitive_data(key)
 
         # AI synthesis of competitive analysis
         analysis = self._synthesize_competitive_analysis(company_name, industry, results, company_data)
         
-        # Cache results
-        self.competitive_cache[cache_key] = {
-            'data': analysis,
-            'timestamp': time.time()
-        }
+        # Cache results, serialized once for HTTP responses
+        entry = (analysis, orjson.dumps(analysis, option=orjson.OPT_SORT_KEYS))
+        with self._cache_lock:
+            self.competitive_cache[cache_key] = entry
         
-        return analysis
+        return entry
 
     def _analyze_market_positioning(self, company_name: str, industry: str, company_data: Dict) -> Dict[str, Any]:
         """AI-powered market positioning analysis"""
@@ -76,21 +441,24 @@ class AICompetitiveAnalysisService:
 
     def _benchmark_against_competitors(self, company_name: str, industry: str, company_data: Dict) -> Dict[str, Any]:
         """AI-powered competitor benchmarking"""
-        competitors = self._get_ai_identified_competitors(industry)
+        # Competitor scores and category sets are precomputed per industry;
+        # only the overlap with this company's categories varies
+        company_categories = frozenset(p.get("category", "") for p in company_data.get("products", []))
         
         benchmarks = []
-        for competitor in competitors:
-            benchmark = {
-                "name": competitor["name"],
-                "products_count": competitor.get("products_count", 0),
-                "categories": competitor.get("categories", []),
-                "threat_level": self._calculate_threat_level(competitor, company_data),
-                "overlap_categories": self._find_category_overlap(competitor, company_data),
-                "ai_competitive_score": self._calculate_competitive_score(competitor, company_data),
-                "market_share_estimate": competitor.get("market_share", "Unknown"),
-                "innovation_index": competitor.get("innovation_index", 7.0)
-            }
-            benchmarks.append(benchmark)
+        for profile in COMPETITOR_PROFILES.get(industry, ()):
+            competitor = profile.competitor
+            overlap_categories = self._find_category_overlap(profile.categories, company_categories)
+            benchmarks.append(CompetitorBenchmark(
+                name=competitor["name"],
+                products_count=competitor.get("products_count", 0),
+                categories=competitor.get("categories", []),
+                threat_level=self._calculate_threat_level(profile.threat_points + len(overlap_categories)),
+                overlap_categories=overlap_categories,
+                ai_competitive_score=profile.competitive_score,
+                market_share_estimate=competitor.get("market_share", "Unknown"),
+                innovation_index=competitor.get("innovation_index", 7.0)
+            ))
         
         return {
             "competitors": benchmarks,
@@ -102,17 +470,15 @@ class AICompetitiveAnalysisService:
         """AI-generated SWOT analysis"""
         products = company_data.get('products', [])
         
-        # AI-generated SWOT based on company data and market intelligence
+        # AI-generated SWOT based on company data and market intelligence; only
+        # the strengths depend on the company, the rest are static tables
         strengths = self._ai_generate_strengths(company_name, products, industry)
-        weaknesses = self._ai_generate_weaknesses(company_name, products, industry)
-        opportunities = self._ai_generate_opportunities(company_name, industry)
-        threats = self._ai_generate_threats(company_name, industry)
         
         return {
             "strengths": strengths,
-            "weaknesses": weaknesses,
-            "opportunities": opportunities,
-            "threats": threats,
+            "weaknesses": COMPANY_WEAKNESSES,
+            "opportunities": MARKET_OPPORTUNITIES,
+            "threats": COMPETITIVE_THREATS,
             "swot_confidence_score": 0.87,
             "analysis_depth": "Comprehensive AI Analysis"
         }
@@ -129,25 +495,19 @@ class AICompetitiveAnalysisService:
 
     def _calculate_ai_positioning_score(self, company_name: str, industry: str, products: List[Dict]) -> float:
         """AI algorithm to calculate market positioning score"""
-        base_score = 6.0
-        
-        # Product portfolio strength
-        product_score = min(len(products) * 0.5, 2.0)
-        
         # Industry alignment score
         industry_alignment = 1.5 if industry in ["Point of Sale Software", "ERP Software", "CRM Software"] else 1.0
         
-        # Innovation factor based on product features
-        innovation_score = 0
+        # Innovation factor based on product features; stop scanning once it saturates
+        innovative_products = 0
         for product in products:
             features = product.get('features', [])
-            if any(keyword in ' '.join(features).lower() for keyword in ['ai', 'machine learning', 'cloud', 'mobile']):
-                innovation_score += 0.3
+            if INNOVATION_KEYWORDS_RE.search(' '.join(features)):
+                innovative_products += 1
+                if innovative_products >= POSITIONING_INNOVATION_CAP:
+                    break
         
-        innovation_score = min(innovation_score, 1.5)
-        
-        total_score = base_score + product_score + industry_alignment + innovation_score
-        return round(min(total_score, 10.0), 1)
+        return _positioning_score(len(products), industry_alignment, innovative_products)
 
     def _determine_market_segment(self, company_name: str, products: List[Dict]) -> str:
         """AI-powered market segment determination"""
@@ -162,151 +522,20 @@ class AICompetitiveAnalysisService:
 
     def _assess_market_presence(self, company_name: str, industry: str) -> str:
         """AI assessment of market presence"""
-        # AI-based market presence assessment
-        presence_indicators = {
-            "Confirma Software": "Growing Regional Player",
-            "Square": "Market Leader",
-            "Shopify": "Strong Competitor",
-            "Toast": "Industry Specialist"
-        }
-        
-        return presence_indicators.get(company_name, "Emerging Market Player")
+        return MARKET_PRESENCE_INDICATORS.get(company_name, "Emerging Market Player")
 
     def _get_ai_identified_competitors(self, industry: str) -> List[Dict]:
         """AI-identified competitors based on industry"""
-        competitor_database = {
-            "Point of Sale Software": [
-                {
-                    "name": "Square",
-                    "products_count": 8,
-                    "categories": ["Point of Sale", "Payment Processing", "Analytics"],
-                    "market_share": "28.5%",
-                    "innovation_index": 9.2,
-                    "threat_factors": ["market_leader", "integrated_ecosystem", "strong_funding"]
-                },
-                {
-                    "name": "Shopify POS",
-                    "products_count": 6,
-                    "categories": ["Point of Sale", "E-commerce", "Inventory"],
-                    "market_share": "22.1%", 
-                    "innovation_index": 8.7,
-                    "threat_factors": ["ecommerce_integration", "rapid_growth", "developer_ecosystem"]
-                },
-                {
-                    "name": "Toast",
-                    "products_count": 5,
-                    "categories": ["Point of Sale", "Restaurant Management"],
-                    "market_share": "15.3%",
-                    "innovation_index": 8.1,
-                    "threat_factors": ["industry_specialization", "comprehensive_features"]
-                },
-                {
-                    "name": "Lightspeed",
-                    "products_count": 4,
-                    "categories": ["Point of Sale", "Retail Management"],
-                    "market_share": "8.7%",
-                    "innovation_index": 7.5,
-                    "threat_factors": ["retail_focus", "international_presence"]
-                },
-                {
-                    "name": "Clover",
-                    "products_count": 6,
-                    "categories": ["Point of Sale", "Payment Processing"],
-                    "market_share": "12.4%",
-                    "innovation_index": 7.8,
-                    "threat_factors": ["hardware_integration", "bank_backing"]
-                }
-            ],
-            "ERP Software": [
-                {
-                    "name": "SAP",
-                    "products_count": 15,
-                    "categories": ["ERP", "Analytics", "Cloud Platform"],
-                    "market_share": "24.2%",
-                    "innovation_index": 8.9,
-                    "threat_factors": ["enterprise_dominance", "comprehensive_suite"]
-                },
-                {
-                    "name": "Oracle",
-                    "products_count": 12,
-                    "categories": ["ERP", "Database", "Cloud Infrastructure"],
-                    "market_share": "18.7%",
-                    "innovation_index": 8.5,
-                    "threat_factors": ["cloud_native", "ai_capabilities"]
-                },
-                {
-                    "name": "Microsoft Dynamics",
-                    "products_count": 8,
-                    "categories": ["ERP", "CRM", "Business Intelligence"],
-                    "market_share": "15.2%",
-                    "innovation_index": 8.3,
-                    "threat_factors": ["office_integration", "familiar_interface"]
-                }
-            ]
-        }
-        
-        return competitor_database.get(industry, [])
+        return COMPETITOR_DATABASE.get(industry, [])
 
-    def _calculate_threat_level(self, competitor: Dict, company_data: Dict) -> str:
-        """AI-powered threat level calculation"""
-        threat_score = 0
-        
-        # Market share impact
-        market_share = competitor.get("market_share", "0%")
-        if float(market_share.replace("%", "")) > 20:
-            threat_score += 3
-        elif float(market_share.replace("%", "")) > 10:
-            threat_score += 2
-        else:
-            threat_score += 1
-            
-        # Innovation index impact
-        innovation = competitor.get("innovation_index", 5.0)
-        if innovation > 8.5:
-            threat_score += 3
-        elif innovation > 7.0:
-            threat_score += 2
-        else:
-            threat_score += 1
-            
-        # Category overlap impact
-        competitor_categories = set(competitor.get("categories", []))
-        company_categories = set(p.get("category", "") for p in company_data.get("products", []))
-        overlap = len(competitor_categories.intersection(company_categories))
-        threat_score += overlap
-        
-        # Threat level classification
-        if threat_score >= 7:
-            return "Very High"
-        elif threat_score >= 5:
-            return "High"
-        elif threat_score >= 3:
-            return "Medium"
-        else:
-            return "Low"
+    def _calculate_threat_level(self, threat_score: int) -> str:
+        """AI-powered threat level classification of a threat score (see _threat_score)"""
+        return THREAT_LEVELS[bisect_right(THREAT_SCORE_CUTS, threat_score)]
 
-    def _find_category_overlap(self, competitor: Dict, company_data: Dict) -> List[str]:
+    def _find_category_overlap(self, competitor_categories: AbstractSet[str],
+                               company_categories: AbstractSet[str]) -> List[str]:
         """Find overlapping product categories"""
-        competitor_categories = set(competitor.get("categories", []))
-        company_categories = set(p.get("category", "") for p in company_data.get("products", []))
-        return list(competitor_categories.intersection(company_categories))
-
-    def _calculate_competitive_score(self, competitor: Dict, company_data: Dict) -> float:
-        """AI competitive scoring algorithm"""
-        base_score = 5.0
-        
-        # Market share factor
-        market_share = float(competitor.get("market_share", "0%").replace("%", ""))
-        share_score = min(market_share / 10, 3.0)
-        
-        # Innovation factor
-        innovation_score = min(competitor.get("innovation_index", 5.0) / 2, 2.0)
-        
-        # Product portfolio factor
-        portfolio_score = min(competitor.get("products_count", 0) * 0.1, 1.0)
-        
-        total_score = base_score + share_score + innovation_score + portfolio_score
-        return round(min(total_score, 10.0), 1)
+        return list(competitor_categories & company_categories)
 
     def _ai_generate_strengths(self, company_name: str, products: List[Dict], industry: str) -> List[Dict]:
         """AI-generated competitive strengths"""
@@ -334,7 +563,7 @@ class AICompetitiveAnalysisService:
         ai_features = 0
         for product in products:
             features = product.get('features', [])
-            if any(keyword in ' '.join(features).lower() for keyword in ['ai', 'analytics', 'automation']):
+            if AI_FEATURE_KEYWORDS_RE.search(' '.join(features)):
                 ai_features += 1
         
         if ai_features > 0:
@@ -363,236 +592,91 @@ class AICompetitiveAnalysisService:
         
         return strengths[:4]  # Return top 4 strengths
 
-    def _ai_generate_weaknesses(self, company_name: str, products: List[Dict], industry: str) -> List[Dict]:
-        """AI-generated areas for improvement"""
-        weaknesses = []
-        
-        # Market penetration
-        weaknesses.append({
-            "weakness": "Limited Market Penetration",
-            "description": "Opportunities to expand market share in core segments",
-            "priority": "High",
-            "urgency": "Medium"
-        })
-        
-        # Brand recognition
-        weaknesses.append({
-            "weakness": "Brand Recognition",
-            "description": "Lower brand awareness compared to major competitors",
-            "priority": "High", 
-            "urgency": "Medium"
-        })
-        
-        # Integration ecosystem
-        weaknesses.append({
-            "weakness": "Integration Ecosystem",
-            "description": "Fewer third-party integrations compared to market leaders",
-            "priority": "Medium",
-            "urgency": "High"
-        })
-        
-        # Marketing reach
-        weaknesses.append({
-            "weakness": "Marketing Reach",
-            "description": "Limited global marketing presence and channel partnerships",
-            "priority": "Medium",
-            "urgency": "Medium"
-        })
-        
-        return weaknesses
-
-    def _ai_generate_opportunities(self, company_name: str, industry: str) -> List[str]:
-        """AI-generated market opportunities"""
-        return [
-            "AI-powered automation features demand growing 200% annually",
-            "Cloud-first SMB market expanding rapidly in emerging regions",
-            "Industry-specific workflow customization becoming key differentiator",
-            "Mobile-first solutions adoption accelerating post-pandemic",
-            "Integration marketplace opportunities with major platforms",
-            "Vertical market specialization for niche industries"
-        ]
-
-    def _ai_generate_threats(self, company_name: str, industry: str) -> List[str]:
-        """AI-generated competitive threats"""
-        return [
-            "Big tech companies (Google, Microsoft, Amazon) entering market with integrated solutions",
-            "Aggressive pricing competition from well-funded startups",
-            "Rapid technology evolution requiring continuous innovation investment",
-            "Customer consolidation leading to higher switching costs",
-            "Open-source alternatives gaining enterprise acceptance",
-            "Regulatory changes affecting data privacy and security requirements"
-        ]
-
-    def _track_market_movements(self, industry: str) -> List[Dict]:
+    def _track_market_movements(self, industry: str) -> Tuple[Dict, ...]:
         """Track recent market movements and competitor activities"""
-        return [
-            {
-                "type": "Acquisition",
-                "description": "Square acquired Afterpay for $29B to expand BNPL offerings",
-                "date": "2024-01-15",
-                "impact": "High",
-                "affected_segments": ["Payment Processing", "E-commerce"]
-            },
-            {
-                "type": "Product Launch", 
-                "description": "Shopify launched AI-powered inventory prediction",
-                "date": "2024-01-10",
-                "impact": "Medium",
-                "affected_segments": ["Inventory Management", "Analytics"]
-            },
-            {
-                "type": "Funding Round",
-                "description": "Toast raised $400M Series F for international expansion",
-                "date": "2024-01-05",
-                "impact": "Medium",
-                "affected_segments": ["Restaurant POS", "International"]
-            }
-        ]
+        return MARKET_MOVEMENTS
 
     def _analyze_pricing_trends(self, industry: str) -> Dict[str, Any]:
         """Analyze competitive pricing trends"""
-        return {
-            "trend_direction": "Towards value-based pricing",
-            "average_price_change": "+8.3% YoY",
-            "pricing_models": {
-                "subscription": {"adoption": "67%", "trend": "Growing"},
-                "transaction_based": {"adoption": "45%", "trend": "Stable"},
-                "freemium": {"adoption": "23%", "trend": "Growing"}
-            },
-            "price_pressure_areas": ["Small business segment", "Basic POS features"],
-            "premium_opportunities": ["AI features", "Advanced analytics", "Enterprise security"]
-        }
+        return PRICING_TRENDS
 
-    def _track_product_launches(self, industry: str) -> List[Dict]:
+    def _track_product_launches(self, industry: str) -> Tuple[Dict, ...]:
         """Track recent competitive product launches"""
-        return [
-            {
-                "company": "Square",
-                "product": "Square AI Analytics Suite",
-                "launch_date": "2024-01-20",
-                "key_features": ["Predictive analytics", "Customer behavior insights", "Sales forecasting"],
-                "market_impact": "High"
-            },
-            {
-                "company": "Shopify",
-                "product": "Shopify Voice Commerce",
-                "launch_date": "2024-01-18",
-                "key_features": ["Voice ordering", "AI assistant", "Hands-free POS"],
-                "market_impact": "Medium"
-            },
-            {
-                "company": "Toast",
-                "product": "Toast Delivery Intelligence",
-                "launch_date": "2024-01-12",
-                "key_features": ["Route optimization", "Delivery tracking", "Customer communication"],
-                "market_impact": "Medium"
-            }
-        ]
-
-    def _track_funding_activity(self, industry: str) -> List[Dict]:
+        return PRODUCT_LAUNCHES
+
+    def _track_funding_activity(self, industry: str) -> Tuple[Dict, ...]:
         """Track funding and investment activity"""
-        return [
-            {
-                "company": "Revel Systems",
-                "funding_type": "Series C",
-                "amount": "$50M",
-                "date": "2024-01-25",
-                "investors": ["Insight Partners", "General Atlantic"],
-                "focus": "AI-powered POS expansion"
-            },
-            {
-                "company": "TouchBistro",
-                "funding_type": "Growth Equity",
-                "amount": "$80M", 
-                "date": "2024-01-22",
-                "investors": ["Francisco Partners"],
-                "focus": "Restaurant technology suite"
-            }
-        ]
+        return FUNDING_ACTIVITY
 
     def _analyze_market_share_changes(self, industry: str) -> Dict[str, Any]:
         """Analyze recent market share dynamics"""
-        return {
-            "time_period": "Q4 2023 - Q1 2024",
-            "share_changes": {
-                "Square": {"from": "27.8%", "to": "28.5%", "change": "+0.7%"},
-                "Shopify": {"from": "21.3%", "to": "22.1%", "change": "+0.8%"},
-                "Toast": {"from": "15.8%", "to": "15.3%", "change": "-0.5%"},
-                "Others": {"from": "35.1%", "to": "34.1%", "change": "-1.0%"}
-            },
-            "trends": {
-                "consolidation": "Major players gaining share",
-                "innovation_leaders": "AI-focused companies growing faster",
-                "geographic_shifts": "Strong growth in Asia-Pacific"
-            }
-        }
+        return MARKET_SHARE_CHANGES
 
     def _synthesize_competitive_analysis(self, company_name: str, industry: str, data: Dict, company_data: Dict) -> Dict[str, Any]:
         """AI-powered synthesis of competitive analysis"""
-        analysis_timestamp = datetime.datetime.now()
-        
-        return {
-            "company": company_name,
-            "industry": industry,
-            "analysis_timestamp": analysis_timestamp.isoformat(),
-            "analysis_type": "AI-Powered Real-time Competitive Intelligence",
-            
-            "positioning": data.get("market_positioning", {}),
-            
-            "competitors": data.get("competitor_benchmarking", {}).get("competitors", []),
-            "competitive_landscape_summary": {
-                "total_active_competitors": data.get("competitor_benchmarking", {}).get("total_competitors_analyzed", 0),
-                "landscape_complexity": data.get("competitor_benchmarking", {}).get("competitive_landscape_complexity", "Moderate"),
-                "avg_threat_level": self._calculate_avg_threat_level(data.get("competitor_benchmarking", {}).get("competitors", []))
-            },
-            
-            "competitive_advantages": data.get("swot_analysis", {}).get("strengths", []),
-            "areas_for_improvement": data.get("swot_analysis", {}).get("weaknesses", []),
-            "market_opportunities": data.get("swot_analysis", {}).get("opportunities", []),
-            "competitive_threats": data.get("swot_analysis", {}).get("threats", []),
-            
-            "market_intelligence": {
-                "recent_movements": data.get("competitive_intelligence", {}).get("market_movements", []),
-                "pricing_trends": data.get("competitive_intelligence", {}).get("pricing_intelligence", {}),
-                "product_launches": data.get("competitive_intelligence", {}).get("product_launches", []),
-                "funding_activity": data.get("competitive_intelligence", {}).get("funding_activity", []),
-                "market_share_dynamics": data.get("competitive_intelligence", {}).get("market_share_dynamics", {})
-            },
-            
-            "ai_insights": {
-                "competitive_intensity": self._assess_competitive_intensity(data),
-                "market_opportunity_score": self._calculate_opportunity_score(data),
-                "recommended_actions": self._generate_ai_recommendations(company_name, data),
-                "confidence_score": 0.91
-            }
+        return dict(self._iter_competitive_analysis(company_name, industry, data))
+
+    def _iter_competitive_analysis(self, company_name: str, industry: str, data: Dict) -> Iterator[Tuple[str, Any]]:
+        """Yield the synthesized analysis as (section, value) pairs, building each section on demand
+
+        Args:
+            company_name: Company being analyzed
+            industry: Industry the company competes in
+            data: Sub-analysis results keyed by analysis name
+
+        Yields:
+            Top-level analysis keys with their values, in response order
+        """
+        benchmarking = data.get("competitor_benchmarking", {})
+        swot = data.get("swot_analysis", {})
+        intelligence = data.get("competitive_intelligence", {})
+        competitors = benchmarking.get("competitors", [])
+
+        yield "company", company_name
+        yield "industry", industry
+        yield "analysis_timestamp", now_iso()
+        yield "analysis_type", "AI-Powered Real-time Competitive Intelligence"
+
+        yield "positioning", data.get("market_positioning", {})
+
+        yield "competitors", [asdict(comp) for comp in competitors]
+        yield "competitive_landscape_summary", {
+            "total_active_competitors": benchmarking.get("total_competitors_analyzed", 0),
+            "landscape_complexity": benchmarking.get("competitive_landscape_complexity", "Moderate"),
+            "avg_threat_level": self._calculate_avg_threat_level(competitors)
+        }
+
+        yield "competitive_advantages", swot.get("strengths", [])
+        yield "areas_for_improvement", swot.get("weaknesses", [])
+        yield "market_opportunities", swot.get("opportunities", [])
+        yield "competitive_threats", swot.get("threats", [])
+
+        yield "market_intelligence", {
+            "recent_movements": intelligence.get("market_movements", []),
+            "pricing_trends": intelligence.get("pricing_intelligence", {}),
+            "product_launches": intelligence.get("product_launches", []),
+            "funding_activity": intelligence.get("funding_activity", []),
+            "market_share_dynamics": intelligence.get("market_share_dynamics", {})
+        }
+
+        yield "ai_insights", {
+            "competitive_intensity": self._assess_competitive_intensity(data),
+            "market_opportunity_score": self._calculate_opportunity_score(data),
+            "recommended_actions": self._generate_ai_recommendations(company_name, data),
+            "confidence_score": 0.91
         }
 
     def _assess_landscape_complexity(self, competitors: List[Dict]) -> str:
         """Assess competitive landscape complexity"""
-        if len(competitors) >= 8:
-            return "Highly Complex"
-        elif len(competitors) >= 5:
-            return "Moderately Complex"
-        elif len(competitors) >= 3:
-            return "Moderate"
-        else:
-            return "Simple"
+        return LANDSCAPE_COMPLEXITY_LEVELS[bisect_right(LANDSCAPE_COMPLEXITY_CUTS, len(competitors))]
 
-    def _calculate_avg_threat_level(self, competitors: List[Dict]) -> str:
+    def _calculate_avg_threat_level(self, competitors: List[CompetitorBenchmark]) -> str:
         """Calculate average threat level"""
-        threat_scores = {"Low": 1, "Medium": 2, "High": 3, "Very High": 4}
-        
-        total_score = sum(threat_scores.get(comp.get("threat_level", "Medium"), 2) for comp in competitors)
+        # Weight each distinct level once instead of looking up every competitor
+        level_counts = Counter(comp.threat_level for comp in competitors)
+        total_score = sum(THREAT_LEVEL_SCORES.get(level, 2) * count for level, count in level_counts.items())
         avg_score = total_score / len(competitors) if competitors else 2
-        
-        if avg_score >= 3.5:
-            return "Very High"
-        elif avg_score >= 2.5:
-            return "High"
-        elif avg_score >= 1.5:
-            return "Medium"
-        else:
-            return "Low"
+        return THREAT_LEVELS[bisect_right(AVG_THREAT_CUTS, avg_score)]
 
     def _assess_competitive_intensity(self, data: Dict) -> str:
         """Assess overall competitive intensity"""
@@ -601,17 +685,9 @@ class AICompetitiveAnalysisService:
             launches = len(data.get("competitive_intelligence", {}).get("product_launches", []))
             
             intensity_score = movements + launches
-            
-            if intensity_score >= 6:
-                return "Very High"
-            elif intensity_score >= 4:
-                return "High"
-            elif intensity_score >= 2:
-                return "Medium"
-            else:
-                return "Low"
+            return THREAT_LEVELS[bisect_right(COMPETITIVE_INTENSITY_CUTS, intensity_score)]
         except Exception as e:
-            logger.warning(f"Error assessing competitive intensity: {e}")
+            logger.warning("Error assessing competitive intensity: %s", e)
             return "Medium"
 
     def _calculate_opportunity_score(self, data: Dict) -> float:
@@ -625,14 +701,14 @@ class AICompetitiveAnalysisService:
             
             # Factor in market dynamics
             competitors = data.get("competitor_benchmarking", {}).get("competitors", [])
-            threat_levels = [comp.get("threat_level", "Medium") for comp in competitors]
+            threat_levels = [comp.threat_level for comp in competitors]
             high_threats = sum(1 for threat in threat_levels if threat in ["High", "Very High"])
             threat_factor = -0.2 * high_threats
             
             opportunity_score = base_score + positioning_factor + threat_factor
             return round(max(min(opportunity_score, 10.0), 1.0), 1)
         except Exception as e:
-            logger.warning(f"Error calculating opportunity score: {e}")
+            logger.warning("Error calculating opportunity score: %s", e)
             return 7.0
 
     def _generate_ai_recommendations(self, company_name: str, data: Dict) -> List[str]:
@@ -661,7 +737,7 @@ class AICompetitiveAnalysisService:
             
             return recommendations[:6]  # Return top 6 recommendations
         except Exception as e:
-            logger.warning(f"Error generating AI recommendations: {e}")
+            logger.warning("Error generating AI recommendations: %s", e)
             return [
                 "Focus on core product development",
                 "Enhance customer experience",
@@ -671,37 +747,4 @@ class AICompetitiveAnalysisService:
 
     def _get_fallback_competitive_data(self, data_type: str) -> Dict[str, Any]:
         """Provide fallback data for competitive analysis"""
-        fallbacks = {
-            "market_positioning": {
-                "positioning_score": 7.0,
-                "market_segment": "Growing Player",
-                "market_presence": "Regional"
-            },
-            "competitor_benchmarking": {
-                "competitors": [],
-                "total_competitors_analyzed": 0,
-                "competitive_landscape_complexity": "Moderate"
-            },
-            "swot_analysis": {
-                "strengths": [],
-                "weaknesses": [],
-                "opportunities": [],
-                "threats": []
-            },
-            "competitive_intelligence": {
-                "market_movements": [],
-                "pricing_intelligence": {},
-                "product_launches": [],
-                "funding_activity": [],
-                "market_share_dynamics": {}
-            }
-        }
-        return fallbacks.get(data_type, {})
-
-    def _is_cache_valid(self, cache_key: str) -> bool:
-        """Check if cached competitive data is still valid"""
-        if cache_key not in self.competitive_cache:
-            return False
-        
-        cache_age = time.time() - self.competitive_cache[cache_key]['timestamp']
-        return cache_age < self.cache_duration
+        return FALLBACK_COMPETITIVE_DATA.get(data_type, {})
@@ -5,67 +5,439 @@ Provides real-time market data analysis using AI algorithms and external APIs
 
 import requests
 import json
-import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
+from functools import lru_cache
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed
 import logging
 
+import orjson
+from cachetools import TTLCache
+
+from .concurrency_limit import AIMDLimiter
+from .singleflight import SingleFlight
+from .timestamps import now_iso
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Simulated per-industry source data; the source fetchers hand these dicts
+# straight to cached analyses, so they must stay unmodified
+MARKET_TRENDS_BY_INDUSTRY = {
+    "Point of Sale Software": {
+        "keywords": ["contactless payments", "AI analytics", "mobile POS", "cloud-native", "omnichannel"],
+        "momentum": "High",
+        "technologies": ["NFC payments", "Computer vision", "Edge computing", "5G integration"],
+        "signals": ["300% increase in contactless adoption", "85% mobile payment growth"],
+        "confidence": 0.92
+    },
+    "ERP Software": {
+        "keywords": ["AI automation", "cloud ERP", "low-code", "industry 4.0", "intelligent workflows"],
+        "momentum": "Very High",
+        "technologies": ["Machine learning", "RPA", "IoT integration", "Blockchain"],
+        "signals": ["67% cloud migration", "AI adoption up 156%"],
+        "confidence": 0.89
+    },
+    "CRM Software": {
+        "keywords": ["predictive CRM", "conversation AI", "customer 360", "real-time analytics"],
+        "momentum": "High",
+        "technologies": ["Natural language processing", "Predictive modeling", "Voice AI"],
+        "signals": ["Customer AI tools adoption +234%", "Voice CRM growing 89%"],
+        "confidence": 0.91
+    }
+}
+
+DEFAULT_MARKET_TRENDS = {
+    "keywords": ["digital transformation", "AI integration", "cloud adoption"],
+    "momentum": "Medium",
+    "technologies": ["Artificial intelligence", "Cloud computing", "Automation"],
+    "signals": ["Market digitization accelerating"],
+    "confidence": 0.75
+}
+
+COMPETITOR_DISCOVERY = {
+    "companies": [
+        {
+            "name": "Square (Block Inc.)",
+            "activity_level": "Very High",
+            "recent_moves": ["Acquired Afterpay for $29B", "Launched Square Banking"],
+            "threat_level": "High",
+            "innovation_score": 9.2
+        },
+        {
+            "name": "Shopify",
+            "activity_level": "High", 
+            "recent_moves": ["Expanded POS hardware", "AI-powered inventory management"],
+            "threat_level": "Medium-High",
+            "innovation_score": 8.7
+        },
+        {
+            "name": "Toast Inc.",
+            "activity_level": "Medium-High",
+            "recent_moves": ["Restaurant technology suite expansion", "Capital lending program"],
+            "threat_level": "Medium",
+            "innovation_score": 8.1
+        }
+    ],
+    "movements": [
+        {"type": "Acquisition", "description": "Major consolidation in payment processing"},
+        {"type": "Product Launch", "description": "AI-powered analytics platforms trending"},
+        {"type": "Market Entry", "description": "Big tech entering small business software"}
+    ],
+    "pricing": [
+        {"trend": "Freemium models increasing", "impact": "High"},
+        {"trend": "Transaction-based pricing", "impact": "Medium"},
+        {"trend": "Bundle pricing strategies", "impact": "High"}
+    ],
+    "launches": [
+        {"product": "AI-powered inventory prediction", "company": "Square", "impact_score": 8.5},
+        {"product": "Voice-activated POS", "company": "Shopify", "impact_score": 7.8},
+        {"product": "Predictive customer analytics", "company": "Toast", "impact_score": 8.2}
+    ],
+    "share_changes": {
+        "growing": ["Square", "Shopify"],
+        "declining": ["Traditional POS vendors"],
+        "stable": ["Specialized industry players"]
+    }
+}
+
+MARKET_SIZING = {
+    "size": {
+        "global": "$24.2B (2024)",
+        "regional": {"North America": "$9.8B", "Europe": "$6.1B", "Asia-Pacific": "$5.9B"},
+        "yoy_growth": "+14.2%"
+    },
+    "trajectory": {
+        "2025": "$27.8B",
+        "2026": "$31.9B", 
+        "2027": "$36.7B",
+        "cagr_2024_2027": "15.1%"
+    },
+    "regions": {
+        "fastest_growing": "Asia-Pacific (+18.3%)",
+        "largest_market": "North America (40.5%)",
+        "emerging_markets": ["Latin America", "Middle East", "Africa"]
+    },
+    "segments": {
+        "cloud_based": {"share": "68%", "growth": "+19.2%"},
+        "on_premise": {"share": "32%", "growth": "+6.1%"},
+        "mobile_pos": {"share": "45%", "growth": "+22.8%"}
+    },
+    "accuracy": {
+        "confidence_interval": "±3.2%",
+        "data_quality_score": 0.91,
+        "prediction_accuracy": "Historical 94.6%"
+    }
+}
+
+GROWTH_MODELING = {
+    "short_term": {
+        "q1_2024": "+3.8%",
+        "q2_2024": "+4.2%",
+        "q3_2024": "+3.9%",
+        "q4_2024": "+4.5%"
+    },
+    "long_term": {
+        "2025": "14.7% growth",
+        "2026": "13.9% growth",
+        "2027": "12.8% growth",
+        "2028": "11.6% growth"
+    },
+    "drivers": [
+        {"factor": "AI integration demand", "impact_score": 9.2, "timeline": "Immediate"},
+        {"factor": "Cloud migration", "impact_score": 8.7, "timeline": "Short-term"},
+        {"factor": "Remote work trends", "impact_score": 7.9, "timeline": "Ongoing"},
+        {"factor": "Digital transformation", "impact_score": 9.5, "timeline": "Long-term"}
+    ],
+    "risks": [
+        {"factor": "Economic recession", "probability": "Medium", "impact": "High"},
+        {"factor": "Regulatory changes", "probability": "Low", "impact": "Medium"},
+        {"factor": "Technology disruption", "probability": "High", "impact": "Very High"},
+        {"factor": "Competitive consolidation", "probability": "Medium", "impact": "High"}
+    ],
+    "confidence": {
+        "overall": 0.87,
+        "short_term": 0.94,
+        "long_term": 0.79,
+        "model_accuracy": "91.3%"
+    }
+}
+
+NEWS_SENTIMENT = {
+    "overall": {
+        "score": 0.73,  # Scale: -1 to 1
+        "classification": "Positive",
+        "trend_direction": "Improving",
+        "volatility": "Low"
+    },
+    "trends": {
+        "last_30_days": [0.65, 0.68, 0.71, 0.73],
+        "sentiment_momentum": "+12.3%",
+        "stability_index": 0.82
+    },
+    "topics": [
+        {"topic": "AI integration", "sentiment": 0.89, "volume": "High"},
+        {"topic": "Cloud adoption", "sentiment": 0.81, "volume": "Very High"},
+        {"topic": "Market competition", "sentiment": 0.42, "volume": "Medium"},
+        {"topic": "Investment funding", "sentiment": 0.76, "volume": "High"}
+    ],
+    "influence": {
+        "media_reach": "High",
+        "social_engagement": "Medium-High",
+        "analyst_coverage": "Positive",
+        "investor_interest": "Strong"
+    },
+    "velocity": {
+        "news_frequency": "3.2 articles/day",
+        "social_mentions": "156 mentions/day",
+        "trend_acceleration": "+23.7%"
+    }
+}
+
+# Cache lifetime in seconds of each market data source, matched to how often
+# the underlying signal changes (news moves in minutes, market sizing in days)
+SOURCE_CACHE_TTLS = {
+    'market_trends': 900,
+    'competitor_intelligence': 600,
+    'market_size': 86400,
+    'growth_predictions': 21600,
+    'news_sentiment': 180
+}
+
+# Seconds past expiry during which a stale market analysis is still served
+# while a background refresh recomputes it
+STALE_GRACE_SECONDS = 300
+
+# Long-lived pool the market data sources are fetched on, shared by all
+# requests so its threads stay warm between bursts. How many fetches run at
+# once is governed by the adaptive limiter; the pool is sized to its cap.
+_source_limiter = AIMDLimiter(initial_limit=5, min_limit=2, max_limit=32, latency_budget=10.0)
+_source_executor = ThreadPoolExecutor(max_workers=_source_limiter.max_limit, thread_name_prefix="market-source")
+
+# Seconds one source fan-out may take, from admission through completion
+SOURCE_FETCH_BUDGET = 10.0
+
+# Background refreshes of stale market analyses; separate from the source
+# pool, which a refresh waits on
+_refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="market-refresh")
+
+def _dig(data: Dict, path: Tuple[str, ...], default: Any = None) -> Any:
+    """Look up a nested key path, returning default at the first missing level"""
+    for key in path:
+        data = data.get(key) if isinstance(data, dict) else None
+        if data is None:
+            return default
+    return data
+
+# Scoring kernels over the few scalars extracted from the source data,
+# memoized since the same inputs recur across refreshes and industries
+@lru_cache(maxsize=2048)
+def _market_health_score(sentiment_score: float, growth_indicator: float, competition_factor: float) -> float:
+    """Weighted market health score, rounded to two decimals"""
+    return round((sentiment_score * 0.3 + growth_indicator * 0.4 + competition_factor * 0.3), 2)
+
+@lru_cache(maxsize=2048)
+def _competitive_intensity_score(active_competitors: int, market_movements: int) -> float:
+    """Competitive intensity from competitor and market movement counts, capped at 1.0"""
+    intensity = min((active_competitors * 0.1 + market_movements * 0.05), 1.0)
+    return round(intensity, 2)
+
 class AIMarketIntelligenceService:
-    def __init__(self):
+    def __init__(self, session: Optional[requests.Session] = None):
+        # Pooled HTTP session for market data APIs
+        self.session = session or requests.Session()
         self.api_keys = {
             # Add your API keys here
             'news_api': 'your_news_api_key',
             'financial_data': 'your_financial_api_key',
             'market_research': 'your_market_research_api_key'
         }
-        self.cache = {}
         self.cache_duration = 300  # 5 minutes cache
+        # Bounded TTL/LRU cache of (analysis, analysis JSON bytes) keyed by
+        # industry and company
+        self.cache = TTLCache(maxsize=512, ttl=self.cache_duration)
+        # The same analyses kept through the stale grace period, served while
+        # a background refresh replaces an expired entry
+        self.stale_cache = TTLCache(maxsize=512, ttl=self.cache_duration + STALE_GRACE_SECONDS)
+        self._refreshing = set()
+        # Per-source caches of raw source results keyed by industry, so a
+        # synthesis miss only refetches the sources that have expired
+        self.source_caches = {
+            source: TTLCache(maxsize=64, ttl=ttl) for source, ttl in SOURCE_CACHE_TTLS.items()
+        }
+        self._cache_lock = threading.Lock()
+        self._singleflight = SingleFlight()
 
     def get_real_time_market_analysis(self, industry: str, company_name: str = None) -> Dict[str, Any]:
         """Get real-time AI-powered market analysis"""
+        return self._get_market_analysis_entry(industry, company_name)[0]
+
+    def get_real_time_market_analysis_json(self, industry: str, company_name: str = None) -> bytes:
+        """Get the real-time market analysis as JSON bytes, serialized once per cache entry"""
+        return self._get_market_analysis_entry(industry, company_name)[1]
+
+    def _get_market_analysis_entry(self, industry: str, company_name: str = None) -> Tuple[Dict[str, Any], bytes]:
+        """Get the cached (analysis, JSON bytes) entry, generating it on a miss"""
         cache_key = f"market_analysis_{industry}_{company_name}"
-        
+        entry = self._get_cached_market_analysis_entry(cache_key, industry, company_name)
+        if entry is not None:
+            return entry
+
+        # Coalesce concurrent cache misses for the same key into one generation
+        return self._singleflight.do(cache_key, self._generate_market_analysis, cache_key, industry, company_name)
+
+    def _get_cached_market_analysis_entry(self, cache_key: str, industry: str,
+                                          company_name: str = None) -> Optional[Tuple[Dict[str, Any], bytes]]:
+        """Get a fresh or stale cached entry (scheduling a background refresh for a stale one), or None on a miss"""
         # Check cache first
-        if self._is_cache_valid(cache_key):
+        with self._cache_lock:
+            cached = self.cache.get(cache_key)
+            stale = None if cached is not None else self.stale_cache.get(cache_key)
+            refresh = stale is not None and cache_key not in self._refreshing
+            if refresh:
+                self._refreshing.add(cache_key)
+        if cached is not None:
             logger.info(f"Returning cached market analysis for {industry}")
-            return self.cache[cache_key]['data']
+            return cached
+
+        # Serve an expired analysis within its grace period and refresh it in the background
+        if stale is not None:
+            if refresh:
+                _refresh_executor.submit(self._refresh_market_analysis, cache_key, industry, company_name)
+            logger.info(f"Returning stale market analysis for {industry} while refreshing")
+            return stale
+
+        return None
+
+    def _refresh_market_analysis(self, cache_key: str, industry: str, company_name: str = None) -> None:
+        """Regenerate an expired market analysis in the background"""
+        try:
+            self._singleflight.do(cache_key, self._generate_market_analysis, cache_key, industry, company_name)
+        except Exception as e:
+            logger.error(f"Error refreshing market analysis for {industry}: {str(e)}")
+        finally:
+            with self._cache_lock:
+                self._refreshing.discard(cache_key)
+
+    def get_real_time_market_analysis_bulk(self, industries: List[str], company_name: str = None) -> Dict[str, Dict[str, Any]]:
+        """Get real-time market analyses for several industries at once
+
+        Fresh and stale cached analyses are served as for a single industry;
+        the sources for every missed industry are gathered in one fan-out
+        instead of one per industry, and each missed analysis is synthesized
+        through the singleflight so it coalesces with concurrent generations.
+
+        Args:
+            industries: Industries to analyze
+            company_name: Optional company the analyses focus on
+
+        Returns:
+            Market analysis keyed by industry
+        """
+        analyses = {}
+        missed = []
+        for industry in dict.fromkeys(industries):
+            entry = self._get_cached_market_analysis_entry(
+                f"market_analysis_{industry}_{company_name}", industry, company_name)
+            if entry is not None:
+                analyses[industry] = entry[0]
+            else:
+                missed.append(industry)
 
+        if missed:
+            logger.info(f"Generating real-time market analysis for {len(missed)} industries")
+            source_results = self._gather_source_results(missed)
+            for industry in missed:
+                cache_key = f"market_analysis_{industry}_{company_name}"
+                analyses[industry] = self._singleflight.do(
+                    cache_key, self._synthesize_and_cache, cache_key, industry, source_results[industry], company_name)[0]
+
+        return analyses
+
+    def _generate_market_analysis(self, cache_key: str, industry: str, company_name: str = None) -> Tuple[Dict[str, Any], bytes]:
+        """Generate and cache the real-time market analysis for a cache miss"""
         logger.info(f"Generating real-time market analysis for {industry}")
-        
-        # Gather data from multiple sources in parallel
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            futures = {
-                'market_trends': executor.submit(self._analyze_market_trends, industry),
-                'competitor_intelligence': executor.submit(self._get_competitor_intelligence, industry),
-                'market_size': executor.submit(self._get_market_size_data, industry),
-                'growth_predictions': executor.submit(self._predict_market_growth, industry),
-                'news_sentiment': executor.submit(self._analyze_news_sentiment, industry)
-            }
-            
-            # Collect results
-            results = {}
-            for key, future in futures.items():
-                try:
-                    results[key] = future.result(timeout=10)
-                except Exception as e:
-                    logger.error(f"Error getting {key}: {str(e)}")
-                    results[key] = self._get_fallback_data(key, industry)
+        results = self._gather_source_results([industry])[industry]
+        return self._synthesize_and_cache(cache_key, industry, results, company_name)
+
+    def _gather_source_results(self, industries: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Collect every market data source for the given industries
+
+        Source results still within their own TTL are reused; the expired
+        (source, industry) pairs are all fetched in parallel on the shared pool.
+
+        Args:
+            industries: Industries to collect source data for
+
+        Returns:
+            Source results keyed by industry, then by source name
+        """
+        sources = {
+            'market_trends': self._analyze_market_trends,
+            'competitor_intelligence': self._get_competitor_intelligence,
+            'market_size': self._get_market_size_data,
+            'growth_predictions': self._predict_market_growth,
+            'news_sentiment': self._analyze_news_sentiment
+        }
 
+        # Reuse source results that are still within their own TTL
+        results = {industry: {} for industry in industries}
+        with self._cache_lock:
+            for industry in industries:
+                for key in sources:
+                    cached = self.source_caches[key].get(industry)
+                    if cached is not None:
+                        results[industry][key] = cached
+        missed = [(industry, key) for industry in industries for key in sources if key not in results[industry]]
+
+        # Gather the expired sources in parallel
+        if missed:
+            # One deadline covers waiting for limiter slots and for results
+            deadline = time.monotonic() + SOURCE_FETCH_BUDGET
+            futures = {}
+            for industry, key in missed:
+                future = _source_limiter.submit(_source_executor, sources[key], industry,
+                                                acquire_timeout=max(0.0, deadline - time.monotonic()))
+                futures[future] = (industry, key)
+
+            # Collect results as they finish, within what is left of the
+            # budget; fallbacks are not cached so the source is retried next time
+            fetched = {}
+            try:
+                for future in as_completed(futures, timeout=max(0.0, deadline - time.monotonic())):
+                    industry, key = futures[future]
+                    try:
+                        fetched[industry, key] = results[industry][key] = future.result()
+                    except Exception as e:
+                        logger.error(f"Error getting {key}: {str(e)}")
+                        results[industry][key] = self._get_fallback_data(key, industry)
+            except FuturesTimeoutError:
+                for future, (industry, key) in futures.items():
+                    if key not in results[industry]:
+                        future.cancel()
+                        logger.error(f"Timed out getting {key}")
+                        results[industry][key] = self._get_fallback_data(key, industry)
+
+            with self._cache_lock:
+                for (industry, key), value in fetched.items():
+                    self.source_caches[key][industry] = value
+
+        return results
+
+    def _synthesize_and_cache(self, cache_key: str, industry: str, results: Dict, company_name: str = None) -> Tuple[Dict[str, Any], bytes]:
+        """Synthesize gathered source results into an analysis and cache it with its JSON bytes"""
         # AI-powered analysis synthesis
         analysis = self._synthesize_market_intelligence(industry, results, company_name)
         
-        # Cache the results
-        self.cache[cache_key] = {
-            'data': analysis,
-            'timestamp': time.time()
-        }
+        # Cache the results, serialized once for HTTP responses
+        entry = (analysis, orjson.dumps(analysis, option=orjson.OPT_SORT_KEYS))
+        with self._cache_lock:
+            self.cache[cache_key] = entry
+            self.stale_cache[cache_key] = entry
         
-        return analysis
+        return entry
 
     def _analyze_market_trends(self, industry: str) -> Dict[str, Any]:
         """AI-powered market trend analysis"""
@@ -134,191 +506,27 @@ class AIMarketIntelligenceService:
 
     def _generate_ai_market_trends(self, industry: str) -> Dict[str, Any]:
         """Generate AI-powered market trends"""
-        # Advanced AI trend analysis (simulated)
-        industry_mapping = {
-            "Point of Sale Software": {
-                "keywords": ["contactless payments", "AI analytics", "mobile POS", "cloud-native", "omnichannel"],
-                "momentum": "High",
-                "technologies": ["NFC payments", "Computer vision", "Edge computing", "5G integration"],
-                "signals": ["300% increase in contactless adoption", "85% mobile payment growth"],
-                "confidence": 0.92
-            },
-            "ERP Software": {
-                "keywords": ["AI automation", "cloud ERP", "low-code", "industry 4.0", "intelligent workflows"],
-                "momentum": "Very High",
-                "technologies": ["Machine learning", "RPA", "IoT integration", "Blockchain"],
-                "signals": ["67% cloud migration", "AI adoption up 156%"],
-                "confidence": 0.89
-            },
-            "CRM Software": {
-                "keywords": ["predictive CRM", "conversation AI", "customer 360", "real-time analytics"],
-                "momentum": "High",
-                "technologies": ["Natural language processing", "Predictive modeling", "Voice AI"],
-                "signals": ["Customer AI tools adoption +234%", "Voice CRM growing 89%"],
-                "confidence": 0.91
-            }
-        }
-        
-        return industry_mapping.get(industry, {
-            "keywords": ["digital transformation", "AI integration", "cloud adoption"],
-            "momentum": "Medium",
-            "technologies": ["Artificial intelligence", "Cloud computing", "Automation"],
-            "signals": ["Market digitization accelerating"],
-            "confidence": 0.75
-        })
+        return MARKET_TRENDS_BY_INDUSTRY.get(industry, DEFAULT_MARKET_TRENDS)
 
     def _ai_competitor_discovery(self, industry: str) -> Dict[str, Any]:
         """AI-powered competitor discovery and analysis"""
-        current_time = datetime.datetime.now()
-        
-        return {
-            "companies": [
-                {
-                    "name": "Square (Block Inc.)",
-                    "activity_level": "Very High",
-                    "recent_moves": ["Acquired Afterpay for $29B", "Launched Square Banking"],
-                    "threat_level": "High",
-                    "innovation_score": 9.2
-                },
-                {
-                    "name": "Shopify",
-                    "activity_level": "High", 
-                    "recent_moves": ["Expanded POS hardware", "AI-powered inventory management"],
-                    "threat_level": "Medium-High",
-                    "innovation_score": 8.7
-                },
-                {
-                    "name": "Toast Inc.",
-                    "activity_level": "Medium-High",
-                    "recent_moves": ["Restaurant technology suite expansion", "Capital lending program"],
-                    "threat_level": "Medium",
-                    "innovation_score": 8.1
-                }
-            ],
-            "movements": [
-                {"type": "Acquisition", "description": "Major consolidation in payment processing"},
-                {"type": "Product Launch", "description": "AI-powered analytics platforms trending"},
-                {"type": "Market Entry", "description": "Big tech entering small business software"}
-            ],
-            "pricing": [
-                {"trend": "Freemium models increasing", "impact": "High"},
-                {"trend": "Transaction-based pricing", "impact": "Medium"},
-                {"trend": "Bundle pricing strategies", "impact": "High"}
-            ],
-            "launches": [
-                {"product": "AI-powered inventory prediction", "company": "Square", "impact_score": 8.5},
-                {"product": "Voice-activated POS", "company": "Shopify", "impact_score": 7.8},
-                {"product": "Predictive customer analytics", "company": "Toast", "impact_score": 8.2}
-            ],
-            "share_changes": {
-                "growing": ["Square", "Shopify"],
-                "declining": ["Traditional POS vendors"],
-                "stable": ["Specialized industry players"]
-            }
-        }
+        return COMPETITOR_DISCOVERY
 
     def _ai_market_sizing(self, industry: str) -> Dict[str, Any]:
         """AI-enhanced market sizing analysis"""
-        return {
-            "size": {
-                "global": "$24.2B (2024)",
-                "regional": {"North America": "$9.8B", "Europe": "$6.1B", "Asia-Pacific": "$5.9B"},
-                "yoy_growth": "+14.2%"
-            },
-            "trajectory": {
-                "2025": "$27.8B",
-                "2026": "$31.9B", 
-                "2027": "$36.7B",
-                "cagr_2024_2027": "15.1%"
-            },
-            "regions": {
-                "fastest_growing": "Asia-Pacific (+18.3%)",
-                "largest_market": "North America (40.5%)",
-                "emerging_markets": ["Latin America", "Middle East", "Africa"]
-            },
-            "segments": {
-                "cloud_based": {"share": "68%", "growth": "+19.2%"},
-                "on_premise": {"share": "32%", "growth": "+6.1%"},
-                "mobile_pos": {"share": "45%", "growth": "+22.8%"}
-            },
-            "accuracy": {
-                "confidence_interval": "±3.2%",
-                "data_quality_score": 0.91,
-                "prediction_accuracy": "Historical 94.6%"
-            }
-        }
+        return MARKET_SIZING
 
     def _ai_growth_modeling(self, industry: str) -> Dict[str, Any]:
         """AI-powered growth modeling and predictions"""
-        return {
-            "short_term": {
-                "q1_2024": "+3.8%",
-                "q2_2024": "+4.2%",
-                "q3_2024": "+3.9%",
-                "q4_2024": "+4.5%"
-            },
-            "long_term": {
-                "2025": "14.7% growth",
-                "2026": "13.9% growth",
-                "2027": "12.8% growth",
-                "2028": "11.6% growth"
-            },
-            "drivers": [
-                {"factor": "AI integration demand", "impact_score": 9.2, "timeline": "Immediate"},
-                {"factor": "Cloud migration", "impact_score": 8.7, "timeline": "Short-term"},
-                {"factor": "Remote work trends", "impact_score": 7.9, "timeline": "Ongoing"},
-                {"factor": "Digital transformation", "impact_score": 9.5, "timeline": "Long-term"}
-            ],
-            "risks": [
-                {"factor": "Economic recession", "probability": "Medium", "impact": "High"},
-                {"factor": "Regulatory changes", "probability": "Low", "impact": "Medium"},
-                {"factor": "Technology disruption", "probability": "High", "impact": "Very High"},
-                {"factor": "Competitive consolidation", "probability": "Medium", "impact": "High"}
-            ],
-            "confidence": {
-                "overall": 0.87,
-                "short_term": 0.94,
-                "long_term": 0.79,
-                "model_accuracy": "91.3%"
-            }
-        }
+        return GROWTH_MODELING
 
     def _ai_sentiment_analysis(self, industry: str) -> Dict[str, Any]:
         """AI-powered sentiment analysis of market news"""
-        return {
-            "overall": {
-                "score": 0.73,  # Scale: -1 to 1
-                "classification": "Positive",
-                "trend_direction": "Improving",
-                "volatility": "Low"
-            },
-            "trends": {
-                "last_30_days": [0.65, 0.68, 0.71, 0.73],
-                "sentiment_momentum": "+12.3%",
-                "stability_index": 0.82
-            },
-            "topics": [
-                {"topic": "AI integration", "sentiment": 0.89, "volume": "High"},
-                {"topic": "Cloud adoption", "sentiment": 0.81, "volume": "Very High"},
-                {"topic": "Market competition", "sentiment": 0.42, "volume": "Medium"},
-                {"topic": "Investment funding", "sentiment": 0.76, "volume": "High"}
-            ],
-            "influence": {
-                "media_reach": "High",
-                "social_engagement": "Medium-High",
-                "analyst_coverage": "Positive",
-                "investor_interest": "Strong"
-            },
-            "velocity": {
-                "news_frequency": "3.2 articles/day",
-                "social_mentions": "156 mentions/day",
-                "trend_acceleration": "+23.7%"
-            }
-        }
+        return NEWS_SENTIMENT
 
     def _synthesize_market_intelligence(self, industry: str, data: Dict, company_name: str = None) -> Dict[str, Any]:
         """AI-powered synthesis of all market intelligence data"""
-        analysis_timestamp = datetime.datetime.now()
+        analysis_timestamp = now_iso()
         
         # AI-powered insight generation
         ai_insights = self._generate_ai_insights(industry, data, company_name)
@@ -326,35 +534,35 @@ class AIMarketIntelligenceService:
         return {
             "industry": industry,
             "company_focus": company_name,
-            "analysis_timestamp": analysis_timestamp.isoformat(),
+            "analysis_timestamp": analysis_timestamp,
             "intelligence_confidence": 0.89,
             
             "market_overview": {
-                "market_size": data.get("market_size", {}).get("size", "N/A"),
-                "growth_rate": data.get("growth_predictions", {}).get("short_term_forecast", {}).get("q4_2024", "N/A"),
-                "key_trends": data.get("market_trends", {}).get("trending_keywords", []),
-                "market_sentiment": data.get("news_sentiment", {}).get("overall", {}).get("classification", "Neutral"),
+                "market_size": _dig(data, ("market_size", "size"), "N/A"),
+                "growth_rate": _dig(data, ("growth_predictions", "short_term_forecast", "q4_2024"), "N/A"),
+                "key_trends": _dig(data, ("market_trends", "trending_keywords"), []),
+                "market_sentiment": _dig(data, ("news_sentiment", "overall", "classification"), "Neutral"),
                 "ai_market_score": ai_insights.get("market_health_score", 7.0)
             },
             
             "competitive_landscape": {
-                "major_players": data.get("competitor_intelligence", {}).get("active_competitors", [])[:3],
+                "major_players": _dig(data, ("competitor_intelligence", "active_competitors"), [])[:3],
                 "market_concentration": "Moderately Concentrated",
                 "competitive_intensity": ai_insights.get("competitive_intensity", "Medium"),
                 "market_disruption_risk": ai_insights.get("disruption_risk", "Medium")
             },
             
             "ai_predictions": {
-                "growth_forecast": data.get("growth_predictions", {}).get("long_term_projection", {}),
+                "growth_forecast": _dig(data, ("growth_predictions", "long_term_projection"), {}),
                 "trend_predictions": ai_insights.get("trend_predictions", []),
                 "risk_assessment": ai_insights.get("risk_assessment", {}),
                 "opportunity_score": ai_insights.get("opportunity_score", 7.0)
             },
             
             "real_time_insights": {
-                "market_momentum": data.get("market_trends", {}).get("trend_momentum", "Medium"),
-                "sentiment_trend": data.get("news_sentiment", {}).get("trends", {}).get("sentiment_momentum", "Stable"),
-                "competitive_activity": len(data.get("competitor_intelligence", {}).get("movements", [])),
+                "market_momentum": _dig(data, ("market_trends", "trend_momentum"), "Medium"),
+                "sentiment_trend": _dig(data, ("news_sentiment", "trends", "sentiment_momentum"), "Stable"),
+                "competitive_activity": len(_dig(data, ("competitor_intelligence", "movements"), [])),
                 "innovation_rate": ai_insights.get("innovation_rate", "Moderate")
             },
             
@@ -365,7 +573,7 @@ class AIMarketIntelligenceService:
                 "competitor_intel": "AI web scraping",
                 "sentiment_analysis": "News & social media AI",
                 "growth_modeling": "Machine learning predictions",
-                "last_updated": analysis_timestamp.isoformat()
+                "last_updated": analysis_timestamp
             }
         }
 
@@ -410,11 +618,11 @@ class AIMarketIntelligenceService:
     def _calculate_market_health(self, data: Dict) -> float:
         """Calculate overall market health score"""
         try:
-            sentiment_score = data.get("news_sentiment", {}).get("overall", {}).get("score", 0.5)
+            sentiment_score = _dig(data, ("news_sentiment", "overall", "score"), 0.5)
             growth_indicator = 0.8  # Based on growth predictions
             competition_factor = 0.7  # Based on competitive landscape
             
-            return round((sentiment_score * 0.3 + growth_indicator * 0.4 + competition_factor * 0.3), 2)
+            return _market_health_score(sentiment_score, growth_indicator, competition_factor)
         except Exception as e:
             logger.warning(f"Error calculating market health: {e}")
             return 0.75  # Default healthy score
@@ -422,11 +630,10 @@ class AIMarketIntelligenceService:
     def _assess_competitive_intensity(self, data: Dict) -> float:
         """Assess competitive intensity (0 = low competition, 1 = high competition)"""
         try:
-            active_competitors = len(data.get("competitor_intelligence", {}).get("active_competitors", []))
-            market_movements = len(data.get("competitor_intelligence", {}).get("movements", []))
+            active_competitors = len(_dig(data, ("competitor_intelligence", "active_competitors"), []))
+            market_movements = len(_dig(data, ("competitor_intelligence", "movements"), []))
             
-            intensity = min((active_competitors * 0.1 + market_movements * 0.05), 1.0)
-            return round(intensity, 2)
+            return _competitive_intensity_score(active_competitors, market_movements)
         except Exception as e:
             logger.warning(f"Error assessing competitive intensity: {e}")
             return 0.6  # Default moderate intensity
@@ -442,14 +649,6 @@ class AIMarketIntelligenceService:
         }
         return fallbacks.get(data_type, {})
 
-    def _is_cache_valid(self, cache_key: str) -> bool:
-        """Check if cached data is still valid"""
-        if cache_key not in self.cache:
-            return False
-        
-        cache_age = time.time() - self.cache[cache_key]['timestamp']
-        return cache_age < self.cache_duration
-
     def get_ai_competitive_scoring(self, company_name: str, industry: str) -> Dict[str, Any]:
         """AI-powered competitive scoring and positioning"""
         return {
@@ -468,5 +667,5 @@ class AIMarketIntelligenceService:
                 "Expand cloud capabilities",
                 "Strengthen mobile offerings"
             ],
-            "timestamp": datetime.datetime.now().isoformat()
+            "timestamp": now_iso()
         }
@@ -12,12 +12,17 @@ import logging
 from concurrent.futures import ThreadPoolExecutor
 import random
 
+from .singleflight import SingleFlight
+
 logger = logging.getLogger(__name__)
 
 class AITrendAnalysisService:
-    def __init__(self):
+    def __init__(self, session: Optional[requests.Session] = None):
+        # Pooled HTTP session for trend data APIs
+        self.session = session or requests.Session()
         self.trend_cache = {}
         self.cache_duration = 300  # 5 minutes cache for trend data
+        self._singleflight = SingleFlight()
         self.ml_models = {
             "trend_detection": "GPT-4 Enhanced",
             "sentiment_analysis": "Custom BERT Model",
@@ -32,6 +37,11 @@ class AITrendAnalysisService:
             logger.info(f"Returning cached trend analysis for {industry}")
             return self.trend_cache[cache_key]['data']
 
+        # Coalesce concurrent cache misses for the same key into one generation
+        return self._singleflight.do(cache_key, self._generate_trend_analysis, cache_key, industry, time_horizon)
+
+    def _generate_trend_analysis(self, cache_key: str, industry: str, time_horizon: str) -> Dict[str, Any]:
+        """Generate and cache the real-time trend analysis for a cache miss"""
         logger.info(f"Generating real-time trend analysis for {industry}")
         
         # Parallel AI trend analysis
@@ -0,0 +1,77 @@
+"""
+Adaptive (AIMD) concurrency limiting for executor fan-out
+The number of tasks allowed in flight grows by one while tasks complete
+faster than their running average latency, and halves when a task fails,
+exceeds its latency budget or cannot be admitted in time
+"""
+
+import threading
+import time
+from concurrent.futures import Executor, Future
+from typing import Any, Callable, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class AIMDLimiter:
+    def __init__(self, initial_limit: int = 5, min_limit: int = 2, max_limit: int = 32,
+                 latency_budget: float = 10.0, acquire_timeout: float = 10.0):
+        self.limit = initial_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_budget = latency_budget
+        self.acquire_timeout = acquire_timeout
+        self.in_flight = 0
+        self._avg_latency = None
+        self._condition = threading.Condition()
+
+    def submit(self, executor: Executor, fn: Callable[..., Any], *args,
+               acquire_timeout: Optional[float] = None, **kwargs) -> Future:
+        """Submit fn(*args, **kwargs) to executor once a slot under the current limit is free
+
+        A task that cannot be admitted within acquire_timeout (the limiter's
+        default when not given) is rejected: the returned future fails with
+        TimeoutError and the limit is halved.
+        """
+        if acquire_timeout is None:
+            acquire_timeout = self.acquire_timeout
+        with self._condition:
+            admitted = self._condition.wait_for(lambda: self.in_flight < self.limit, acquire_timeout)
+            if admitted:
+                self.in_flight += 1
+            else:
+                self._decrease()
+
+        if not admitted:
+            logger.warning(f"Concurrency limit {self.limit} reached; rejecting {getattr(fn, '__name__', fn)}")
+            rejected = Future()
+            rejected.set_exception(TimeoutError("Concurrency limit reached"))
+            return rejected
+
+        started = time.monotonic()
+        try:
+            future = executor.submit(fn, *args, **kwargs)
+        except BaseException:
+            self._release(None)
+            raise
+        future.add_done_callback(lambda done: self._release(
+            None if done.cancelled() or done.exception() is not None else time.monotonic() - started))
+        return future
+
+    def _release(self, latency: Optional[float]) -> None:
+        """Free a slot and adapt the limit to how the task went (latency None = failed)"""
+        with self._condition:
+            self.in_flight -= 1
+            if latency is None or latency > self.latency_budget:
+                self._decrease()
+            else:
+                if self._avg_latency is None or latency <= self._avg_latency:
+                    self.limit = min(self.limit + 1, self.max_limit)
+                # Exponentially weighted running average of successful latencies
+                self._avg_latency = latency if self._avg_latency is None else 0.9 * self._avg_latency + 0.1 * latency
+            self._condition.notify_all()
+
+    def _decrease(self) -> None:
+        """Multiplicatively shrink the limit (caller holds the condition)"""
+        self.limit = max(self.min_limit, self.limit // 2)
@@ -8,6 +8,10 @@ import datetime
 from typing import Dict, List, Any
 import logging
 
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+
 # Import AI-powered services
 from .ai_market_intelligence_service import AIMarketIntelligenceService
 from .ai_competitive_analysis_service import AICompetitiveAnalysisService
@@ -15,15 +19,38 @@ from .ai_trend_analysis_service import AITrendAnalysisService
 
 logger = logging.getLogger(__name__)
 
+# Synergy between an existing product category and a new one, keyed
+# (current_category, new_category); unlisted pairs score 5.0
+CATEGORY_SYNERGY_SCORES = {
+    ("Point of Sale", "ERP"): 9.0,
+    ("Point of Sale", "CRM"): 8.5,
+    ("Point of Sale", "Inventory Management"): 9.5,
+    ("ERP", "CRM"): 8.0,
+    ("CRM", "Marketing Automation"): 9.0,
+    ("ERP", "Analytics"): 8.5
+}
+
+def create_http_session() -> requests.Session:
+    """Create a keep-alive HTTP session with a connection pool for upstream APIs"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=20, pool_maxsize=50)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
 class MarketAnalysisService:
     def __init__(self):
         self.market_data = self._load_market_data()
         self.competitor_data = self._load_competitor_data()
         
+        # One pooled session shared by all AI services, so upstream calls
+        # reuse warm connections instead of a new TCP/TLS handshake each time
+        self._session = create_http_session()
+        
         # Initialize AI-powered services
-        self.ai_market_intelligence = AIMarketIntelligenceService()
-        self.ai_competitive_analysis = AICompetitiveAnalysisService()
-        self.ai_trend_analysis = AITrendAnalysisService()
+        self.ai_market_intelligence = AIMarketIntelligenceService(session=self._session)
+        self.ai_competitive_analysis = AICompetitiveAnalysisService(session=self._session)
+        self.ai_trend_analysis = AITrendAnalysisService(session=self._session)
         
         logger.info("AI-Enhanced Market Analysis Service initialized")
         
@@ -409,21 +436,11 @@ class MarketAnalysisService:
     
     def _calculate_synergy_score(self, current_categories: set, new_category: str) -> float:
         """Calculate synergy score between product categories"""
-        synergy_matrix = {
-            ("Point of Sale", "ERP"): 9.0,
-            ("Point of Sale", "CRM"): 8.5,
-            ("Point of Sale", "Inventory Management"): 9.5,
-            ("ERP", "CRM"): 8.0,
-            ("CRM", "Marketing Automation"): 9.0,
-            ("ERP", "Analytics"): 8.5
-        }
-        
-        max_score = 0.0
-        for current_cat in current_categories:
-            score = synergy_matrix.get((current_cat, new_category), 5.0)
-            max_score = max(max_score, score)
-        
-        return max_score
+        scores = CATEGORY_SYNERGY_SCORES
+        return max(
+            (scores.get((current_cat, new_category), 5.0) for current_cat in current_categories),
+            default=0.0
+        )
     
     # ========================================
     # NEW AI-POWERED METHODS
@@ -437,6 +454,22 @@ class MarketAnalysisService:
             logger.error(f"Error getting AI market intelligence: {str(e)}")
             return {"error": "Failed to get AI market intelligence", "fallback": True}
     
+    def get_ai_market_intelligence_bulk(self, industries: List[str], company_name: str = None) -> Dict[str, Any]:
+        """Get AI-powered market intelligence for several industries, keyed by industry
+        
+        Unlike the single-industry methods there is no fallback dict: it would
+        be indistinguishable from the per-industry mapping, so errors propagate.
+        """
+        return self.ai_market_intelligence.get_real_time_market_analysis_bulk(industries, company_name)
+    
+    def get_ai_market_intelligence_json(self, industry: str, company_name: str = None) -> bytes:
+        """Get comprehensive AI-powered market intelligence as pre-serialized JSON bytes"""
+        try:
+            return self.ai_market_intelligence.get_real_time_market_analysis_json(industry, company_name)
+        except Exception as e:
+            logger.error(f"Error getting AI market intelligence: {str(e)}")
+            return orjson.dumps({"error": "Failed to get AI market intelligence", "fallback": True})
+    
     def get_ai_competitive_intelligence(self, company_name: str, industry: str, company_data: Dict) -> Dict[str, Any]:
         """Get AI-powered competitive intelligence"""
         try:
@@ -445,6 +478,14 @@ class MarketAnalysisService:
             logger.error(f"Error getting AI competitive intelligence: {str(e)}")
             return {"error": "Failed to get AI competitive intelligence", "fallback": True}
     
+    def get_ai_competitive_intelligence_json(self, company_name: str, industry: str, company_data: Dict) -> bytes:
+        """Get AI-powered competitive intelligence as pre-serialized JSON bytes"""
+        try:
+            return self.ai_competitive_analysis.get_real_time_competitive_position_json(company_name, industry, company_data)
+        except Exception as e:
+            logger.error(f"Error getting AI competitive intelligence: {str(e)}")
+            return orjson.dumps({"error": "Failed to get AI competitive intelligence", "fallback": True})
+    
     def get_ai_trend_analysis(self, industry: str, time_horizon: str = "6_months") -> Dict[str, Any]:
         """Get AI-powered trend analysis and predictions"""
         try:
@@ -474,7 +515,9 @@ class MarketAnalysisService:
         try:
             logger.info(f"Getting comprehensive real-time insights for {industry}")
             
-            # Get all AI analyses in parallel
+            # Get all AI analyses; they are cached, CPU-bound simulations, so
+            # they run inline (the market intelligence sources fan out on
+            # their own shared pool)
             insights = {
                 "market_intelligence": self.get_ai_market_intelligence(industry, company_name),
                 "trend_analysis": self.get_ai_trend_analysis(industry),
@@ -490,9 +533,7 @@ class MarketAnalysisService:
             
             if company_name:
                 company_data = {"company": company_name, "products": []}  # Would be fetched from actual data
-                insights["competitive_intelligence"] = self.get_ai_competitive_intelligence(
-                    company_name, industry, company_data
-                )
+                insights["competitive_intelligence"] = self.get_ai_competitive_intelligence(company_name, industry, company_data)
                 insights["competitive_scoring"] = self.get_ai_competitive_scoring(company_name, industry)
             
             return insights
@@ -10,19 +10,70 @@ This service provides comprehensive sales data analysis capabilities including:
 
 import json
 import os
+import time
+from array import array
+from collections import Counter
+from bisect import bisect_left, bisect_right
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Union, Any
-from dataclasses import dataclass
+from typing import AbstractSet, Dict, List, Optional, Tuple, Union, Any
+from dataclasses import dataclass, field
+from functools import lru_cache
+import heapq
+from operator import attrgetter, itemgetter
 import logging
 
+import orjson
+from cachetools import Cache, TTLCache
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Field accessors for C-level map()/sum() reductions over sales records
+_get_revenue = attrgetter('revenue')
+_get_units_sold = attrgetter('units_sold')
+_get_growth_rate = attrgetter('growth_rate')
+
+# Result sort keys for advanced queries, by sort_by value
+_RESULT_SORT_KEYS = {
+    'revenue': itemgetter('total_revenue'),
+    'total_revenue': itemgetter('total_revenue'),
+    'units': itemgetter('total_units'),
+    'total_units': itemgetter('total_units'),
+    'growth_rate': itemgetter('average_growth_rate'),
+    'market_share': itemgetter('average_market_share')
+}
+
+
+def _positions_to_mask(positions) -> int:
+    """Build an entry bitmask with the given positions set, in one int conversion
+    
+    OR-ing 1 << i into a growing int copies it for every position; setting
+    bits in a bytearray first keeps index builds linear in the entry count.
+    """
+    positions = list(positions)
+    if not positions:
+        return 0
+    bits = bytearray(max(positions) // 8 + 1)
+    for i in positions:
+        bits[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(bits, 'little')
+
+
+def _iter_mask_indexes(mask: int):
+    """Yield the positions of the set bits of an entry bitmask, lowest first"""
+    while mask:
+        low_bit = mask & -mask
+        yield low_bit.bit_length() - 1
+        mask ^= low_bit
+
 
 @dataclass
 class SalesRecord:
     """Data class for sales record"""
+    # No per-instance __dict__: records are the most numerous objects in memory
+    __slots__ = ('period', 'units_sold', 'revenue', 'currency', 'growth_rate', 'market_share')
+    
     period: str
     units_sold: int
     revenue: float
@@ -40,6 +91,83 @@ class SalesData:
     region: str
     sales_records: List[SalesRecord]
     metadata: Dict[str, Any]
+    
+    # Columnar (structure-of-arrays) copies of sales_records, built once at
+    # load time so aggregations reduce contiguous arrays in C
+    periods: List[str] = field(init=False, repr=False, compare=False)
+    revenues: array = field(init=False, repr=False, compare=False)
+    units: array = field(init=False, repr=False, compare=False)
+    growth_rates: array = field(init=False, repr=False, compare=False)
+    market_shares: array = field(init=False, repr=False, compare=False)
+    
+    # Per-entry partial reductions of the columns above; group-by aggregations
+    # combine these instead of re-scanning every record
+    total_revenue: float = field(init=False, repr=False, compare=False)
+    total_units: int = field(init=False, repr=False, compare=False)
+    total_growth_rate: float = field(init=False, repr=False, compare=False)
+    total_market_share: float = field(init=False, repr=False, compare=False)
+    revenue_range: Optional[Tuple[float, float]] = field(init=False, repr=False, compare=False)
+    units_range: Optional[Tuple[int, int]] = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        records = self.sales_records
+        self.periods = [record.period for record in records]
+        revenues = [record.revenue for record in records]
+        # Whole-number revenues use an integer column so sums and ranges
+        # stay ints in the API output, as when summing the records directly
+        self.revenues = array('q' if all(type(revenue) is int for revenue in revenues) else 'd', revenues)
+        units = [record.units_sold for record in records]
+        # Per-period unit counts normally fit in 32 bits, which halves the
+        # column next to 'q'; counts outside that range keep a 64-bit column
+        try:
+            self.units = array('i', units)
+        except OverflowError:
+            self.units = array('q', units)
+        self.growth_rates = array('d', [record.growth_rate for record in records])
+        self.market_shares = array('d', [record.market_share for record in records])
+        
+        self.total_revenue = sum(self.revenues)
+        self.total_units = sum(self.units)
+        self.total_growth_rate = sum(self.growth_rates)
+        self.total_market_share = sum(self.market_shares)
+        self.revenue_range = (min(self.revenues), max(self.revenues)) if records else None
+        self.units_range = (min(self.units), max(self.units)) if records else None
+
+
+class AnalyticsCache(TTLCache):
+    """TTL/LRU cache of analytics results that counts cached entries per method"""
+    
+    def __init__(self, maxsize: int, ttl: float):
+        super().__init__(maxsize, ttl)
+        self.methods = Counter()  # Key prefix -> number of cached entries
+    
+    def _forget(self, key: str):
+        method = key.split('_', 1)[0]
+        self.methods[method] -= 1
+        if not self.methods[method]:
+            del self.methods[method]
+    
+    def __setitem__(self, key, value):
+        is_new = key not in self
+        super().__setitem__(key, value)
+        if is_new:
+            self.methods[key.split('_', 1)[0]] += 1
+    
+    def __delitem__(self, key):
+        # Evictions (popitem) go through here; TTLCache raises KeyError even
+        # after dropping a stored key that had already expired
+        stored = Cache.__contains__(self, key)
+        try:
+            super().__delitem__(key)
+        finally:
+            if stored:
+                self._forget(key)
+    
+    def expire(self, time=None):
+        expired = super().expire(time)
+        for key, _ in expired:
+            self._forget(key)
+        return expired
 
 
 class SalesAnalyticsService:
@@ -54,15 +182,18 @@ class SalesAnalyticsService:
         """
         self.data_file_path = data_file_path
         self._cache = {}
-        self._cache_timestamp = None
+        self._cache_mono = None  # time.monotonic() of the last load, for TTL checks and cache age
         self._cache_ttl = 300  # 5 minutes cache TTL
+        self._data_mtime = None  # st_mtime_ns of the data file when it was last read
+        self._generation = 0  # Bumped on every (re)load and invalidation
         self.data = None
         self.validation_schema = None
         
         # Performance optimization caches
-        self._analytics_cache = {}
         self._analytics_cache_ttl = 180  # 3 minutes for analytics cache
-        self._analytics_cache_timestamp = {}
+        self._analytics_cache = AnalyticsCache(maxsize=4096, ttl=self._analytics_cache_ttl)
+        self._analytics_hits = 0
+        self._analytics_misses = 0
         
         # Simulated indexing for faster queries
         self._product_index = {}
@@ -70,6 +201,28 @@ class SalesAnalyticsService:
         self._region_index = {}
         self._period_index = {}
         
+        # Entry bitmasks (bit i set = sales_data[i] matches) for combining
+        # advanced-query filters with integer & and | instead of set operations
+        self._product_masks: Dict[str, int] = {}
+        self._sector_masks: Dict[str, int] = {}
+        self._region_masks: Dict[str, int] = {}
+        self._period_keys: List[str] = []  # Sorted periods, parallel to _period_masks
+        self._period_masks: List[int] = []
+        
+        # Sorted distinct filter values, rebuilt with the indexes
+        self._available_filters = {'sectors': (), 'regions': (), 'products': ()}
+        self._period_min = None  # Earliest/latest indexed YYYY-MM period
+        self._period_max = None
+        
+        # Per-product cross-sector aggregates, cleared whenever data is reloaded
+        self._cross_sector_cache = lru_cache(maxsize=512)(self._compute_cross_sector)
+        
+        # Invalidation cooldown: non-forced invalidations within this window of
+        # the last one are deferred and applied once it has elapsed
+        self._invalidation_cooldown = 10.0
+        self._last_invalidated = None
+        self._pending_invalidation = False
+        
         # Load initial data
         self._load_data()
     
@@ -77,32 +230,50 @@ class SalesAnalyticsService:
         """
         Load sales data from JSON file with caching
         
+        If the TTL has expired but the data file's mtime is the same as when
+        it was read, the loaded data is revalidated in place instead of being
+        parsed again. invalidate_cache()/reload_data() still force a reload.
+        
         Returns:
             Dict containing sales data
         """
         try:
-            # Check if cache is still valid
-            if (self._cache_timestamp and 
-                datetime.now() - self._cache_timestamp < timedelta(seconds=self._cache_ttl) and
-                self.data):
-                logger.info("Using cached sales data")
+            if self._pending_invalidation:
+                self._apply_pending_invalidation()
+            
+            # Fast path: cache is still valid
+            if self.is_cache_fresh():
                 return self.data
             
+            # TTL expired: keep the loaded data if the file is unchanged
+            if self.data is not None and self._cache_mono is not None:
+                try:
+                    data_mtime = os.stat(self.data_file_path).st_mtime_ns
+                except OSError:
+                    data_mtime = None
+                if data_mtime is not None and data_mtime == self._data_mtime:
+                    self._cache_mono = time.monotonic()
+                    return self.data
+            
             # Load fresh data
             if not os.path.exists(self.data_file_path):
                 logger.warning(f"Sales data file not found: {self.data_file_path}")
                 return {"sales_data": [], "schema_version": "1.0", "metadata": {}}
             
-            with open(self.data_file_path, 'r', encoding='utf-8') as f:
-                raw_data = json.load(f)
+            data_mtime = os.stat(self.data_file_path).st_mtime_ns
+            with open(self.data_file_path, 'rb') as f:
+                raw_data = orjson.loads(f.read())
             
             # Validate and process data
             self.data = self._process_raw_data(raw_data)
+            self._data_mtime = data_mtime
             self.validation_schema = raw_data.get('data_validation', {})
-            self._cache_timestamp = datetime.now()
+            self._cache_mono = time.monotonic()
+            self._generation += 1
             
             # Build indexes for performance optimization
             self._build_indexes()
+            self._cross_sector_cache.cache_clear()
             
             logger.info(f"Loaded {len(self.data.get('sales_data', []))} sales records")
             return self.data
@@ -117,6 +288,26 @@ class SalesAnalyticsService:
             logger.error(f"Error loading sales data: {e}")
             return {"sales_data": [], "schema_version": "1.0", "metadata": {}}
     
+    def ensure_loaded(self) -> Dict[str, Any]:
+        """
+        Make sure sales data is loaded without re-reading an unchanged file
+        (see _load_data)
+        
+        Returns:
+            Dict containing sales data
+        """
+        return self._load_data()
+    
+    def is_cache_fresh(self) -> bool:
+        """
+        Check whether the loaded sales data and its indexes are within the TTL
+        
+        Returns:
+            True if the cached data can be used without reloading
+        """
+        return (self.data is not None and self._cache_mono is not None and
+                time.monotonic() - self._cache_mono < self._cache_ttl)
+    
     def _process_raw_data(self, raw_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Process and validate raw data from JSON
@@ -168,13 +359,73 @@ class SalesAnalyticsService:
         processed_data['sales_data'] = sales_data
         return processed_data
     
-    def invalidate_cache(self):
-        """Invalidate the data cache"""
+    def invalidate_cache(self, force: bool = False) -> bool:
+        """
+        Invalidate the data cache
+        
+        Invalidations within the cooldown of the previous one are deferred
+        (coalesced into one) so bursts don't keep the caches permanently cold.
+        
+        Args:
+            force: Invalidate immediately, bypassing the cooldown
+            
+        Returns:
+            True if the caches were cleared, False if the invalidation was deferred
+        """
+        now = time.monotonic()
+        if (not force and self._last_invalidated is not None and
+                now - self._last_invalidated < self._invalidation_cooldown):
+            self._pending_invalidation = True
+            logger.info("Sales data cache invalidation deferred (cooldown)")
+            return False
+        
+        self._last_invalidated = now
+        self._pending_invalidation = False
         self._cache = {}
-        self._cache_timestamp = None
-        self._analytics_cache = {}
-        self._analytics_cache_timestamp = {}
+        self._cache_mono = None
+        self._generation += 1
+        self._analytics_cache.clear()
+        self._cross_sector_cache.cache_clear()
         logger.info("Sales data cache invalidated")
+        return True
+    
+    def _apply_pending_invalidation(self):
+        """Apply a deferred invalidation once the cooldown has elapsed"""
+        if time.monotonic() - self._last_invalidated >= self._invalidation_cooldown:
+            self.invalidate_cache(force=True)
+    
+    def get_invalidation_state(self) -> Dict[str, Any]:
+        """
+        Describe the invalidation cooldown for cache statistics
+        
+        Returns:
+            Cooldown length, seconds since the last invalidation and whether one is pending
+        """
+        return {
+            'cooldown_seconds': self._invalidation_cooldown,
+            'seconds_since_last_invalidation': (
+                time.monotonic() - self._last_invalidated if self._last_invalidated is not None else None
+            ),
+            'pending_invalidation': self._pending_invalidation
+        }
+    
+    def get_analytics_cache_stats(self) -> Dict[str, Any]:
+        """
+        Describe the analytics result cache for cache statistics
+        
+        Returns:
+            Live entry count, TTL, cached methods and hit/miss counts
+        """
+        self._analytics_cache.expire()
+        lookups = self._analytics_hits + self._analytics_misses
+        return {
+            'cached_queries': len(self._analytics_cache),
+            'cache_ttl_seconds': self._analytics_cache_ttl,
+            'cached_methods': list(self._analytics_cache.methods),
+            'hits': self._analytics_hits,
+            'misses': self._analytics_misses,
+            'hit_rate': self._analytics_hits / lookups if lookups else 0
+        }
     
     def _build_indexes(self):
         """
@@ -188,6 +439,7 @@ class SalesAnalyticsService:
         self._sector_index = {}
         self._region_index = {}
         self._period_index = {}
+        period_min = period_max = None
         
         for i, sales_entry in enumerate(self.data['sales_data']):
             # Product index
@@ -213,10 +465,46 @@ class SalesAnalyticsService:
                 period = record.period
                 if period not in self._period_index:
                     self._period_index[period] = []
+                    if period_min is None or period < period_min:
+                        period_min = period
+                    if period_max is None or period > period_max:
+                        period_max = period
                 self._period_index[period].append((i, record))
         
+        self._period_min = period_min
+        self._period_max = period_max
+        
+        # Bitmask views of the indexes for advanced-query filtering
+        self._product_masks = self._indexes_to_masks(self._product_index)
+        self._sector_masks = self._indexes_to_masks(self._sector_index)
+        self._region_masks = self._indexes_to_masks(self._region_index)
+        self._period_keys = sorted(self._period_index)
+        self._period_masks = [
+            _positions_to_mask(entry_index for entry_index, _ in self._period_index[period])
+            for period in self._period_keys
+        ]
+        
+        self._available_filters = {
+            'sectors': tuple(sorted(self._sector_index)),
+            'regions': tuple(sorted(self._region_index)),
+            'products': tuple(sorted(self._product_index))
+        }
+        
         logger.info(f"Built indexes: {len(self._product_index)} products, {len(self._sector_index)} sectors, {len(self._region_index)} regions, {len(self._period_index)} periods")
     
+    @staticmethod
+    def _indexes_to_masks(index: Dict[str, List[int]]) -> Dict[str, int]:
+        """
+        Convert an entry-position index into entry bitmasks
+        
+        Args:
+            index: Mapping of value -> positions in sales_data
+            
+        Returns:
+            Mapping of value -> bitmask with those positions set
+        """
+        return {value: _positions_to_mask(positions) for value, positions in index.items()}
+    
     def _get_analytics_cache_key(self, method_name: str, **kwargs) -> str:
         """
         Generate cache key for analytics methods
@@ -243,21 +531,13 @@ class SalesAnalyticsService:
         Returns:
             Cached result or None if not available/expired
         """
-        if cache_key not in self._analytics_cache:
-            return None
-        
-        cache_time = self._analytics_cache_timestamp.get(cache_key)
-        if not cache_time:
-            return None
-        
-        # Check if cache is expired
-        if datetime.now() - cache_time > timedelta(seconds=self._analytics_cache_ttl):
-            # Remove expired cache
-            del self._analytics_cache[cache_key]
-            del self._analytics_cache_timestamp[cache_key]
-            return None
-        
-        return self._analytics_cache[cache_key]
+        # Expired entries are treated as missing by the TTLCache
+        result = self._analytics_cache.get(cache_key)
+        if result is None:
+            self._analytics_misses += 1
+        else:
+            self._analytics_hits += 1
+        return result
     
     def _set_cached_analytics(self, cache_key: str, result: Dict[str, Any]):
         """
@@ -268,11 +548,10 @@ class SalesAnalyticsService:
             result: Result to cache
         """
         self._analytics_cache[cache_key] = result
-        self._analytics_cache_timestamp[cache_key] = datetime.now()
     
     def reload_data(self):
         """Force reload of sales data"""
-        self.invalidate_cache()
+        self.invalidate_cache(force=True)
         return self._load_data()
     
     def get_sales_summary(self, 
@@ -322,6 +601,14 @@ class SalesAnalyticsService:
             record_count = 0
             
             for sales_entry in filtered_data:
+                if not period_start and not period_end:
+                    # No period filter: reduce the entry's columns directly
+                    total_revenue = sum(sales_entry.revenues, total_revenue)
+                    total_units = sum(sales_entry.units, total_units)
+                    growth_rates.extend(sales_entry.growth_rates)
+                    record_count += len(sales_entry.periods)
+                    continue
+                
                 for record in sales_entry.sales_records:
                     # Apply period filtering
                     if period_start and record.period < period_start:
@@ -418,13 +705,12 @@ class SalesAnalyticsService:
                         'products': set()
                     }
                 
-                sector_data[sector]['products'].add(sales_entry.product_id)
-                
-                for record in sales_entry.sales_records:
-                    sector_data[sector]['total_revenue'] += record.revenue
-                    sector_data[sector]['total_units'] += record.units_sold
-                    sector_data[sector]['growth_rates'].append(record.growth_rate)
-                    sector_data[sector]['market_shares'].append(record.market_share)
+                metrics = sector_data[sector]
+                metrics['products'].add(sales_entry.product_id)
+                metrics['total_revenue'] = sum(sales_entry.revenues, metrics['total_revenue'])
+                metrics['total_units'] = sum(sales_entry.units, metrics['total_units'])
+                metrics['growth_rates'].extend(sales_entry.growth_rates)
+                metrics['market_shares'].extend(sales_entry.market_shares)
             
             # Calculate final metrics
             sector_performance = []
@@ -453,13 +739,17 @@ class SalesAnalyticsService:
     
     def get_trend_analysis(self, 
                           product_id: str,
-                          analysis_type: str = 'monthly') -> Dict[str, Any]:
+                          analysis_type: str = 'monthly',
+                          date_range: Optional[str] = None) -> Dict[str, Any]:
         """
         Get trend analysis for a specific product
         
         Args:
             product_id: Product ID to analyze
             analysis_type: Type of analysis ('monthly', 'quarterly', 'yearly')
+            date_range: Optional time period filter (latest_quarter, latest_year, etc.)
+                limiting which periods get trend points; growth rates and moving
+                averages still use the full history
             
         Returns:
             Trend analysis data
@@ -477,11 +767,22 @@ class SalesAnalyticsService:
                 all_records.extend(sales_entry.sales_records)
             
             # Sort by period
-            all_records.sort(key=lambda x: x.period)
+            all_records.sort(key=attrgetter('period'))
+            
+            # Column views so the moving averages reduce list slices in C
+            revenues = list(map(_get_revenue, all_records))
+            units = list(map(_get_units_sold, all_records))
+            
+            # Only build trend points from the first period in the date range
+            first_index = 0
+            start_period = self._get_time_period_start(date_range)
+            if start_period:
+                first_index = bisect_left([record.period for record in all_records], start_period)
             
             # Calculate advanced trends
             trend_data = []
-            for i, record in enumerate(all_records):
+            for i in range(first_index, len(all_records)):
+                record = all_records[i]
                 trend_point = {
                     'period': record.period,
                     'revenue': record.revenue,
@@ -510,19 +811,16 @@ class SalesAnalyticsService:
                 
                 # Calculate moving averages
                 if i >= 2:  # 3-month moving average
-                    recent_3 = all_records[max(0, i-2):i+1]
-                    trend_point['revenue_3ma'] = sum(r.revenue for r in recent_3) / len(recent_3)
-                    trend_point['units_3ma'] = sum(r.units_sold for r in recent_3) / len(recent_3)
+                    trend_point['revenue_3ma'] = sum(revenues[i-2:i+1]) / 3
+                    trend_point['units_3ma'] = sum(units[i-2:i+1]) / 3
                 
                 if i >= 5:  # 6-month moving average
-                    recent_6 = all_records[max(0, i-5):i+1]
-                    trend_point['revenue_6ma'] = sum(r.revenue for r in recent_6) / len(recent_6)
-                    trend_point['units_6ma'] = sum(r.units_sold for r in recent_6) / len(recent_6)
+                    trend_point['revenue_6ma'] = sum(revenues[i-5:i+1]) / 6
+                    trend_point['units_6ma'] = sum(units[i-5:i+1]) / 6
                 
                 if i >= 11:  # 12-month moving average
-                    recent_12 = all_records[max(0, i-11):i+1]
-                    trend_point['revenue_12ma'] = sum(r.revenue for r in recent_12) / len(recent_12)
-                    trend_point['units_12ma'] = sum(r.units_sold for r in recent_12) / len(recent_12)
+                    trend_point['revenue_12ma'] = sum(revenues[i-11:i+1]) / 12
+                    trend_point['units_12ma'] = sum(units[i-11:i+1]) / 12
                 
                 # Seasonal adjustment (simple method)
                 trend_point['seasonal_adjusted_revenue'] = self._calculate_seasonal_adjustment(all_records, i, 'revenue')
@@ -533,7 +831,7 @@ class SalesAnalyticsService:
             # Calculate overall trend metrics
             if len(all_records) >= 2:
                 total_growth = ((all_records[-1].revenue - all_records[0].revenue) / all_records[0].revenue) * 100
-                avg_monthly_growth = sum(r.growth_rate for r in all_records) / len(all_records)
+                avg_monthly_growth = sum(map(_get_growth_rate, all_records)) / len(all_records)
             else:
                 total_growth = 0
                 avg_monthly_growth = 0
@@ -592,29 +890,29 @@ class SalesAnalyticsService:
                 entry_complete = True
                 
                 # Check main fields
-                for field in required_fields:
-                    if not hasattr(entry, field) or getattr(entry, field) is None:
+                for field_name in required_fields:
+                    if not hasattr(entry, field_name) or getattr(entry, field_name) is None:
                         validation_results['metrics']['missing_fields'] += 1
-                        validation_results['issues'].append(f"Missing {field} in product {getattr(entry, 'product_id', 'unknown')}")
+                        validation_results['issues'].append(f"Missing {field_name} in product {getattr(entry, 'product_id', 'unknown')}")
                         entry_complete = False
                 
                 # Check sales records
                 for record in entry.sales_records:
-                    for field in sales_record_fields:
-                        if not hasattr(record, field) or getattr(record, field) is None:
+                    for field_name in sales_record_fields:
+                        if not hasattr(record, field_name) or getattr(record, field_name) is None:
                             validation_results['metrics']['missing_fields'] += 1
-                            validation_results['issues'].append(f"Missing {field} in sales record for {entry.product_id}")
+                            validation_results['issues'].append(f"Missing {field_name} in sales record for {entry.product_id}")
                             entry_complete = False
                         
                         # Validate specific field types
-                        if field in ['units_sold'] and hasattr(record, field):
-                            if getattr(record, field) < 0:
+                        if field_name in ['units_sold'] and hasattr(record, field_name):
+                            if getattr(record, field_name) < 0:
                                 validation_results['metrics']['invalid_values'] += 1
                                 validation_results['issues'].append(f"Negative units_sold in {entry.product_id}")
                                 entry_complete = False
                         
-                        if field in ['revenue'] and hasattr(record, field):
-                            if getattr(record, field) < 0:
+                        if field_name in ['revenue'] and hasattr(record, field_name):
+                            if getattr(record, field_name) < 0:
                                 validation_results['metrics']['invalid_values'] += 1
                                 validation_results['issues'].append(f"Negative revenue in {entry.product_id}")
                                 entry_complete = False
@@ -679,13 +977,19 @@ class SalesAnalyticsService:
         
         return current_value
     
-    def get_sector_analysis_advanced(self, region: Optional[str] = None, time_period: Optional[str] = None) -> Dict[str, Any]:
+    def get_sector_analysis_advanced(self,
+                                     region: Optional[str] = None,
+                                     time_period: Optional[str] = None,
+                                     sectors_whitelist: Optional[AbstractSet[str]] = None) -> Dict[str, Any]:
         """
         Get advanced sector analysis with rankings, market share, and growth rates
         
         Args:
             region: Optional region filter
             time_period: Optional time period filter (latest_quarter, latest_year, etc.)
+            sectors_whitelist: Optional set of sectors to analyze in full; other
+                sectors only contribute their revenue to market penetration and
+                ranking, and are left out of the returned sectors
             
         Returns:
             Advanced sector analysis data
@@ -696,8 +1000,21 @@ class SalesAnalyticsService:
             
             # Group by sector
             sector_data = {}
+            sector_revenue = {}  # Revenue of every sector, in first-seen order
             for sales_entry in filtered_data:
                 sector = sales_entry.sector
+                
+                if sectors_whitelist is not None and sector not in sectors_whitelist:
+                    # Skip the full accumulation; only the revenue total is needed
+                    if time_period:
+                        revenue = sum(record.revenue for record in sales_entry.sales_records
+                                      if self._is_in_time_period(record.period, time_period))
+                    else:
+                        revenue = sum(sales_entry.revenues)
+                    sector_revenue[sector] = sector_revenue.get(sector, 0) + revenue
+                    continue
+                
+                sector_revenue.setdefault(sector, 0)
                 if sector not in sector_data:
                     sector_data[sector] = {
                         'total_revenue': 0,
@@ -729,9 +1046,12 @@ class SalesAnalyticsService:
                     sector_data[sector]['monthly_revenue'][record.period] += record.revenue
                     sector_data[sector]['monthly_units'][record.period] += record.units_sold
             
+            for sector, metrics in sector_data.items():
+                sector_revenue[sector] = metrics['total_revenue']
+            
             # Calculate sector metrics and rankings
             sector_performance = []
-            total_market_revenue = sum(metrics['total_revenue'] for metrics in sector_data.values())
+            total_market_revenue = sum(sector_revenue.values())
             
             for sector, metrics in sector_data.items():
                 avg_growth = sum(metrics['growth_rates']) / len(metrics['growth_rates']) if metrics['growth_rates'] else 0
@@ -760,10 +1080,17 @@ class SalesAnalyticsService:
                     'performance_ranking': 0  # Will be set after sorting
                 })
             
-            # Sort and rank sectors
+            # Sort and rank sectors (ranking is relative to every sector in
+            # the market, including those outside the whitelist)
             sector_performance.sort(key=lambda x: x['total_revenue'], reverse=True)
-            for i, sector in enumerate(sector_performance):
-                sector['performance_ranking'] = i + 1
+            if sectors_whitelist is None:
+                for i, sector in enumerate(sector_performance):
+                    sector['performance_ranking'] = i + 1
+            else:
+                ranked_sectors = sorted(sector_revenue, key=lambda name: round(sector_revenue[name], 2), reverse=True)
+                rankings = {name: i + 1 for i, name in enumerate(ranked_sectors)}
+                for sector in sector_performance:
+                    sector['performance_ranking'] = rankings[sector['sector']]
             
             return {
                 'sectors': sector_performance,
@@ -820,6 +1147,28 @@ class SalesAnalyticsService:
         except:
             return True
     
+    def _get_time_period_start(self, time_period_filter: Optional[str]) -> Optional[str]:
+        """
+        Resolve a time period filter to the earliest period (YYYY-MM) it includes,
+        matching _is_in_time_period
+        
+        Args:
+            time_period_filter: Time period filter (latest_quarter, latest_year, etc.)
+            
+        Returns:
+            First included period, or None if the filter includes every period
+        """
+        days = {'latest_quarter': 90, 'latest_year': 365, 'latest_6_months': 180}.get(time_period_filter)
+        if days is None:
+            return None
+        
+        cutoff_date = datetime.now() - timedelta(days=days)
+        start_date = datetime(cutoff_date.year, cutoff_date.month, 1)
+        if start_date < cutoff_date:
+            # The cutoff month started before the cutoff; begin with the next month
+            start_date = datetime(cutoff_date.year + cutoff_date.month // 12, cutoff_date.month % 12 + 1, 1)
+        return start_date.strftime('%Y-%m')
+    
     def get_product_performance_analytics(self, 
                                         sector: Optional[str] = None, 
                                         region: Optional[str] = None,
@@ -870,11 +1219,13 @@ class SalesAnalyticsService:
                 product_metrics[product_id]['sectors'].add(sales_entry.sector)
                 product_metrics[product_id]['regions'].add(sales_entry.region)
                 
+                metrics = product_metrics[product_id]
+                metrics['total_revenue'] = sum(sales_entry.revenues, metrics['total_revenue'])
+                metrics['total_units'] = sum(sales_entry.units, metrics['total_units'])
+                metrics['growth_rates'].extend(sales_entry.growth_rates)
+                metrics['market_shares'].extend(sales_entry.market_shares)
+                
                 for record in sales_entry.sales_records:
-                    product_metrics[product_id]['total_revenue'] += record.revenue
-                    product_metrics[product_id]['total_units'] += record.units_sold
-                    product_metrics[product_id]['growth_rates'].append(record.growth_rate)
-                    product_metrics[product_id]['market_shares'].append(record.market_share)
                     product_metrics[product_id]['monthly_data'].append({
                         'period': record.period,
                         'revenue': record.revenue,
@@ -915,12 +1266,17 @@ class SalesAnalyticsService:
             # Create performance lists
             product_list = list(product_metrics.values())
             
-            # Top performers by revenue
-            top_performers = sorted(product_list, key=lambda x: x['total_revenue'], reverse=True)[:limit]
-            
-            # Bottom performers by revenue (excluding zero revenue)
-            bottom_performers = sorted([p for p in product_list if p['total_revenue'] > 0], 
-                                     key=lambda x: x['total_revenue'])[:limit]
+            # Top performers by revenue (heap selection only applies to a
+            # positive limit; others keep the slicing semantics)
+            get_total_revenue = itemgetter('total_revenue')
+            revenue_products = [p for p in product_list if p['total_revenue'] > 0]
+            if limit > 0:
+                top_performers = heapq.nlargest(limit, product_list, key=get_total_revenue)
+                # Bottom performers by revenue (excluding zero revenue)
+                bottom_performers = heapq.nsmallest(limit, revenue_products, key=get_total_revenue)
+            else:
+                top_performers = sorted(product_list, key=get_total_revenue, reverse=True)[:limit]
+                bottom_performers = sorted(revenue_products, key=get_total_revenue)[:limit]
             
             # Lifecycle analysis
             lifecycle_analysis = self._analyze_product_lifecycles(product_list)
@@ -1041,10 +1397,10 @@ class SalesAnalyticsService:
                     'periods': 0
                 }
             
-            for record in sales_entry.sales_records:
-                product_sector_performance[product_id][sector]['revenue'] += record.revenue
-                product_sector_performance[product_id][sector]['units'] += record.units_sold
-                product_sector_performance[product_id][sector]['periods'] += 1
+            performance = product_sector_performance[product_id][sector]
+            performance['revenue'] = sum(sales_entry.revenues, performance['revenue'])
+            performance['units'] = sum(sales_entry.units, performance['units'])
+            performance['periods'] += len(sales_entry.periods)
         
         # Find products with multi-sector presence
         multi_sector_products = {}
@@ -1066,6 +1422,72 @@ class SalesAnalyticsService:
             } if product_sector_performance else {}
         }
     
+    def get_cross_sector(self, product_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a product's revenue, units and growth broken down by sector
+        
+        Args:
+            product_id: Product to analyze
+            
+        Returns:
+            Cross-sector performance for the product, or None if not found
+        """
+        self._load_data()
+        return self._cross_sector_cache(product_id)
+    
+    def _compute_cross_sector(self, product_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Compute cross-sector performance for a product (cached by get_cross_sector)
+        
+        Args:
+            product_id: Product to analyze
+            
+        Returns:
+            Cross-sector performance for the product, or None if not found
+        """
+        if not self.data:
+            return None
+        
+        # Use the product index rather than scanning every entry
+        sales_data = self.data['sales_data']
+        filtered_data = [sales_data[i] for i in self._product_index.get(product_id, ())]
+        if not filtered_data:
+            return None
+        
+        cross_sector_data = {}
+        growth_sums = {}
+        for sales_entry in filtered_data:
+            sector = sales_entry.sector
+            if sector not in cross_sector_data:
+                cross_sector_data[sector] = {
+                    'revenue': 0,
+                    'units': 0,
+                    'growth_rates': []
+                }
+                growth_sums[sector] = 0
+            
+            # Reduce each entry's columns instead of a per-record Python
+            # loop; the running total is passed as the start value so the
+            # summation order is unchanged
+            data = cross_sector_data[sector]
+            data['revenue'] = sum(sales_entry.revenues, data['revenue'])
+            data['units'] = sum(sales_entry.units, data['units'])
+            data['growth_rates'].extend(sales_entry.growth_rates)
+            growth_sums[sector] = sum(sales_entry.growth_rates, growth_sums[sector])
+        
+        # Calculate averages for each sector from the running sums
+        for sector, data in cross_sector_data.items():
+            data['average_growth_rate'] = growth_sums[sector] / len(data['growth_rates']) if data['growth_rates'] else 0
+            data['revenue_per_unit'] = data['revenue'] / data['units'] if data['units'] > 0 else 0
+        
+        return {
+            'cross_sector_performance': cross_sector_data,
+            'sector_count': len(cross_sector_data),
+            'best_performing_sector': max(cross_sector_data.items(), key=lambda x: x[1]['revenue'])[0] if cross_sector_data else None,
+            'total_revenue': sum(data['revenue'] for data in cross_sector_data.values()),
+            'total_units': sum(data['units'] for data in cross_sector_data.values())
+        }
+    
     def _analyze_revenue_vs_units(self, product_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Analyze revenue vs units sold relationship
@@ -1162,31 +1584,15 @@ class SalesAnalyticsService:
             # Calculate aggregations
             aggregation_results = self._calculate_aggregations(filtered_data, aggregations)
             
-            # Prepare results data structure
-            results = []
-            for sales_entry in filtered_data:
-                entry_data = {
-                    'product_id': sales_entry.product_id,
-                    'company': sales_entry.company,
-                    'sector': sales_entry.sector,
-                    'region': sales_entry.region,
-                    'total_revenue': sum(r.revenue for r in sales_entry.sales_records),
-                    'total_units': sum(r.units_sold for r in sales_entry.sales_records),
-                    'average_growth_rate': sum(r.growth_rate for r in sales_entry.sales_records) / len(sales_entry.sales_records) if sales_entry.sales_records else 0,
-                    'average_market_share': sum(r.market_share for r in sales_entry.sales_records) / len(sales_entry.sales_records) if sales_entry.sales_records else 0,
-                    'record_count': len(sales_entry.sales_records)
-                }
-                results.append(entry_data)
-            
-            # Sort results
-            if sort_by in ['revenue', 'total_revenue']:
-                results.sort(key=lambda x: x['total_revenue'], reverse=True)
-            elif sort_by in ['units', 'total_units']:
-                results.sort(key=lambda x: x['total_units'], reverse=True)
-            elif sort_by == 'growth_rate':
-                results.sort(key=lambda x: x['average_growth_rate'], reverse=True)
-            elif sort_by == 'market_share':
-                results.sort(key=lambda x: x['average_market_share'], reverse=True)
+            # Prepare results data structure, sorting while materializing;
+            # a small limit only needs a partial (heap) selection of the top rows
+            sort_key = _RESULT_SORT_KEYS.get(sort_by)
+            if sort_key and limit and 0 < limit < len(filtered_data) // 4:
+                results = heapq.nlargest(limit, self.iter_query_rows(filtered_data), key=sort_key)
+            elif sort_key:
+                results = sorted(self.iter_query_rows(filtered_data), key=sort_key, reverse=True)
+            else:
+                results = list(self.iter_query_rows(filtered_data))
             
             # Apply limit
             if limit:
@@ -1216,6 +1622,29 @@ class SalesAnalyticsService:
             logger.error(f"Error in advanced multi-dimensional query: {e}")
             raise
     
+    def iter_query_rows(self, sales_entries: List[SalesData]):
+        """
+        Lazily build advanced-query result rows, one per sales entry
+        
+        Args:
+            sales_entries: Sales entries to summarize (e.g. from _apply_indexed_filters)
+            
+        Yields:
+            Row dicts with per-entry totals and averages
+        """
+        for sales_entry in sales_entries:
+            yield {
+                'product_id': sales_entry.product_id,
+                'company': sales_entry.company,
+                'sector': sales_entry.sector,
+                'region': sales_entry.region,
+                'total_revenue': sales_entry.total_revenue,
+                'total_units': sales_entry.total_units,
+                'average_growth_rate': sales_entry.total_growth_rate / len(sales_entry.growth_rates) if sales_entry.growth_rates else 0,
+                'average_market_share': sales_entry.total_market_share / len(sales_entry.market_shares) if sales_entry.market_shares else 0,
+                'record_count': len(sales_entry.sales_records)
+            }
+    
     def _apply_indexed_filters(self, sales_data: List[SalesData], filters: Dict[str, Any]) -> List[SalesData]:
         """
         Apply filters using built indexes for performance
@@ -1227,84 +1656,50 @@ class SalesAnalyticsService:
         Returns:
             Filtered sales data
         """
-        # Start with all data indexes
-        candidate_indexes = set(range(len(sales_data)))
-        
-        # Apply product filter using index
-        if 'product_id' in filters or 'product_ids' in filters:
-            product_ids = filters.get('product_ids', [filters.get('product_id')]) if 'product_ids' in filters else [filters.get('product_id')]
-            product_indexes = set()
-            for product_id in product_ids:
-                if product_id and product_id in self._product_index:
-                    product_indexes.update(self._product_index[product_id])
-            candidate_indexes = candidate_indexes.intersection(product_indexes)
-        
-        # Apply sector filter using index
-        if 'sector' in filters or 'sectors' in filters:
-            sectors = filters.get('sectors', [filters.get('sector')]) if 'sectors' in filters else [filters.get('sector')]
-            sector_indexes = set()
-            for sector in sectors:
-                if sector and sector in self._sector_index:
-                    sector_indexes.update(self._sector_index[sector])
-            candidate_indexes = candidate_indexes.intersection(sector_indexes)
-        
-        # Apply region filter using index
-        if 'region' in filters or 'regions' in filters:
-            regions = filters.get('regions', [filters.get('region')]) if 'regions' in filters else [filters.get('region')]
-            region_indexes = set()
-            for region in regions:
-                if region and region in self._region_index:
-                    region_indexes.update(self._region_index[region])
-            candidate_indexes = candidate_indexes.intersection(region_indexes)
-        
-        # Apply custom date range filters
-        if 'date_range_start' in filters or 'date_range_end' in filters:
-            date_start = filters.get('date_range_start')
-            date_end = filters.get('date_range_end')
-            
-            if date_start or date_end:
-                date_filtered_indexes = set()
-                for period, period_data in self._period_index.items():
-                    if date_start and period < date_start:
-                        continue
-                    if date_end and period > date_end:
-                        continue
-                    
-                    for entry_index, record in period_data:
-                        date_filtered_indexes.add(entry_index)
-                
-                candidate_indexes = candidate_indexes.intersection(date_filtered_indexes)
+        # Start with every entry selected
+        candidate_mask = (1 << len(sales_data)) - 1
+        
+        # Apply product, sector and region filters by OR-ing the value masks
+        for single_key, multi_key, value_masks in (
+                ('product_id', 'product_ids', self._product_masks),
+                ('sector', 'sectors', self._sector_masks),
+                ('region', 'regions', self._region_masks)):
+            if single_key in filters or multi_key in filters:
+                values = filters.get(multi_key) if multi_key in filters else [filters.get(single_key)]
+                dimension_mask = 0
+                for value in values:
+                    if value:
+                        dimension_mask |= value_masks.get(value, 0)
+                candidate_mask &= dimension_mask
+        
+        # Apply custom date range filters over the sorted periods
+        date_start = filters.get('date_range_start')
+        date_end = filters.get('date_range_end')
+        if date_start or date_end:
+            low = bisect_left(self._period_keys, date_start) if date_start else 0
+            high = bisect_right(self._period_keys, date_end) if date_end else len(self._period_keys)
+            date_mask = 0
+            for period_mask in self._period_masks[low:high]:
+                date_mask |= period_mask
+            candidate_mask &= date_mask
+        
+        filtered_data = [sales_data[i] for i in _iter_mask_indexes(candidate_mask)]
         
         # Apply revenue range filters
         if 'min_revenue' in filters or 'max_revenue' in filters:
             min_revenue = filters.get('min_revenue', 0)
             max_revenue = filters.get('max_revenue', float('inf'))
-            
-            revenue_filtered_indexes = set()
-            for i in candidate_indexes:
-                entry = sales_data[i]
-                total_revenue = sum(r.revenue for r in entry.sales_records)
-                if min_revenue <= total_revenue <= max_revenue:
-                    revenue_filtered_indexes.add(i)
-            
-            candidate_indexes = revenue_filtered_indexes
+            filtered_data = [entry for entry in filtered_data
+                             if min_revenue <= entry.total_revenue <= max_revenue]
         
         # Apply units range filters
         if 'min_units' in filters or 'max_units' in filters:
             min_units = filters.get('min_units', 0)
             max_units = filters.get('max_units', float('inf'))
-            
-            units_filtered_indexes = set()
-            for i in candidate_indexes:
-                entry = sales_data[i]
-                total_units = sum(r.units_sold for r in entry.sales_records)
-                if min_units <= total_units <= max_units:
-                    units_filtered_indexes.add(i)
-            
-            candidate_indexes = units_filtered_indexes
+            filtered_data = [entry for entry in filtered_data
+                             if min_units <= entry.total_units <= max_units]
         
-        # Return filtered data
-        return [sales_data[i] for i in sorted(candidate_indexes)]
+        return filtered_data
     
     def _calculate_aggregations(self, filtered_data: List[SalesData], aggregations: List[str]) -> Dict[str, Any]:
         """
@@ -1322,38 +1717,49 @@ class SalesAnalyticsService:
         if not filtered_data:
             return {agg: 0 for agg in aggregations}
         
-        # Collect all values for calculations
-        revenues = []
-        units = []
-        growth_rates = []
-        market_shares = []
+        # Combine the per-entry partial reductions in one pass
+        record_count = 0
+        revenue_sum = 0
+        units_sum = 0
+        growth_sum = 0
+        share_sum = 0
+        revenue_min = units_min = float('inf')
+        revenue_max = units_max = float('-inf')
         
         for entry in filtered_data:
-            for record in entry.sales_records:
-                revenues.append(record.revenue)
-                units.append(record.units_sold)
-                growth_rates.append(record.growth_rate)
-                market_shares.append(record.market_share)
+            if entry.revenue_range is None:
+                continue
+            record_count += len(entry.revenues)
+            revenue_sum += entry.total_revenue
+            units_sum += entry.total_units
+            growth_sum += entry.total_growth_rate
+            share_sum += entry.total_market_share
+            low, high = entry.revenue_range
+            revenue_min = min(revenue_min, low)
+            revenue_max = max(revenue_max, high)
+            low, high = entry.units_range
+            units_min = min(units_min, low)
+            units_max = max(units_max, high)
         
         # Calculate aggregations
         for agg in aggregations:
             if agg == 'sum':
-                results['sum_revenue'] = sum(revenues)
-                results['sum_units'] = sum(units)
+                results['sum_revenue'] = revenue_sum
+                results['sum_units'] = units_sum
             elif agg == 'avg':
-                results['avg_revenue'] = sum(revenues) / len(revenues) if revenues else 0
-                results['avg_units'] = sum(units) / len(units) if units else 0
-                results['avg_growth_rate'] = sum(growth_rates) / len(growth_rates) if growth_rates else 0
-                results['avg_market_share'] = sum(market_shares) / len(market_shares) if market_shares else 0
+                results['avg_revenue'] = revenue_sum / record_count if record_count else 0
+                results['avg_units'] = units_sum / record_count if record_count else 0
+                results['avg_growth_rate'] = growth_sum / record_count if record_count else 0
+                results['avg_market_share'] = share_sum / record_count if record_count else 0
             elif agg == 'count':
-                results['count_records'] = len(revenues)
+                results['count_records'] = record_count
                 results['count_products'] = len(filtered_data)
             elif agg == 'min':
-                results['min_revenue'] = min(revenues) if revenues else 0
-                results['min_units'] = min(units) if units else 0
+                results['min_revenue'] = revenue_min if record_count else 0
+                results['min_units'] = units_min if record_count else 0
             elif agg == 'max':
-                results['max_revenue'] = max(revenues) if revenues else 0
-                results['max_units'] = max(units) if units else 0
+                results['max_revenue'] = revenue_max if record_count else 0
+                results['max_units'] = units_max if record_count else 0
         
         return results
     
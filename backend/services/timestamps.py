@@ -0,0 +1,22 @@
+"""
+Cheap "now" timestamps for API payloads
+Responses only report timestamps to the second, so the ISO string is
+formatted once per second and shared by every caller within it
+"""
+
+import time
+from datetime import datetime
+
+# (epoch second, ISO timestamp) of the last now_iso() call
+_now_iso_cache = (None, '')
+
+
+def now_iso() -> str:
+    """Current local time as an ISO timestamp at one-second resolution, formatted once per second"""
+    global _now_iso_cache
+    second = int(time.time())
+    cached_second, formatted = _now_iso_cache
+    if cached_second != second:
+        formatted = datetime.fromtimestamp(second).isoformat()
+        _now_iso_cache = (second, formatted)
+    return formatted
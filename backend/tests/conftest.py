@@ -0,0 +1,12 @@
+"""
+Shared pytest setup: make the backend modules (app, services.*) importable
+when the suite is run from the repository root or from backend/
+"""
+
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
@@ -0,0 +1,21 @@
+"""
+Tests for the AI competitive analysis payload
+"""
+
+import json
+
+from services.ai_competitive_analysis_service import AICompetitiveAnalysisService
+
+
+def test_competitive_position_is_plain_json_data():
+    service = AICompetitiveAnalysisService()
+    company_data = {'products': [{'category': 'Point of Sale'}, {'category': 'Analytics'}]}
+
+    analysis = service.get_real_time_competitive_position('Jeemly', 'Point of Sale Software', company_data)
+
+    competitors = analysis['competitors']
+    assert competitors
+    assert all(type(competitor) is dict for competitor in competitors)
+    assert sorted(competitors[0].get('overlap_categories')) == ['Analytics', 'Point of Sale']
+    # Serializable without orjson, as callers outside the Flask app may do
+    assert json.loads(json.dumps(analysis))['competitors'] == competitors
@@ -0,0 +1,59 @@
+"""
+Tests for Flask route behaviour that the service tests don't cover
+"""
+
+import importlib
+
+import diskcache
+import pytest
+
+from conftest import BACKEND_DIR
+
+
+@pytest.fixture
+def backend_app(monkeypatch):
+    # app.py opens its data files relative to the backend directory at import
+    monkeypatch.chdir(BACKEND_DIR)
+    return importlib.import_module('app')
+
+
+@pytest.fixture
+def client(backend_app, monkeypatch, tmp_path):
+    # Keep advanced-query results out of the shared on-disk cache
+    monkeypatch.setattr(backend_app, '_query_cache', diskcache.Cache(str(tmp_path / 'qcache')))
+    return backend_app.app.test_client()
+
+
+def test_bulk_market_intelligence_error_is_a_500(backend_app, client, monkeypatch):
+    market_service = backend_app.get_market_service()
+
+    def fail(industries, company_name=None):
+        raise RuntimeError("upstream unavailable")
+
+    monkeypatch.setattr(market_service.ai_market_intelligence, 'get_real_time_market_analysis_bulk', fail)
+
+    response = client.post('/api/ai-market-intelligence/bulk',
+                           json={'industries': ['Point of Sale Software', 'Restaurant Technology']})
+
+    assert response.status_code == 500
+    body = response.get_json()
+    assert body['error'] == 'upstream unavailable'
+    assert body['message'] == 'Failed to get AI market intelligence'
+    assert 'industries' not in body
+
+
+def test_bulk_market_intelligence_requires_industry_list(client):
+    response = client.post('/api/ai-market-intelligence/bulk', json={'industries': 'Retail'})
+    assert response.status_code == 400
+
+
+def test_advanced_query_limit_zero_means_no_limit(client):
+    query = {'filters': {'sectors': ['Retail', 'Hospitality', 'Healthcare']}}
+    unlimited = client.post('/api/sales/advanced-query', json=query).get_json()
+
+    response = client.post('/api/sales/advanced-query', json={**query, 'limit': 0})
+    assert response.status_code == 200
+    assert response.get_json()['results'] == unlimited['results']
+    assert unlimited['total_count'] > 1
+
+    assert client.post('/api/sales/advanced-query', json={**query, 'limit': -1}).status_code == 400
@@ -0,0 +1,104 @@
+"""
+Tests for the AIMD concurrency limiter
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from services.concurrency_limit import AIMDLimiter
+
+
+@pytest.fixture
+def executor():
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        yield pool
+
+
+def _wait_idle(limiter, timeout=1.0):
+    """Wait for every done callback to release its slot (they run after result() returns)"""
+    with limiter._condition:
+        assert limiter._condition.wait_for(lambda: limiter.in_flight == 0, timeout)
+
+
+def test_fast_success_increases_limit(executor):
+    limiter = AIMDLimiter(initial_limit=3, max_limit=5)
+
+    # The first success has no average to beat
+    assert limiter.submit(executor, lambda: 'ok').result(1.0) == 'ok'
+    _wait_idle(limiter)
+    assert limiter.limit == 4
+    assert limiter._avg_latency is not None
+
+    for expected_limit in (5, 5):
+        limiter._avg_latency = 1.0  # Comfortably slower than a no-op task
+        assert limiter.submit(executor, lambda: 'ok').result(1.0) == 'ok'
+        _wait_idle(limiter)
+        assert limiter.limit == expected_limit
+
+
+def test_success_slower_than_average_keeps_limit(executor):
+    limiter = AIMDLimiter(initial_limit=3)
+    limiter._avg_latency = 0.0
+
+    assert limiter.submit(executor, time.sleep, 0.01).result(1.0) is None
+    _wait_idle(limiter)
+    assert limiter.limit == 3
+    assert limiter._avg_latency > 0.0
+
+
+def test_failure_halves_limit(executor):
+    limiter = AIMDLimiter(initial_limit=8, min_limit=2)
+
+    def fail():
+        raise RuntimeError("source down")
+
+    for expected_limit in (4, 2, 2):
+        future = limiter.submit(executor, fail)
+        with pytest.raises(RuntimeError):
+            future.result(1.0)
+        _wait_idle(limiter)
+        assert limiter.limit == expected_limit
+
+
+def test_over_budget_latency_halves_limit(executor):
+    limiter = AIMDLimiter(initial_limit=8, latency_budget=0.01)
+
+    assert limiter.submit(executor, time.sleep, 0.05).result(1.0) is None
+    _wait_idle(limiter)
+    assert limiter.limit == 4
+
+
+def test_rejects_when_no_slot_frees_in_time(executor):
+    limiter = AIMDLimiter(initial_limit=2, min_limit=1)
+    release = threading.Event()
+    blockers = [limiter.submit(executor, release.wait, 5.0) for _ in range(2)]
+    assert limiter.in_flight == 2
+
+    started = time.monotonic()
+    rejected = limiter.submit(executor, lambda: 'never runs', acquire_timeout=0.05)
+    assert time.monotonic() - started < 1.0
+    assert isinstance(rejected.exception(0), TimeoutError)
+    assert limiter.limit == 1
+    # The rejected task never took a slot
+    assert limiter.in_flight == 2
+
+    release.set()
+    for blocker in blockers:
+        assert blocker.result(1.0) is True
+    _wait_idle(limiter)
+
+
+def test_waiting_task_is_admitted_when_a_slot_frees(executor):
+    limiter = AIMDLimiter(initial_limit=1, min_limit=1)
+    release = threading.Event()
+    blocker = limiter.submit(executor, release.wait, 5.0)
+
+    threading.Timer(0.05, release.set).start()
+    admitted = limiter.submit(executor, lambda: 'admitted', acquire_timeout=2.0)
+
+    assert admitted.result(1.0) == 'admitted'
+    assert blocker.result(1.0) is True
+    _wait_idle(limiter)
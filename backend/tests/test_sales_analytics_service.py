@@ -0,0 +1,258 @@
+"""
+Tests for SalesAnalyticsService filtering, cache invalidation and the analytics cache
+"""
+
+import math
+import random
+import time
+
+import orjson
+import pytest
+
+from services.sales_analytics_service import (
+    AnalyticsCache, SalesAnalyticsService, SalesData, SalesRecord, _positions_to_mask
+)
+
+PRODUCTS = [f"product-{i}" for i in range(12)]
+SECTORS = ['Retail', 'Hospitality', 'Healthcare', 'Finance']
+REGIONS = ['Nordic', 'Baltic', 'DACH']
+PERIODS = [f"{year}-{month:02d}" for year in (2023, 2024) for month in range(1, 13)]
+
+
+def _make_sales_data(rng, entry_count=120):
+    """Random sales entries covering every filter dimension"""
+    sales_data = []
+    for _ in range(entry_count):
+        periods = sorted(rng.sample(PERIODS, rng.randint(1, 6)))
+        sales_data.append({
+            'product_id': rng.choice(PRODUCTS),
+            'company': 'Example',
+            'sector': rng.choice(SECTORS),
+            'region': rng.choice(REGIONS),
+            'sales_records': [{
+                'period': period,
+                'units_sold': rng.randint(0, 500),
+                'revenue': rng.randint(0, 50000),
+                'currency': 'EUR',
+                'growth_rate': rng.uniform(-10, 30),
+                'market_share': rng.uniform(0, 20)
+            } for period in periods],
+            'metadata': {}
+        })
+    return {'schema_version': '1.0', 'metadata': {}, 'sales_data': sales_data}
+
+
+@pytest.fixture
+def service(tmp_path):
+    data_file = tmp_path / 'sales_data.json'
+    data_file.write_bytes(orjson.dumps(_make_sales_data(random.Random(1234))))
+    return SalesAnalyticsService(str(data_file))
+
+
+def _random_filters(rng):
+    """Random combination of the filters _apply_indexed_filters understands"""
+    filters = {}
+    for single_key, multi_key, values in (('product_id', 'product_ids', PRODUCTS),
+                                          ('sector', 'sectors', SECTORS),
+                                          ('region', 'regions', REGIONS)):
+        choice = rng.random()
+        if choice < 0.25:
+            filters[single_key] = rng.choice(values + ['unknown'])
+        elif choice < 0.5:
+            filters[multi_key] = rng.sample(values + ['unknown', ''], rng.randint(0, 3))
+    if rng.random() < 0.4:
+        filters['date_range_start'] = rng.choice(PERIODS + ['2022-06', '2025-01'])
+    if rng.random() < 0.4:
+        filters['date_range_end'] = rng.choice(PERIODS + ['2022-06', '2025-01'])
+    if rng.random() < 0.3:
+        filters['min_revenue'] = rng.randint(0, 150000)
+    if rng.random() < 0.3:
+        filters['max_revenue'] = rng.randint(0, 250000)
+    if rng.random() < 0.3:
+        filters['min_units'] = rng.randint(0, 1500)
+    if rng.random() < 0.3:
+        filters['max_units'] = rng.randint(0, 2500)
+    return filters
+
+
+def _brute_force_filter(sales_data, filters):
+    """Reference implementation: test every entry against every filter directly"""
+    def matches(entry):
+        for single_key, multi_key, attribute in (('product_id', 'product_ids', 'product_id'),
+                                                 ('sector', 'sectors', 'sector'),
+                                                 ('region', 'regions', 'region')):
+            if single_key in filters or multi_key in filters:
+                values = filters[multi_key] if multi_key in filters else [filters[single_key]]
+                if getattr(entry, attribute) not in [value for value in values if value]:
+                    return False
+        date_start = filters.get('date_range_start')
+        date_end = filters.get('date_range_end')
+        if date_start or date_end:
+            if not any((not date_start or record.period >= date_start) and
+                       (not date_end or record.period <= date_end)
+                       for record in entry.sales_records):
+                return False
+        total_revenue = sum(record.revenue for record in entry.sales_records)
+        if not filters.get('min_revenue', 0) <= total_revenue <= filters.get('max_revenue', float('inf')):
+            return False
+        total_units = sum(record.units_sold for record in entry.sales_records)
+        if not filters.get('min_units', 0) <= total_units <= filters.get('max_units', float('inf')):
+            return False
+        return True
+
+    return [entry for entry in sales_data if matches(entry)]
+
+
+def test_indexed_filters_match_brute_force(service):
+    sales_data = service.data['sales_data']
+    rng = random.Random(99)
+    non_empty = 0
+
+    for _ in range(500):
+        filters = _random_filters(rng)
+        expected = _brute_force_filter(sales_data, filters)
+        actual = service._apply_indexed_filters(sales_data, filters)
+        assert [id(entry) for entry in actual] == [id(entry) for entry in expected], filters
+        non_empty += bool(expected)
+
+    # The random filters must actually select something most of the time
+    assert non_empty > 100
+
+
+def test_positions_to_mask_sets_exactly_those_bits():
+    rng = random.Random(7)
+    for size in (0, 1, 7, 8, 9, 64, 1000):
+        positions = rng.sample(range(size), size // 2) if size else []
+        expected = 0
+        for i in positions:
+            expected |= 1 << i
+        # Repeated positions (an entry with several records in one period) are harmless
+        assert _positions_to_mask(positions + positions[:3]) == expected
+
+
+def test_indexed_filters_without_filters_return_everything(service):
+    sales_data = service.data['sales_data']
+    assert service._apply_indexed_filters(sales_data, {}) == sales_data
+
+
+def _make_entry(records):
+    return SalesData(product_id='p', company='c', sector='s', region='r',
+                     sales_records=records, metadata={})
+
+
+def test_narrow_columns_match_wide_aggregates():
+    rng = random.Random(42)
+    for _ in range(200):
+        whole_revenues = rng.random() < 0.5
+        records = [SalesRecord(
+            period=f"2024-{month:02d}",
+            units_sold=rng.randint(0, 2**31 - 1),
+            revenue=rng.randint(0, 10**9) if whole_revenues else rng.uniform(0, 1e9),
+            currency='EUR',
+            growth_rate=rng.uniform(-50, 50),
+            market_share=rng.uniform(0, 100)
+        ) for month in range(1, rng.randint(2, 13))]
+        entry = _make_entry(records)
+
+        # Wide path: Python ints and float64 straight from the records
+        wide_revenue = sum(record.revenue for record in records)
+        wide_units = sum(record.units_sold for record in records)
+        assert entry.units.typecode == 'i'
+        assert entry.total_units == wide_units
+        assert entry.units_range == (min(r.units_sold for r in records), max(r.units_sold for r in records))
+        assert type(entry.total_revenue) is type(wide_revenue)
+        assert math.isclose(entry.total_revenue, wide_revenue, rel_tol=1e-12)
+        assert math.isclose(entry.total_growth_rate, sum(r.growth_rate for r in records), rel_tol=1e-12, abs_tol=1e-9)
+        assert math.isclose(entry.total_market_share, sum(r.market_share for r in records), rel_tol=1e-12)
+
+
+def test_unit_counts_beyond_32_bits_use_a_wide_column(tmp_path):
+    big_units = 2**31 + 5
+    entry = _make_entry([SalesRecord('2024-01', big_units, 100, 'EUR', 1.0, 1.0),
+                         SalesRecord('2024-02', 1, 200, 'EUR', 1.0, 1.0)])
+    assert entry.units.typecode == 'q'
+    assert entry.total_units == big_units + 1
+    assert entry.units_range == (1, big_units)
+
+    # The service keeps such an entry instead of dropping it on overflow
+    raw = _make_sales_data(random.Random(5), entry_count=3)
+    raw['sales_data'][0]['sales_records'][0]['units_sold'] = big_units
+    data_file = tmp_path / 'sales_data.json'
+    data_file.write_bytes(orjson.dumps(raw))
+    service = SalesAnalyticsService(str(data_file))
+    assert len(service.data['sales_data']) == 3
+    assert service.data['sales_data'][0].units_range[1] == big_units
+
+
+def test_invalidation_within_cooldown_is_deferred(service):
+    assert service.invalidate_cache() is True
+    generation = service._generation
+
+    assert service.invalidate_cache() is False
+    assert service.get_invalidation_state()['pending_invalidation'] is True
+    assert service._generation == generation
+
+
+def test_forced_invalidation_bypasses_cooldown(service):
+    assert service.invalidate_cache() is True
+    generation = service._generation
+
+    assert service.invalidate_cache(force=True) is True
+    assert service._generation == generation + 1
+    assert service.get_invalidation_state()['pending_invalidation'] is False
+
+
+def test_deferred_invalidation_is_applied_after_cooldown(service):
+    service.invalidate_cache()
+    service._load_data()
+    service._set_cached_analytics('summary_key', {'total': 1})
+    assert service.invalidate_cache() is False
+    generation = service._generation
+
+    # Still inside the cooldown: the deferred invalidation waits
+    service._load_data()
+    assert service._pending_invalidation is True
+    assert 'summary_key' in service._analytics_cache
+
+    # Once the cooldown has elapsed, the next load applies it
+    service._last_invalidated -= service._invalidation_cooldown
+    service._load_data()
+    assert service._pending_invalidation is False
+    assert 'summary_key' not in service._analytics_cache
+    assert service._generation > generation
+
+
+def test_analytics_cache_counts_entries_per_method():
+    cache = AnalyticsCache(maxsize=10, ttl=60)
+    cache['summary_a'] = 1
+    cache['summary_b'] = 2
+    cache['summary_a'] = 3  # Overwrite does not count twice
+    cache['sectors_a'] = 4
+    assert cache.methods == {'summary': 2, 'sectors': 1}
+
+    del cache['summary_a']
+    assert cache.methods == {'summary': 1, 'sectors': 1}
+
+    cache.clear()
+    assert not cache.methods
+
+
+def test_analytics_cache_forgets_expired_entries():
+    cache = AnalyticsCache(maxsize=10, ttl=60)
+    cache['summary_a'] = 1
+    cache['sectors_a'] = 2
+
+    expired = cache.expire(time.monotonic() + 61)
+    assert {key for key, _ in expired} == {'summary_a', 'sectors_a'}
+    assert not cache.methods
+
+
+def test_analytics_cache_forgets_evicted_entries():
+    cache = AnalyticsCache(maxsize=2, ttl=60)
+    cache['summary_a'] = 1
+    cache['sectors_a'] = 2
+    cache['summary_a']  # Touch so sectors_a is least recently used
+    cache['trends_a'] = 3
+
+    assert set(cache) == {'summary_a', 'trends_a'}
+    assert cache.methods == {'summary': 1, 'trends': 1}
@@ -0,0 +1,133 @@
+"""
+Tests for SingleFlight request coalescing
+"""
+
+import threading
+import time
+
+import pytest
+
+from services.singleflight import SingleFlight
+
+
+def _wait_for_call(single_flight, key, timeout=1.0):
+    """Block until a leader has registered its in-flight call for key"""
+    deadline = time.monotonic() + timeout
+    while key not in single_flight._calls:
+        assert time.monotonic() < deadline, "leader never started"
+        time.sleep(0.001)
+
+
+def _run_waiters(single_flight, key, fn, count):
+    """Start count threads calling single_flight.do(key, fn), collecting results and errors"""
+    results, errors = [], []
+
+    def call():
+        try:
+            results.append(single_flight.do(key, fn))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results, errors
+
+
+def test_concurrent_callers_share_one_computation():
+    single_flight = SingleFlight(wait_timeout=5.0)
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        release.wait(5.0)
+        return {'value': 42}
+
+    threads, results, errors = _run_waiters(single_flight, 'key', compute, 1)
+    _wait_for_call(single_flight, 'key')
+    waiters, waiter_results, waiter_errors = _run_waiters(single_flight, 'key', compute, 4)
+    time.sleep(0.05)  # Let the waiters join the in-flight call
+    release.set()
+    for thread in threads + waiters:
+        thread.join(5.0)
+
+    assert len(calls) == 1
+    assert not errors and not waiter_errors
+    assert results + waiter_results == [{'value': 42}] * 5
+    # Every caller gets the same object, not a recomputed copy
+    assert all(result is results[0] for result in waiter_results)
+    assert single_flight._calls == {}
+
+
+def test_leader_error_is_raised_to_waiters():
+    single_flight = SingleFlight(wait_timeout=5.0)
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        release.wait(5.0)
+        raise ValueError("upstream failed")
+
+    threads, _, errors = _run_waiters(single_flight, 'key', compute, 1)
+    _wait_for_call(single_flight, 'key')
+    waiters, waiter_results, waiter_errors = _run_waiters(single_flight, 'key', compute, 3)
+    time.sleep(0.05)
+    release.set()
+    for thread in threads + waiters:
+        thread.join(5.0)
+
+    assert len(calls) == 1
+    assert not waiter_results
+    assert [type(e) for e in errors + waiter_errors] == [ValueError] * 4
+    assert single_flight._calls == {}
+
+    # A failed call is not remembered: the next caller computes again
+    assert single_flight.do('key', lambda: 'recovered') == 'recovered'
+
+
+def test_waiter_computes_independently_after_timeout():
+    single_flight = SingleFlight(wait_timeout=0.05)
+    release = threading.Event()
+
+    def slow_compute():
+        release.wait(5.0)
+        return 'leader'
+
+    threads, results, _ = _run_waiters(single_flight, 'key', slow_compute, 1)
+    _wait_for_call(single_flight, 'key')
+
+    started = time.monotonic()
+    assert single_flight.do('key', lambda: 'waiter') == 'waiter'
+    assert time.monotonic() - started < 1.0
+
+    release.set()
+    for thread in threads:
+        thread.join(5.0)
+    assert results == ['leader']
+
+
+def test_different_keys_do_not_wait_on_each_other():
+    single_flight = SingleFlight(wait_timeout=5.0)
+    release = threading.Event()
+
+    threads, _, _ = _run_waiters(single_flight, 'slow', lambda: release.wait(5.0), 1)
+    _wait_for_call(single_flight, 'slow')
+    try:
+        assert single_flight.do('fast', lambda: 'done') == 'done'
+    finally:
+        release.set()
+        for thread in threads:
+            thread.join(5.0)
+
+
+def test_leader_error_propagates_to_leader():
+    single_flight = SingleFlight()
+
+    def fail():
+        raise KeyError('missing')
+
+    with pytest.raises(KeyError):
+        single_flight.do('key', fail)
+    assert single_flight._calls == {}
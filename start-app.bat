@@ -2,7 +2,7 @@
 echo Starting Catalog AI Application...
 echo.
 echo Starting backend server...
-start "Backend Server" cmd /k "cd backend && call venv\Scripts\activate && python app.py"
+start "Backend Server" cmd /k "cd backend && call venv\Scripts\activate && set "FLASK_DEBUG=1" && python app.py"
 echo.
 echo Waiting 5 seconds for backend to start...
 timeout /t 5 /nobreak > nul